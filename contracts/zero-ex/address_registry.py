@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+合约地址注册表: packages/contract-addresses/addresses.json 的正向和反向索引
+
+    from address_registry import get_registry
+    registry = get_registry()
+    registry.address('1', 'exchangeProxy')              # 小写地址
+    registry.address('1', 'transformers.wethTransformer', checksum=True)
+    registry.lookup('0xDef1C0ded9bec7F1a1670819833240f027b25EfF')  # [(chain, name), ...]
+
+transformers 这样的嵌套分组展开为 "分组.名称". 正向索引为 {(chain, name): 地址},
+反向索引为 {地址: [(chain, name)]}, 地址统一为小写; 空地址 (未部署) 只在正向索引中.
+
+addresses.json 在第一次调用 get_registry() 时才读取. 索引和所有地址的 EIP-55 校验和
+形式一起以 pickle 保存在 .address_registry.pickle 中 (只是本地缓存, 不要加载来源不明的文件;
+其他地址表各自缓存在以其绝对路径哈希命名的文件中, 缓存内也记录了路径),
+addresses.json 的 mtime/大小不变时直接加载缓存, 变化但内容哈希不变时沿用缓存,
+否则重新解析并计算校验和. 纯 Python 的 keccak 每个地址约 1ms, 所以校验和值得缓存.
+
+用法: python3 address_registry.py [地址 ...] [--chain 1 --name exchangeProxy]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import pickle
+
+from keccak import keccak256
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+ADDRESSES_FILE = os.path.join(REPO_ROOT, 'packages', 'contract-addresses', 'addresses.json')
+CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.address_registry.pickle')
+CACHE_VERSION = 2
+
+NULL_ADDRESS = '0x' + '0' * 40
+
+_checksums = {}
+
+
+def to_checksum_address(address):
+    """返回地址的 EIP-55 校验和形式, 结果按小写地址缓存"""
+    address = address.lower()
+    checksummed = _checksums.get(address)
+    if checksummed is None:
+        digest = keccak256(address[2:]).hex()
+        checksummed = '0x' + ''.join(
+            char.upper() if int(nibble, 16) >= 8 else char for char, nibble in zip(address[2:], digest))
+        _checksums[address] = checksummed
+    return checksummed
+
+
+def cache_file_for(addresses_file):
+    """地址表对应的缓存文件: 默认的 addresses.json 用 CACHE_FILE, 其他文件按绝对路径区分"""
+    path = os.path.abspath(addresses_file)
+    if path == ADDRESSES_FILE:
+        return CACHE_FILE
+    root, ext = os.path.splitext(CACHE_FILE)
+    return f"{root}.{hashlib.sha1(path.encode('utf-8')).hexdigest()[:12]}{ext}"
+
+
+def iter_entries(addresses):
+    """展开 {chain: {name: 地址 | {name: 地址}}} 为 (chain, name, 小写地址), 嵌套分组为 "分组.名称" """
+    for chain, contracts in addresses.items():
+        for name, value in contracts.items():
+            if isinstance(value, dict):
+                for member, address in value.items():
+                    yield chain, f'{name}.{member}', address.lower()
+            else:
+                yield chain, name, value.lower()
+
+
+class AddressRegistry:
+    """(chain, name) -> 地址 和 地址 -> [(chain, name)] 的哈希索引"""
+
+    def __init__(self, forward, reverse, checksums):
+        self.forward = forward
+        self.reverse = reverse
+        self.checksums = checksums
+
+    def __len__(self):
+        return len(self.forward)
+
+    @classmethod
+    def build(cls, addresses):
+        """从 addresses.json 的内容构建索引, 同时计算所有非空地址的校验和形式"""
+        forward = {}
+        reverse = {}
+        for chain, name, address in iter_entries(addresses):
+            forward[(chain, name)] = address
+            if address != NULL_ADDRESS:
+                reverse.setdefault(address, []).append((chain, name))
+        checksums = {address: to_checksum_address(address) for address in reverse}
+        return cls(forward, reverse, checksums)
+
+    @classmethod
+    def load(cls, addresses_file=ADDRESSES_FILE, cache_file=None, rebuild=False):
+        """加载缓存, addresses.json 内容变化时重新构建并写回缓存
+
+        cache_file 默认为 cache_file_for(addresses_file); 缓存记录的地址表路径不同时不使用.
+        """
+        path = os.path.abspath(addresses_file)
+        cache_file = cache_file or cache_file_for(path)
+        cached = None
+        if not rebuild:
+            try:
+                with open(cache_file, 'rb') as f:
+                    cached = pickle.load(f)
+                if cached.get('version') != CACHE_VERSION or cached.get('path') != path:
+                    cached = None
+            except (FileNotFoundError, EOFError, pickle.UnpicklingError, AttributeError, TypeError):
+                cached = None
+
+        stat = os.stat(addresses_file)
+        if cached and cached['mtime_ns'] == stat.st_mtime_ns and cached['size'] == stat.st_size:
+            return cls.from_cache(cached)
+
+        with open(addresses_file, 'rb') as f:
+            content = f.read()
+        digest = hashlib.sha1(content).hexdigest()
+        if cached and cached['sha1'] == digest:
+            registry = cls.from_cache(cached)
+        else:
+            registry = cls.build(json.loads(content))
+
+        with open(cache_file, 'wb') as f:
+            pickle.dump({
+                'version': CACHE_VERSION,
+                'path': path,
+                'mtime_ns': stat.st_mtime_ns,
+                'size': stat.st_size,
+                'sha1': digest,
+                'forward': registry.forward,
+                'reverse': registry.reverse,
+                'checksums': registry.checksums,
+            }, f, protocol=pickle.HIGHEST_PROTOCOL)
+        return registry
+
+    @classmethod
+    def from_cache(cls, cached):
+        _checksums.update(cached['checksums'])
+        return cls(cached['forward'], cached['reverse'], cached['checksums'])
+
+    def chains(self):
+        return list(dict.fromkeys(chain for chain, _ in self.forward))
+
+    def names(self, chain):
+        return [name for entry_chain, name in self.forward if entry_chain == chain]
+
+    def address(self, chain, name, checksum=False):
+        """返回合约地址, 不存在时为 None; 嵌套分组中的合约用 "分组.名称" """
+        address = self.forward.get((str(chain), name))
+        if address is None or not checksum:
+            return address
+        return self.checksum(address)
+
+    def group(self, chain, group):
+        """返回嵌套分组 (如 transformers) 中的 {名称: 地址}"""
+        prefix = group + '.'
+        return {name[len(prefix):]: address for (entry_chain, name), address in self.forward.items()
+                if entry_chain == str(chain) and name.startswith(prefix)}
+
+    def lookup(self, address):
+        """返回使用该地址的 [(chain, name)], 不区分大小写"""
+        return self.reverse.get(address.lower(), [])
+
+    def checksum(self, address):
+        address = address.lower()
+        return self.checksums.get(address) or to_checksum_address(address)
+
+
+_registry = None
+
+
+def get_registry():
+    """懒加载默认的注册表, 进程内只加载一次"""
+    global _registry
+    if _registry is None:
+        _registry = AddressRegistry.load()
+    return _registry
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='按地址查合约名和链, 或按链和合约名查地址')
+    parser.add_argument('addresses', nargs='*', help='要查询的地址 (0x...)')
+    parser.add_argument('--chain', help='链 id, 与 --name 一起使用')
+    parser.add_argument('--name', help='合约名, 嵌套分组中的合约用 "分组.名称", 如 transformers.wethTransformer')
+    parser.add_argument('--addresses-file', default=ADDRESSES_FILE,
+                        help='地址表 (默认: packages/contract-addresses/addresses.json)')
+    parser.add_argument('--rebuild', action='store_true', help='忽略缓存重新构建索引')
+    args = parser.parse_args(argv)
+    if bool(args.chain) != bool(args.name):
+        parser.error('--chain 和 --name 需要一起使用')
+
+    registry = AddressRegistry.load(args.addresses_file, rebuild=args.rebuild)
+    if not args.addresses and not args.name:
+        print(f"✅ 注册表包含 {len(registry)} 个条目, {len(registry.reverse)} 个地址, "
+              f"{len(registry.chains())} 条链")
+        return
+
+    if args.name:
+        address = registry.address(args.chain, args.name, checksum=True)
+        if address is None:
+            print(f"❌ 链 {args.chain} 上没有 {args.name}")
+        else:
+            print(f"🔸 {args.chain} {args.name}: {address}")
+
+    for address in args.addresses:
+        entries = registry.lookup(address)
+        if not entries:
+            print(f"❌ {address}: 未知地址")
+            continue
+        print(f"🔸 {registry.checksum(address)}:")
+        for chain, name in entries:
+            print(f"   {chain:>6} {name}")
+
+
+if __name__ == "__main__":
+    main()
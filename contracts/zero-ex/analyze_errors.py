@@ -1,107 +1,842 @@
 #!/usr/bin/env python3
 """
 分析测试错误并进行分类
+
+支持三种 mocha 输出:
+  - spec reporter 的文本日志 (默认)
+  - json-stream reporter 的事件行, 如 ["fail",{"title":...,"err":"...","stack":"..."}]
+  - json reporter 的完整报告, 直接读取 failures[].err.message / err.stack
+
+reporter 通过 hardhat.config.ts 的 mocha 配置选择 (hardhat test 不接受 --reporter 参数):
+
+    MOCHA_REPORTER=json-stream npx hardhat test > mocha_report.jsonl
+    MOCHA_REPORTER=json MOCHA_REPORTER_OUTPUT=mocha_report.json npx hardhat test
+
+进程池, 选择器索引和测试文件扫描只在用到时才导入, 保证 --help 和单个日志的分析启动快.
+
+错误分类规则在 error_rules.json 中, 由 ErrorRuleSet 用 exec 生成一个嵌套 if 的 classify 函数
+(见 _compile_rules). 这是有意的取舍: 把所有字面量合成一个正则再 findall 的做法只有原先手写 if/elif 链
+速度的约十分之一 (实测约 5 万对 53 万个失败块/秒); 生成的函数与手写链结构相同, 速度一致,
+规则仍然只在 JSON 中维护.
+bench_error_rules.py 在生成函数比手写链慢 10% 以上时失败.
 """
 
+import argparse
+import glob
+import os
 import re
 import json
-from collections import defaultdict
+import sys
+import time
+from collections import defaultdict, namedtuple
 
-def analyze_test_errors(log_file):
-    """分析测试错误日志"""
-    
-    with open(log_file, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # 提取失败的测试
-    test_pattern = r'^\s+(\d+)\)\s+(.+?)$'
-    tests = re.findall(test_pattern, content, re.MULTILINE)
-    
-    # 错误分类统计
-    error_categories = defaultdict(list)
-    
-    # 分析每个测试的错误
-    test_blocks = re.split(r'^\s+\d+\)', content, flags=re.MULTILINE)[1:]  # 跳过第一个空块
-    
-    for i, block in enumerate(test_blocks):
-        if i >= len(tests):
-            break
-            
-        test_num, test_name = tests[i]
-        
-        # 错误类型分析
-        if 'missing value for component id' in block:
-            error_categories['ABI_ENCODING_ERRORS'].append((test_num, test_name))
-        elif 'Transaction reverted without a reason string' in block:
-            error_categories['TRANSACTION_REVERTS'].append((test_num, test_name))
-        elif 'VM Exception while processing transaction: reverted with an unrecognized custom error' in block:
-            if '0x47ab394e' in block:
-                error_categories['ONLY_SELF_ERRORS'].append((test_num, test_name))
-            elif '0xbea726ef' in block:
-                error_categories['META_TRANSACTION_ERRORS'].append((test_num, test_name))
-            elif '0x734e6e1c' in block:
-                error_categories['FUNCTION_NOT_FOUND_ERRORS'].append((test_num, test_name))
+from failure_fingerprint import (add_to_clusters, fingerprint_failure, is_repo_location, merge_clusters, parse_frame,
+                                 print_cluster_summary)
+
+# hardhat 项目目录 (contracts/zero-ex), 默认路径和测试文件路径都相对于它
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+# 错误分类规则表, 格式见 ErrorRuleSet
+ERROR_RULES_FILE = os.path.join(PACKAGE_DIR, 'error_rules.json')
+DEFAULT_LOG = os.path.join(PACKAGE_DIR, 'full_test_results.log')
+TEST_DIR = os.path.join(PACKAGE_DIR, 'test')
+
+# 失败块标题行, 如 "  3) MetaTransactions feature"
+FAILURE_HEADER_PATTERN = re.compile(r'^(\s*)(\d+)\)\s+(.+?)\s*$')
+# 栈帧行, 如 "    at Context.<anonymous> (test/features/meta_transactions_test.ts:75:19)"
+STACK_FRAME_PATTERN = re.compile(r'^\s+at\s')
+# json-stream reporter 的事件行以 '["' 开头, spec 文本输出中不会出现
+JSON_STREAM_EVENT_PREFIX = '["'
+# json reporter 输出到标准输出时, 报告前面可能有 hardhat 的编译信息, 最多跳过这么多行
+JSON_REPORT_SCAN_LINES = 50
+
+# 每个失败块最多保留的行数, 超出部分只计数不保存, 保证内存占用与日志大小无关
+MAX_BLOCK_LINES = 200
+
+
+class TestFailure(namedtuple('TestFailure', ['number', 'suite', 'title', 'message', 'stack', 'file'],
+                             defaults=(None,))):
+    """单个失败测试: 编号, suite 路径, 测试标题, 错误信息行, 栈帧行, 测试文件 (只有 JSON 报告提供)"""
+
+    __slots__ = ()
+
+    @property
+    def block(self):
+        """失败块的完整文本, 供分类使用"""
+        return '\n'.join(self.suite + (self.title,) + self.message + self.stack)
+
+
+def full_title(test):
+    """与 mocha 的 fullTitle 相同: 各级 suite 名和测试标题以空格连接
+
+    test 可以是 TestFailure, 也可以是 profile_tests 的 TestTiming. 与 mocha 输出的
+    失败编号不同, 它不随失败数量和顺序变化, 用于跨运行对比同一个测试.
+    """
+    return ' '.join(test.suite + (test.title,))
+
+
+class FailureParser:
+    """逐行解析 mocha 输出的状态机
+
+    mocha 的失败详情结构为 "N) suite / test: / error / stack":
+
+          3) MetaTransactions feature
+               executeMetaTransaction()
+                 can call NativeOrders.fillLimitOrder():
+             Error: VM Exception while processing transaction: ...
+              at MetaTransactionsFeature.rrevert (...)
+
+    进度输出里也会出现 "N) test" 形式的行, 区别在于详情块的下一行缩进更深,
+    因此标题行先作为候选, 由下一个非空行确认. 失败块在遇到下一个标题行或
+    缩进回退到标题行层级时结束.
+    """
+
+    IDLE = 'idle'
+    CANDIDATE = 'candidate'
+    HEADER = 'header'
+    BODY = 'body'
+
+    def __init__(self):
+        self._reset()
+
+    def _reset(self):
+        self._state = self.IDLE
+        self._indent = 0
+        self._number = None
+        self._header = []
+        self._message = []
+        self._stack = []
+        self._kept = 0
+
+    def _start_candidate(self, indent, number, text):
+        self._reset()
+        self._state = self.CANDIDATE
+        self._indent = indent
+        self._number = number
+        self._header = [text]
+
+    def _add_header_line(self, text):
+        self._header.append(text)
+        if text.endswith(':'):
+            self._state = self.BODY
+
+    def _add_body_line(self, line):
+        if self._kept >= MAX_BLOCK_LINES:
+            return
+        self._kept += 1
+        if STACK_FRAME_PATTERN.match(line):
+            self._stack.append(line.strip())
+        else:
+            self._message.append(line.strip())
+
+    def _build(self):
+        title = self._header[-1]
+        if title.endswith(':'):
+            title = title[:-1]
+        return TestFailure(self._number, tuple(self._header[:-1]), title,
+                           tuple(self._message), tuple(self._stack))
+
+    def feed(self, line):
+        """输入一行, 若因此结束了一个失败块则返回对应的 TestFailure, 否则返回 None"""
+        line = line.rstrip('\r\n')
+        text = line.strip()
+        if not text:
+            return None
+
+        indent = len(line) - len(line.lstrip())
+        header = FAILURE_HEADER_PATTERN.match(line)
+        completed = None
+
+        if self._state == self.CANDIDATE:
+            if indent > self._indent:
+                # 下一行缩进更深, 确认是失败详情块
+                self._state = self.HEADER
+                if self._header[0].endswith(':'):
+                    self._state = self.BODY
             else:
-                error_categories['OTHER_CUSTOM_ERRORS'].append((test_num, test_name))
-        elif 'AssertionError: Expected transaction to be reverted with reason' in block:
-            error_categories['REVERT_ASSERTION_ERRORS'].append((test_num, test_name))
-        elif 'AssertionError: expected' in block and 'to equal' in block:
-            error_categories['VALUE_ASSERTION_ERRORS'].append((test_num, test_name))
-        elif 'TypeError:' in block:
-            if 'is not a function' in block:
-                error_categories['FUNCTION_NOT_FOUND_ERRORS'].append((test_num, test_name))
+                self._reset()
+        elif self._state in (self.HEADER, self.BODY) and indent <= self._indent:
+            completed = self._build()
+            self._reset()
+
+        if self._state == self.IDLE:
+            if header:
+                self._start_candidate(indent, header.group(2), header.group(3))
+        elif self._state == self.HEADER:
+            if STACK_FRAME_PATTERN.match(line):
+                self._state = self.BODY
+                self._add_body_line(line)
             else:
-                error_categories['TYPE_ERRORS'].append((test_num, test_name))
-        elif 'RangeError: data out-of-bounds' in block:
-            error_categories['DATA_BOUNDS_ERRORS'].append((test_num, test_name))
-        elif 'Error: Instance of' in block and 'does not have all its parameter values set' in block:
-            error_categories['PARAMETER_MISSING_ERRORS'].append((test_num, test_name))
-        elif '错误编码不匹配' in block:
-            error_categories['ERROR_ENCODING_MISMATCH'].append((test_num, test_name))
+                self._add_header_line(text)
+        else:
+            self._add_body_line(line)
+
+        return completed
+
+    @property
+    def pending(self):
+        """是否有已确认但尚未结束的失败块"""
+        return self._state in (self.HEADER, self.BODY)
+
+    def flush(self):
+        """输入结束时调用, 返回最后一个未结束的失败块 (如有)"""
+        completed = None
+        if self._state in (self.HEADER, self.BODY):
+            completed = self._build()
+        self._reset()
+        return completed
+
+
+def failure_from_mocha(number, test, message, stack):
+    """由 mocha JSON 输出中的测试对象和 err.message / err.stack 构造 TestFailure
+
+    mocha 不单独给出各级 suite 名, suite 路径取 fullTitle 去掉标题后的部分.
+    错误信息优先取 stack 中栈帧之前的行, 它带有 "TypeError:" 这类错误类型前缀,
+    与 spec reporter 打印的内容一致; 没有 stack 时使用 err.message.
+    """
+    title = test.get('title') or ''
+    full_title = test.get('fullTitle') or title
+    suite = full_title[:-len(title)].strip() if title and full_title.endswith(title) else ''
+
+    message_lines = []
+    frames = []
+    for line in (stack or '').splitlines():
+        if STACK_FRAME_PATTERN.match(line):
+            frames.append(line.strip())
+        elif not frames and line.strip():
+            message_lines.append(line.strip())
+    if not message_lines:
+        message_lines = [line.strip() for line in (message or '').splitlines() if line.strip()]
+
+    return TestFailure(str(number), (suite,) if suite else (), title,
+                       tuple(message_lines[:MAX_BLOCK_LINES]), tuple(frames[:MAX_BLOCK_LINES]),
+                       test.get('file'))
+
+
+def parse_json_stream_event(line, number):
+    """解析 json-stream reporter 的一行事件, "fail" 事件返回 TestFailure, 其他返回 None"""
+    try:
+        event, payload = json.loads(line)
+    except (ValueError, TypeError):
+        return None
+    if event != 'fail' or not isinstance(payload, dict):
+        return None
+    return failure_from_mocha(number, payload, payload.get('err'), payload.get('stack'))
+
+
+def iter_test_failures(lines):
+    """从任意行迭代器中逐个产出 TestFailure
+
+    json-stream 事件行直接解析, 其余行交给 spec 文本解析器, 两种输出混在一起
+    (如 hardhat 编译信息之后的 json-stream 事件) 也能处理.
+    行迭代器中的 None 表示输入暂时空闲 (见 follow_lines), 此时认为正在读取的失败块已写完.
+    """
+    parser = FailureParser()
+    stream_failures = 0
+    for line in lines:
+        if line is None:
+            failure = parser.flush() if parser.pending else None
+        elif line.startswith(JSON_STREAM_EVENT_PREFIX):
+            failure = parse_json_stream_event(line, stream_failures + 1)
+            stream_failures += failure is not None
         else:
-            error_categories['UNCLASSIFIED_ERRORS'].append((test_num, test_name))
-    
+            failure = parser.feed(line)
+        if failure is not None:
+            yield failure
+    failure = parser.flush()
+    if failure is not None:
+        yield failure
+
+
+def read_json_report(f):
+    """若 f 是 mocha json reporter 的输出, 返回解析后的报告, 否则返回 None
+
+    报告从单独一行的 "{" 开始, 只在开头 JSON_REPORT_SCAN_LINES 行内查找.
+    返回 None 时文件位置不确定, 调用方需要自行 seek.
+    """
+    for _ in range(JSON_REPORT_SCAN_LINES):
+        offset = f.tell()
+        line = f.readline()
+        if not line:
+            return None
+        if line.rstrip() != '{':
+            continue
+        f.seek(offset)
+        try:
+            report, _ = json.JSONDecoder().raw_decode(f.read())
+        except ValueError:
+            return None
+        return report if isinstance(report, dict) and isinstance(report.get('failures'), list) else None
+    return None
+
+
+def iter_json_report_failures(report):
+    """从 json reporter 报告的 failures 中逐个产出 TestFailure, 编号与 spec 输出一致从 1 开始"""
+    for number, test in enumerate(report['failures'], 1):
+        err = test.get('err') or {}
+        yield failure_from_mocha(number, test, err.get('message'), err.get('stack'))
+
+
+def iter_log_failures(log_file):
+    """流式读取日志文件, 逐个产出 TestFailure
+
+    json reporter 的报告整体解析, 其他输出 (spec 文本, json-stream) 逐行解析.
+    """
+    with open(log_file, 'r', encoding='utf-8', errors='replace') as f:
+        report = read_json_report(f)
+        if report is not None:
+            yield from iter_json_report_failures(report)
+            return
+        f.seek(0)
+        yield from iter_test_failures(f)
+
+
+def follow_lines(path, poll_interval=0.5, idle_timeout=2.0):
+    """像 tail -F 一样持续读取增长中的日志, 逐行产出
+
+    - 只产出完整的行, 末尾不完整的行等写完换行后再产出
+    - 文件被轮转 (inode 变化) 时读完旧文件再切换到新文件, 被截断时从新内容开头继续
+    - 连续 idle_timeout 秒没有新数据时产出一次 None, 供调用方结束当前失败块
+    """
+    f = _open_when_exists(path, poll_interval)
+    partial = b''
+    idle = 0.0
+    try:
+        while True:
+            chunk = f.readline()
+            if chunk:
+                idle = 0.0
+                partial += chunk
+                if partial.endswith(b'\n'):
+                    yield partial.decode('utf-8', errors='replace')
+                    partial = b''
+                continue
+
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                stat = None
+            current = os.fstat(f.fileno())
+            if stat is not None and (stat.st_ino, stat.st_dev) != (current.st_ino, current.st_dev):
+                # 已轮转: 旧文件读到了结尾, 剩余的半行也算完整
+                if partial:
+                    yield partial.decode('utf-8', errors='replace')
+                    partial = b''
+                f.close()
+                f = _open_when_exists(path, poll_interval)
+                continue
+            if stat is not None and stat.st_size < f.tell():
+                # 被截断 (copytruncate): 丢弃半行, 从新内容开头继续
+                f.seek(0)
+                partial = b''
+                continue
+
+            time.sleep(poll_interval)
+            if idle_timeout is not None and idle < idle_timeout <= idle + poll_interval:
+                yield None
+            idle += poll_interval
+    finally:
+        f.close()
+
+
+def _open_when_exists(path, poll_interval):
+    while True:
+        try:
+            return open(path, 'rb')
+        except FileNotFoundError:
+            time.sleep(poll_interval)
+
+
+class ErrorRuleSet:
+    """编译后的错误分类规则表
+
+    规则文件格式:
+
+        {
+            "default": "UNCLASSIFIED_ERRORS",
+            "rules": [
+                {"category": "ONLY_SELF_ERRORS", "priority": 110,
+                 "patterns": ["reverted with an unrecognized custom error", "0x47ab394e"]},
+                ...
+            ]
+        }
+
+    patterns 中的字面量需全部出现才算命中, priority 大的规则优先, 同优先级按文件顺序.
+    按优先级相邻且首个字面量相同的规则合并为一组, 整张表生成为一个嵌套 if 的 Python 函数
+    (与原先手写的 if/elif 链相同), classify 直接就是这个函数, 没有逐条解释规则的开销:
+    共享的字面量每个失败块只检查一次, 不出现时整组规则直接跳过.
+    """
+
+    def __init__(self, rules, default_category='UNCLASSIFIED_ERRORS'):
+        self.default_category = default_category
+        ordered = sorted(enumerate(rules), key=lambda item: (-item[1].get('priority', 0), item[0]))
+        self._rules = [(rule['category'], tuple(rule['patterns'])) for _, rule in ordered]
+        # 实例属性而不是方法, 调用时少一层包装
+        self.classify = _compile_rules(self._rules, default_category)
+
+    @classmethod
+    def from_file(cls, path=ERROR_RULES_FILE):
+        with open(path, 'r', encoding='utf-8') as f:
+            table = json.load(f)
+        return cls(table['rules'], table.get('default', 'UNCLASSIFIED_ERRORS'))
+
+    @property
+    def categories(self):
+        """规则表中出现的全部类别 (含默认类别), 按优先级排列"""
+        seen = []
+        for category, _ in self._rules:
+            if category not in seen:
+                seen.append(category)
+        if self.default_category not in seen:
+            seen.append(self.default_category)
+        return seen
+
+
+def _group_rules(rules):
+    """将 [(category, patterns), ...] 按首个字面量分组为 [(literal, children) 或 (None, category), ...]"""
+    groups = []
+    for category, patterns in rules:
+        if not patterns:
+            groups.append((None, category))
+        elif groups and groups[-1][0] == patterns[0]:
+            groups[-1][1].append((category, patterns[1:]))
+        else:
+            groups.append((patterns[0], [(category, patterns[1:])]))
+    return [(literal, children if literal is None else _group_rules(children))
+            for literal, children in groups]
+
+
+def _emit_rules(groups, depth, lines):
+    """生成 groups 对应的 if 语句, 遇到无条件返回的规则时停止 (之后的规则不可达)"""
+    indent = '    ' * depth
+    for literal, children in groups:
+        if literal is None:
+            lines.append(f'{indent}return {children!r}')
+            return True
+        lines.append(f'{indent}if {literal!r} in text:')
+        _emit_rules(children, depth + 1, lines)
+    return False
+
+
+def _compile_rules(rules, default_category):
+    """将排好序的规则编译为 classify(text) -> category 函数"""
+    lines = ['def classify(text):']
+    if not _emit_rules(_group_rules(rules), 1, lines):
+        lines.append(f'    return {default_category!r}')
+    namespace = {}
+    exec(compile('\n'.join(lines), f'<{ERROR_RULES_FILE}>', 'exec'), namespace)
+    classify = namespace['classify']
+    classify.__doc__ = '返回 text 所属的错误类别'
+    return classify
+
+
+_loaded_rules = {}
+
+
+def get_error_rules(path=ERROR_RULES_FILE):
+    """懒加载规则表, 同一文件在进程内只编译一次"""
+    rules = _loaded_rules.get(path)
+    if rules is None:
+        rules = _loaded_rules[path] = ErrorRuleSet.from_file(path)
+    return rules
+
+
+_selector_index = None
+
+
+def get_selector_index():
+    """懒加载自定义错误选择器索引, 只有需要解码 revert 数据时才扫描源码"""
+    global _selector_index
+    if _selector_index is None:
+        from selector_index import SelectorIndex
+        _selector_index = SelectorIndex.load()
+    return _selector_index
+
+
+def decode_failure(failure):
+    """解码失败信息中的 revert 数据, 如 "OnlyOwnerError(sender=0x..., owner=0x...)", 没有时返回 None"""
+    from selector_index import find_return_data, format_decoded
+    data = find_return_data('\n'.join(failure.message))
+    if data is None or len(data) < 10:
+        return None
+    return format_decoded(get_selector_index().decode(data))
+
+
+def annotate_clusters(clusters):
+    """为带有 revert 选择器的聚类补充对应的错误签名"""
+    from selector_index import find_return_data
+    for cluster in clusters.values():
+        selector = find_return_data(cluster['message'])
+        if selector and len(selector) >= 10:
+            signatures = [signature for signature, _ in get_selector_index().lookup(selector[:10])]
+            cluster['error'] = ' | '.join(signatures) if signatures else None
+
+
+def failure_test_file(failure, suite_files=None):
+    """失败测试所在的测试文件 (相对 PACKAGE_DIR, 即运行 hardhat test 的目录), 无法确定时返回 None
+
+    依次使用:
+      - JSON 报告中的 file 字段
+      - 第一个指向已知测试文件的栈帧, 如 "at Context.<anonymous> (test/features/fund_recovery_tests.ts:44:14)"
+      - suite_files 中与 full_title 前缀最长匹配的顶层 suite (见 profile_tests.find_suite_files)
+      - 第一个位于 test/ 下的 .ts 栈帧 (可能是公共的辅助文件)
+    """
+    if failure.file:
+        return os.path.relpath(failure.file, PACKAGE_DIR) if os.path.isabs(failure.file) else failure.file
+
+    suite_files = suite_files or {}
+    known_files = set(suite_files.values())
+    fallback = None
+    for frame in failure.stack:
+        parsed = parse_frame(frame)
+        if parsed is None:
+            continue
+        location = parsed[1]
+        if os.path.isabs(location) and 'node_modules' not in location:
+            location = os.path.relpath(location, PACKAGE_DIR)
+        if not is_repo_location(location):
+            continue
+        location = os.path.normpath(location)
+        if location in known_files:
+            return location
+        if fallback is None and location.startswith('test' + os.sep) and location.endswith('.ts'):
+            fallback = location
+
+    title = full_title(failure)
+    matches = [suite for suite in suite_files if title == suite or title.startswith(suite + ' ')]
+    if matches:
+        return suite_files[max(matches, key=len)]
+    return fallback
+
+
+def rerun_files(test_files, categories=None):
+    """把 {category: {测试文件: 失败数}} 合并为去重的重跑列表
+
+    categories 不为空时只保留这些类别. 返回 (测试文件列表, 覆盖的失败数, 无法定位文件的失败数),
+    文件按失败数从多到少排列.
+    """
+    counts = defaultdict(int)
+    for category, files in test_files.items():
+        if categories and category not in categories:
+            continue
+        for path, count in files.items():
+            counts[path] += count
+    unmapped = counts.pop(None, 0)
+    files = sorted(counts, key=lambda path: (-counts[path], path))
+    return files, sum(counts.values()), unmapped
+
+
+def classify_failure(failure, rules=None):
+    """返回单个失败测试的错误类别"""
+    if rules is None:
+        rules = get_error_rules()
+    return rules.classify(failure.block)
+
+
+def iter_classified_failures(failures, rules=None):
+    """为每个失败测试附上类别, 产出 (category, failure)"""
+    if rules is None:
+        rules = get_error_rules()
+    for failure in failures:
+        yield rules.classify(failure.block), failure
+
+
+def collect_error_categories(classified):
+    """将 (category, failure) 流汇总为 {category: [(test_num, test_name, full_title), ...]}
+
+    test_num 是 mocha 的失败编号, 随失败数量变化; 跨运行对比时用 full_title (见 diff_analysis.py).
+    """
+    error_categories = defaultdict(list)
+    for category, failure in classified:
+        error_categories[category].append((failure.number, failure.title, full_title(failure)))
+    return error_categories
+
+
+def analyze_test_errors(log_file, rules=None):
+    """分析测试错误日志"""
+    return collect_error_categories(iter_classified_failures(iter_log_failures(log_file), rules))
+
+
+def analyze_log(log_file, rules=None, suite_files=None):
+    """一遍读取日志, 同时返回分类结果, 按指纹的根因聚类和各类别失败所在的测试文件
+
+    测试文件为 {category: {测试文件: 失败数}}, 无法定位的失败记在 None 下, 见 failure_test_file.
+    """
+    error_categories = defaultdict(list)
+    clusters = {}
+    test_files = defaultdict(lambda: defaultdict(int))
+    for category, failure in iter_classified_failures(iter_log_failures(log_file), rules):
+        error_categories[category].append((failure.number, failure.title, full_title(failure)))
+        add_to_clusters(clusters, category, failure)
+        test_files[category][failure_test_file(failure, suite_files)] += 1
+    return error_categories, clusters, {category: dict(files) for category, files in test_files.items()}
+
+
+def _analyze_shard(log_file, rules_file, suite_files):
+    """进程池任务: 分析单个分片日志, 文件不存在时返回 None"""
+    try:
+        return (log_file,) + analyze_log(log_file, get_error_rules(rules_file), suite_files)
+    except FileNotFoundError:
+        return log_file, None, None, None
+
+
+def analyze_shards(log_files, rules_file=ERROR_RULES_FILE, jobs=None, suite_files=None):
+    """在进程池中并行分析多个分片日志, 按输入顺序产出 (log_file, error_categories, clusters, test_files)
+
+    找不到的日志文件对应的 error_categories, clusters 和 test_files 为 None.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        yield from executor.map(_analyze_shard, log_files, [rules_file] * len(log_files),
+                                [suite_files] * len(log_files))
+
+
+def merge_test_files(shard_test_files):
+    """合并各分片的 {category: {测试文件: 失败数}}"""
+    merged = defaultdict(lambda: defaultdict(int))
+    for test_files in shard_test_files:
+        for category, files in test_files.items():
+            for path, count in files.items():
+                merged[category][path] += count
+    return {category: dict(files) for category, files in merged.items()}
+
+
+def merge_error_categories(shard_results):
+    """合并各分片的分类结果
+
+    返回与单个日志相同形状的 {category: [(test_num, test_name, full_title, shard), ...]},
+    第四项标明失败来自哪个分片日志.
+    """
+    merged = defaultdict(list)
+    for shard, error_categories in shard_results:
+        for category, errors in error_categories.items():
+            merged[category].extend(error + (shard,) for error in errors)
+    return merged
+
+
+def expand_log_paths(patterns):
+    """展开命令行中的日志路径和 glob, 保持顺序并去重"""
+    paths = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern, recursive=True)) if glob.has_magic(pattern) else []
+        # 没有匹配的 glob 原样保留, 由后续读取时报告找不到文件
+        for path in matches or [pattern]:
+            if path not in paths:
+                paths.append(path)
+    return paths
+
+
+def follow_test_errors(lines, output, error_categories, rules=None):
+    """实时分类: 每个失败块结束时立即向 output 写出一行 JSON 记录
+
+    记录包含失败测试本身和截至目前的分类计数, 同时累加到 error_categories,
+    这样中途被打断时已分类的结果也不会丢失.
+    """
+    counts = defaultdict(int)
+    for category, failure in iter_classified_failures(iter_test_failures(lines), rules):
+        error_categories[category].append((failure.number, failure.title, full_title(failure)))
+        counts[category] += 1
+        record = {
+            'number': failure.number,
+            'category': category,
+            'fingerprint': fingerprint_failure(failure)[0],
+            'decoded': decode_failure(failure),
+            'suite': list(failure.suite),
+            'title': failure.title,
+            'file': failure_test_file(failure),
+            'message': failure.message[0] if failure.message else '',
+            'counts': counts,
+        }
+        output.write(json.dumps(record, ensure_ascii=False) + '\n')
+        output.flush()
     return error_categories
 
+
+def details_file(output):
+    """分析结果旁的明细文件, 如 error_analysis.json -> error_analysis.details.json"""
+    if output == os.devnull:
+        return os.devnull
+    root, ext = os.path.splitext(output)
+    return f'{root}.details{ext or ".json"}'
+
+
+def save_error_analysis(error_categories, output):
+    """保存分析结果, 返回明细文件路径
+
+    output 保持原有格式 {category: [[test_num, test_name], ...]}; full_title 和分片来源
+    写入 details_file(output), 格式为 {category: [[test_num, test_name, full_title, (shard)], ...]}.
+    """
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({category: [list(error[:2]) for error in errors] for category, errors in error_categories.items()},
+                  f, indent=2, ensure_ascii=False)
+    details = details_file(output)
+    with open(details, 'w', encoding='utf-8') as f:
+        json.dump(error_categories, f, indent=2, ensure_ascii=False)
+    return details
+
+
 def print_error_summary(error_categories):
-    """打印错误分类摘要"""
-    
+    """打印错误分类摘要
+
+    error_categories 可以是汇总好的 {category: [...]}, 也可以是
+    iter_classified_failures 产出的 (category, failure) 流.
+    """
+    if not hasattr(error_categories, 'items'):
+        error_categories = collect_error_categories(error_categories)
+
     total_errors = sum(len(errors) for errors in error_categories.values())
-    
+
     print(f"📊 **错误分类统计** (总计: {total_errors} 个)")
     print("=" * 60)
-    
+
     # 按错误数量排序
     sorted_categories = sorted(error_categories.items(), key=lambda x: len(x[1]), reverse=True)
-    
+
     for category, errors in sorted_categories:
         count = len(errors)
         percentage = (count / total_errors * 100) if total_errors > 0 else 0
-        
+
         print(f"\n🔸 **{category.replace('_', ' ')}**: {count} 个 ({percentage:.1f}%)")
-        
-        # 显示前5个示例
-        for i, (test_num, test_name) in enumerate(errors[:5]):
-            print(f"   {test_num}) {test_name}")
-        
+
+        # 显示前5个示例, 合并结果带有分片来源
+        for test_num, test_name, _, *shard in errors[:5]:
+            source = f" [{shard[0]}]" if shard else ""
+            print(f"   {test_num}) {test_name}{source}")
+
         if len(errors) > 5:
             print(f"   ... 还有 {len(errors) - 5} 个")
 
-def main():
-    log_file = 'full_test_results.log'
-    
+
+def print_shard_summary(shard_results):
+    """打印每个分片的失败数量"""
+    print(f"\n🧩 **分片统计** ({len(shard_results)} 个日志)")
+    print("=" * 60)
+    for shard, error_categories in shard_results:
+        count = sum(len(errors) for errors in error_categories.values())
+        print(f"   {shard}: {count} 个失败")
+
+
+def print_rerun_summary(files, covered, unmapped, categories=None):
+    """打印重跑列表和对应的 hardhat test 命令"""
+    scope = ', '.join(categories) if categories else '全部类别'
+    print(f"\n🔁 **重跑列表** ({scope}): {len(files)} 个测试文件, 覆盖 {covered} 个失败")
+    print("=" * 60)
+    for path in files:
+        print(f"   {path}")
+    if unmapped:
+        print(f"   ⚠️  {unmapped} 个失败无法定位测试文件")
+    if files:
+        print(f"\n   npx hardhat test {' '.join(files)}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='分析 mocha 测试日志中的失败并分类')
+    parser.add_argument('logs', nargs='*', default=[DEFAULT_LOG],
+                        help='日志文件或 glob, 如 "shards/*.txt"; spec 文本, json-stream 或 json 报告均可'
+                             ' (默认: full_test_results.log)')
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help='多个日志时的并行进程数 (默认: CPU 核数)')
+    parser.add_argument('-o', '--output', default='error_analysis.json',
+                        help='分析结果输出文件, 完整标题和分片来源另存为同名的 .details.json'
+                             ' (默认: error_analysis.json)')
+    parser.add_argument('--rules', default=ERROR_RULES_FILE,
+                        help='错误分类规则表 (默认: error_rules.json)')
+    parser.add_argument('--clusters', nargs='?', const='error_clusters.json',
+                        help='按归一化错误信息和栈帧聚类, 结果写入该文件 (默认: error_clusters.json)')
+    parser.add_argument('-f', '--follow', action='store_true',
+                        help='持续读取增长中的日志 (或 "-" 表示标准输入), 以 JSON Lines 实时输出每个失败')
+    parser.add_argument('--idle-flush', type=float, default=2.0,
+                        help='follow 模式下无新输出多少秒后认为当前失败块已结束 (默认: 2)')
+    parser.add_argument('--rerun', nargs='?', const='rerun_files.txt',
+                        help='把失败所在的测试文件去重后写入该文件, 每行一个, 可直接传给 hardhat test'
+                             ' (默认: rerun_files.txt)')
+    parser.add_argument('--category', action='append', dest='categories',
+                        help='--rerun 只包含该类别的失败, 可重复指定')
+    parser.add_argument('--test-dir', default=TEST_DIR, help='用于把 suite 映射到测试文件的测试目录 (默认: test)')
+    return parser.parse_args(argv)
+
+
+def run_follow(args):
+    """follow 模式: JSON Lines 写到标准输出, 摘要写到标准错误"""
+    log_file = args.logs[0]
+    if log_file == '-':
+        lines = sys.stdin
+    else:
+        lines = follow_lines(log_file, idle_timeout=args.idle_flush)
+
+    error_categories = defaultdict(list)
     try:
-        error_categories = analyze_test_errors(log_file)
-        print_error_summary(error_categories)
-        
+        follow_test_errors(lines, sys.stdout, error_categories, get_error_rules(args.rules))
+    except KeyboardInterrupt:
+        pass
+
+    details = save_error_analysis(error_categories, args.output)
+    print(f"💾 详细分析结果已保存到 {args.output} (完整标题: {details})", file=sys.stderr)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.follow:
+        if len(args.logs) != 1:
+            print("❌ --follow 只支持一个日志文件或 \"-\"")
+            sys.exit(1)
+        run_follow(args)
+        return
+
+    log_files = expand_log_paths(args.logs)
+    # 只有需要重跑列表时才扫描测试文件, 其余情况靠栈帧和 JSON 报告的 file 字段定位
+    suite_files = None
+    if args.rerun:
+        from profile_tests import find_suite_files
+        suite_files = find_suite_files(args.test_dir)
+
+    try:
+        if len(log_files) == 1:
+            log_file = log_files[0]
+            error_categories, clusters, test_files = analyze_log(log_file, get_error_rules(args.rules), suite_files)
+            print_error_summary(error_categories)
+        else:
+            shard_results = []
+            shard_clusters = []
+            shard_test_files = []
+            for log_file, shard_categories, clusters, test_files in analyze_shards(
+                    log_files, args.rules, args.jobs, suite_files):
+                if shard_categories is None:
+                    print(f"❌ 找不到日志文件: {log_file}")
+                    continue
+                shard_results.append((log_file, shard_categories))
+                shard_clusters.append((log_file, clusters))
+                shard_test_files.append(test_files)
+
+            error_categories = merge_error_categories(shard_results)
+            clusters = merge_clusters(shard_clusters)
+            test_files = merge_test_files(shard_test_files)
+            print_error_summary(error_categories)
+            print_shard_summary(shard_results)
+
+        if args.rerun:
+            unknown = [category for category in args.categories or [] if category not in error_categories]
+            if unknown:
+                print(f"\n⚠️  没有属于这些类别的失败: {', '.join(unknown)}")
+            files, covered, unmapped = rerun_files(test_files, args.categories)
+            print_rerun_summary(files, covered, unmapped, args.categories)
+            with open(args.rerun, 'w', encoding='utf-8') as f:
+                f.writelines(path + '\n' for path in files)
+            print(f"\n💾 重跑列表已保存到 {args.rerun}")
+
+        if args.clusters:
+            annotate_clusters(clusters)
+            print_cluster_summary(clusters)
+            with open(args.clusters, 'w', encoding='utf-8') as f:
+                json.dump(clusters, f, indent=2, ensure_ascii=False)
+            print(f"\n💾 根因聚类结果已保存到 {args.clusters}")
+
         # 保存详细分析结果
-        with open('error_analysis.json', 'w', encoding='utf-8') as f:
-            json.dump(error_categories, f, indent=2, ensure_ascii=False)
-        
-        print(f"\n💾 详细分析结果已保存到 error_analysis.json")
-        
-    except FileNotFoundError:
-        print(f"❌ 找不到日志文件: {log_file}")
+        details = save_error_analysis(error_categories, args.output)
+
+        print(f"\n💾 详细分析结果已保存到 {args.output} (完整标题: {details})")
+
+    except FileNotFoundError as e:
+        print(f"❌ 找不到文件: {e.filename}")
     except Exception as e:
         print(f"❌ 分析过程中出错: {e}")
 
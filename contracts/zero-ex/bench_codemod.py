@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+codemod 规则的吞吐量与病态输入基准
+
+对每条注册的规则分别运行 (token 规则单独计时时也要完整切一次 token):
+  - 大文件: 把需要修复的旧写法片段和普通测试代码混合, 生成数 MB 的 TypeScript 文件
+  - 对抗输入: 长空白, 长标识符, 不闭合的括号/导入等容易触发回溯的文本
+
+超过时间预算的规则会被标记. 对抗输入会在 size 和 2 * size 两个规模上运行,
+耗时增长接近 4 倍说明规则存在二次回溯.
+
+用法: python3 bench_codemod.py [对抗输入规模, 默认 20000] [--budget 秒]
+"""
+
+import argparse
+import sys
+import time
+
+from codemod import RULE_TIME_BUDGET, RuleTimeout, apply_rules, select_rules
+from workloads import generate_ts_source
+
+
+def adversarial_inputs(size):
+    """[(名称, 文本)], 每个文本都接近匹配某条规则但最终匹配失败"""
+    return [
+        ('长空白', ' ' * size),
+        ('长标识符', 'a' * size),
+        ('属性链', 'a.' * size),
+        ('未闭合调用', '\n    .multiplexBatchSellTokenForToken(' + 'x ' * size),
+        ('空白参数', '\n    .multiplexBatchSellTokenForToken(' + ' ' * size + ')'),
+        ('缺少 from', '\n    .multiplexBatchSellTokenForToken(a)' * (size // 40)),
+        ('未闭合导入', 'import {' + ' a,' * size),
+        ('超长导入', 'import { AbiEncoder, ' + ' a,' * size + ' } from "x";'),
+        ('截断的编码器', 'const batchSellDataEncoder = AbiEncoder.create([{ name: "calls", '
+                   'type: "tuple[]", components: [' + ' ' * size),
+        ('截断的 encode', 'data: plpDataEncoder.encode({ provider: ' + 'a' * size),
+        ('BigInt 字段后空白', 'order.amount' + ' ' * size),
+        ('截断的 reduce', '.reduce((a,' + ' ' * size),
+    ]
+
+
+def time_rule(rule, text, budget):
+    """返回耗时 (秒), 超出预算时返回 None"""
+    start = time.perf_counter()
+    try:
+        apply_rules(text, [rule], budget=budget)
+    except RuleTimeout:
+        return None
+    return time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='codemod 规则的吞吐量与病态输入基准')
+    parser.add_argument('size', nargs='?', type=int, default=20000, help='对抗输入规模 (默认: 20000)')
+    parser.add_argument('--source-mb', type=float, default=4, help='生成的大文件大小, MB (默认: 4)')
+    parser.add_argument('--budget', type=float, default=RULE_TIME_BUDGET,
+                        help=f'单条规则的时间预算, 秒 (默认: {RULE_TIME_BUDGET})')
+    args = parser.parse_args(argv)
+
+    rules = select_rules()
+    source = generate_ts_source(int(args.source_mb * 1024 * 1024))
+    over_budget = []
+
+    print(f"📊 大文件吞吐量 ({len(source) / 1024 / 1024:.1f} MB)")
+    print("=" * 60)
+    for rule in rules:
+        seconds = time_rule(rule, source, args.budget)
+        if seconds is None:
+            over_budget.append((rule.name, '大文件'))
+            print(f"   ❌ 超时            {rule.name}")
+        else:
+            print(f"   {len(source) / seconds / 1024 / 1024:>8.1f} MB/s  {rule.name}")
+
+    start = time.perf_counter()
+    apply_rules(source, rules)
+    seconds = time.perf_counter() - start
+    print(f"   全部规则一起: {seconds:.3f}s ({len(source) / seconds / 1024 / 1024:.1f} MB/s)")
+
+    print(f"\n🧨 对抗输入 (规模 {args.size} / {args.size * 2})")
+    print("=" * 60)
+    small_inputs = adversarial_inputs(args.size)
+    large_inputs = adversarial_inputs(args.size * 2)
+    for (name, small), (_, large) in zip(small_inputs, large_inputs):
+        worst = None
+        for rule in rules:
+            small_seconds = time_rule(rule, small, args.budget)
+            large_seconds = time_rule(rule, large, args.budget) if small_seconds is not None else None
+            if large_seconds is None:
+                over_budget.append((rule.name, name))
+                print(f"   ❌ {name}: {rule.name} 超出预算 {args.budget}s")
+                continue
+            if worst is None or large_seconds > worst[1]:
+                worst = (rule.name, large_seconds, large_seconds / max(small_seconds, 1e-6))
+        if worst:
+            print(f"   {name}: 最慢 {worst[0]} {worst[1] * 1000:.1f}ms (规模翻倍耗时 ×{worst[2]:.1f})")
+
+    if over_budget:
+        print(f"\n❌ {len(over_budget)} 个 (规则, 输入) 组合超出时间预算")
+        sys.exit(1)
+    print("\n✅ 所有规则都在时间预算内")
+
+
+if __name__ == "__main__":
+    main()
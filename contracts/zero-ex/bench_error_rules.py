@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+错误分类规则表的吞吐量基准
+
+生成包含大量失败测试的 mocha 日志, 对比原先手写的 if/elif 链与 ErrorRuleSet
+从规则表生成的分类函数的速度, 并校验两者分类结果一致. 生成的函数与手写的链做同样的检查,
+慢于手写链超过 MAX_SLOWDOWN 时视为退化, 以状态码 1 退出 (两者在同一台机器上对比, 与机器无关).
+
+用法: python3 bench_error_rules.py [失败数量, 默认 10000]
+"""
+
+import random
+import sys
+import time
+
+from analyze_errors import ErrorRuleSet, iter_test_failures
+from workloads import ERROR_MESSAGES, STACK_FRAMES
+
+# 生成的分类函数允许比手写链慢的比例, 超出时视为退化
+MAX_SLOWDOWN = 0.10
+# 计时取最快一次的次数
+REPEAT = 5
+
+
+def generate_log(failure_count, seed=0):
+    """生成包含 failure_count 个失败块的 mocha 日志行"""
+    rng = random.Random(seed)
+    yield '\n'
+    yield '  %d passing (8s)\n' % (failure_count * 3)
+    yield '  %d failing\n' % failure_count
+    yield '\n'
+    for number in range(1, failure_count + 1):
+        yield '  %d) MetaTransactions feature\n' % number
+        yield '       executeMetaTransaction()\n'
+        yield '         can call NativeOrders.fillLimitOrder() #%d:\n' % number
+        yield '     %s\n' % rng.choice(ERROR_MESSAGES)
+        for frame in STACK_FRAMES[:rng.randint(1, len(STACK_FRAMES))]:
+            yield frame + '\n'
+        yield '\n'
+
+
+def classify_block_legacy(block):
+    """原先逐条扫描的 if/elif 分类链, 仅用于对比"""
+    if 'missing value for component id' in block:
+        return 'ABI_ENCODING_ERRORS'
+    elif 'Transaction reverted without a reason string' in block:
+        return 'TRANSACTION_REVERTS'
+    elif 'VM Exception while processing transaction: reverted with an unrecognized custom error' in block:
+        if '0x47ab394e' in block:
+            return 'ONLY_SELF_ERRORS'
+        elif '0xbea726ef' in block:
+            return 'META_TRANSACTION_ERRORS'
+        elif '0x734e6e1c' in block:
+            return 'FUNCTION_NOT_FOUND_ERRORS'
+        else:
+            return 'OTHER_CUSTOM_ERRORS'
+    elif 'AssertionError: Expected transaction to be reverted with reason' in block:
+        return 'REVERT_ASSERTION_ERRORS'
+    elif 'AssertionError: expected' in block and 'to equal' in block:
+        return 'VALUE_ASSERTION_ERRORS'
+    elif 'TypeError:' in block:
+        if 'is not a function' in block:
+            return 'FUNCTION_NOT_FOUND_ERRORS'
+        else:
+            return 'TYPE_ERRORS'
+    elif 'RangeError: data out-of-bounds' in block:
+        return 'DATA_BOUNDS_ERRORS'
+    elif 'Error: Instance of' in block and 'does not have all its parameter values set' in block:
+        return 'PARAMETER_MISSING_ERRORS'
+    elif '错误编码不匹配' in block:
+        return 'ERROR_ENCODING_MISMATCH'
+    else:
+        return 'UNCLASSIFIED_ERRORS'
+
+
+def timed(func, blocks):
+    """返回分类结果和 REPEAT 次中最快一次的耗时"""
+    best = None
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        results = [func(block) for block in blocks]
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return results, best
+
+
+def main():
+    failure_count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+
+    start = time.perf_counter()
+    blocks = [failure.block for failure in iter_test_failures(generate_log(failure_count))]
+    parse_seconds = time.perf_counter() - start
+    total_bytes = sum(len(block.encode('utf-8')) for block in blocks)
+
+    rules = ErrorRuleSet.from_file()
+    legacy, legacy_seconds = timed(classify_block_legacy, blocks)
+    compiled, compiled_seconds = timed(rules.classify, blocks)
+
+    mismatches = sum(1 for a, b in zip(legacy, compiled) if a != b)
+
+    print(f"📊 失败块: {len(blocks)} 个, {total_bytes / 1024 / 1024:.1f} MB")
+    print(f"   解析:        {parse_seconds:.3f}s ({len(blocks) / parse_seconds:,.0f} 个/秒)")
+    print(f"   if/elif 链:  {legacy_seconds:.3f}s ({len(blocks) / legacy_seconds:,.0f} 个/秒)")
+    print(f"   编译规则表:  {compiled_seconds:.3f}s ({len(blocks) / compiled_seconds:,.0f} 个/秒)")
+
+    if mismatches:
+        print(f"❌ 分类结果不一致: {mismatches} 个")
+        sys.exit(1)
+    if compiled_seconds > legacy_seconds * (1 + MAX_SLOWDOWN):
+        print(f"❌ 规则表比 if/elif 链慢 {compiled_seconds / legacy_seconds - 1:.0%}, 超过 {MAX_SLOWDOWN:.0%}")
+        sys.exit(1)
+    print("✅ 分类结果一致, 速度不低于 if/elif 链")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+zx.py 的启动时间基准
+
+在子进程中多次运行 zx.py --help, 各子命令的 --help 和几个小规模调用, 取中位数.
+同时测量空解释器 (python -c pass) 的启动时间作为参照. 任一命令的中位数超过
+预算 (默认 100ms) 时以状态码 1 退出, 防止有人在模块顶层加入重的导入或正则编译.
+
+用法: python3 bench_startup.py [--runs N] [--budget 毫秒]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+ZX = os.path.join(PACKAGE_DIR, 'zx.py')
+
+
+def startup_commands():
+    """[(名称, 参数)], 参数传给 python zx.py"""
+    commands = [('zx --help', ['--help'])]
+    commands += [(f'{name} --help', [name, '--help'])
+                 for name in ('analyze', 'fix', 'addresses', 'profile', 'shards', 'history', 'diff', 'lookup',
+                              'check-addresses')]
+    commands += [
+        ('analyze 单个日志', ['analyze', os.path.join(PACKAGE_DIR, 'test_results.txt'), '-o', os.devnull]),
+        ('fix --dry-run 单个文件', ['fix', '--dry-run', '--no-cache', '--no-index', '-j', '1',
+                                   os.path.join(PACKAGE_DIR, 'test', 'features', 'ownable_test.ts')]),
+    ]
+    return commands
+
+
+def time_command(args, runs):
+    """返回 runs 次运行耗时的中位数 (毫秒), 命令失败时返回 None (失败的命令往往退出得很快, 不能算数)"""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        completed = subprocess.run(args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+        samples.append((time.perf_counter() - start) * 1000)
+        if completed.returncode != 0:
+            return None
+    return statistics.median(samples)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='zx.py 的启动时间基准')
+    parser.add_argument('--runs', type=int, default=10, help='每个命令的运行次数 (默认: 10)')
+    parser.add_argument('--budget', type=float, default=100, help='中位数启动时间预算, 毫秒 (默认: 100)')
+    args = parser.parse_args(argv)
+
+    baseline = time_command([sys.executable, '-c', 'pass'], args.runs)
+    print(f"🚀 **启动时间** (中位数, {args.runs} 次; 空解释器 {baseline:.1f}ms)")
+    print("=" * 60)
+
+    over_budget = []
+    failed = []
+    for name, command in startup_commands():
+        milliseconds = time_command([sys.executable, ZX] + command, args.runs)
+        if milliseconds is None:
+            failed.append(name)
+            print(f" ❌    运行失败  {name}")
+            continue
+        mark = '❌' if milliseconds > args.budget else '  '
+        print(f" {mark} {milliseconds:>7.1f}ms  {name}")
+        if milliseconds > args.budget:
+            over_budget.append(name)
+
+    if failed:
+        print(f"\n❌ {len(failed)} 个命令运行失败")
+    if over_budget:
+        print(f"\n❌ {len(over_budget)} 个命令超出 {args.budget:.0f}ms 预算")
+    if failed or over_budget:
+        sys.exit(1)
+    print(f"\n✅ 所有命令都在 {args.budget:.0f}ms 预算内")
+
+
+if __name__ == "__main__":
+    main()
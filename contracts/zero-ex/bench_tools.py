@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Python 工具的吞吐量与峰值内存回归基准
+
+用 workloads.py 生成的合成输入依次运行各工具的核心函数:
+
+  analyze    analyze_log 分类 mocha 日志
+  profile    load_test_timings + build_profile 统计测试耗时
+  history    TestHistory.ingest 写入内存中的历史库
+  fix        apply_rules 对 TypeScript 代码运行全部 fix_* 规则
+  tokenize   ts_tokens.tokenize 切分 TypeScript 代码
+  addresses  generate_addresses.py 读取 addresses.json 并渲染地址页
+
+吞吐量取 --repeat 次中最快一次 (MB/s), 峰值内存用 tracemalloc 单独运行一次测量
+(tracemalloc 会拖慢运行, 所以不和计时放在一起). 有两种检查, 任一失败时以状态码 1 退出:
+
+  - bench_thresholds.json (提交到仓库): 宽松的吞吐量下限和规模 ×1 时的峰值内存上限.
+    下限约为开发机的四分之一, 峰值内存与机器无关, 在 CI 上也能拦住明显的退化.
+  - .bench_baseline.json (本机, 不提交): --save 把结果存为基准, 之后的运行与基准对比,
+    吞吐量下降或峰值内存增长超过 --tolerance 时视为退化.
+
+用法: python3 bench_tools.py [--scale N] [--save] [--tolerance 0.25] [case ...]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import OrderedDict
+
+from workloads import generate_addresses, generate_mocha_log, generate_ts_source
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(os.path.dirname(PACKAGE_DIR))
+BASELINE_FILE = os.path.join(PACKAGE_DIR, '.bench_baseline.json')
+THRESHOLDS_FILE = os.path.join(PACKAGE_DIR, 'bench_thresholds.json')
+
+
+def write_log(directory, scale):
+    path = os.path.join(directory, 'bench.log')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.writelines(generate_mocha_log(passing=4000 * scale, failing=1500 * scale, pending=200 * scale))
+    return path
+
+
+def analyze_case(directory, scale):
+    from analyze_errors import analyze_log, get_error_rules
+    path = write_log(directory, scale)
+    rules = get_error_rules()
+    return os.path.getsize(path), lambda: analyze_log(path, rules)
+
+
+def profile_case(directory, scale):
+    from profile_tests import build_profile, load_test_timings
+    path = write_log(directory, scale)
+    return os.path.getsize(path), lambda: build_profile(load_test_timings(path))
+
+
+def history_case(directory, scale):
+    from analyze_errors import get_error_rules
+    from test_history import TestHistory
+    path = write_log(directory, scale)
+    rules = get_error_rules()
+
+    def run():
+        history = TestHistory(':memory:')
+        try:
+            history.ingest(path, rules=rules)
+        finally:
+            history.close()
+    return os.path.getsize(path), run
+
+
+def fix_case(directory, scale):
+    from codemod import apply_rules, select_rules
+    source = generate_ts_source(1024 * 1024 * scale)
+    rules = select_rules()
+    return len(source.encode('utf-8')), lambda: apply_rules(source, rules)
+
+
+def tokenize_case(directory, scale):
+    from ts_tokens import tokenize
+    source = generate_ts_source(1024 * 1024 * scale)
+    return len(source.encode('utf-8')), lambda: tokenize(source)
+
+
+def addresses_case(directory, scale):
+    from importlib.util import module_from_spec, spec_from_file_location
+    script = os.path.join(REPO_ROOT, 'docs', 'scripts', 'generate_addresses.py')
+    spec = spec_from_file_location('generate_addresses', script)
+    module = module_from_spec(spec)
+    spec.loader.exec_module(module)
+    path = os.path.join(directory, 'addresses.json')
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(generate_addresses(chains=500 * scale, contracts=100, transformers=20), f, indent=4)
+
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            module.main(['--addresses', path, '-o', '-'])
+    return os.path.getsize(path), run
+
+
+# 名称 -> 准备函数 (临时目录, 规模) -> (输入字节数, 被测函数)
+CASES = OrderedDict([
+    ('analyze', analyze_case),
+    ('profile', profile_case),
+    ('history', history_case),
+    ('fix', fix_case),
+    ('tokenize', tokenize_case),
+    ('addresses', addresses_case),
+])
+
+
+def measure(func, size, repeat):
+    """返回 {'mb_per_s', 'seconds', 'peak_mb'}, 耗时取 repeat 次中最快一次"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        'mb_per_s': size / (1024 * 1024) / best,
+        'seconds': best,
+        'peak_mb': peak / (1024 * 1024),
+    }
+
+
+def compare_results(baseline, results, tolerance):
+    """返回 [(名称, 描述)], 吞吐量下降或峰值内存增长超过 tolerance 的项目"""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if result['mb_per_s'] < base['mb_per_s'] * (1 - tolerance):
+            regressions.append((name, f"吞吐量 {base['mb_per_s']:.2f} -> {result['mb_per_s']:.2f} MB/s"))
+        if result['peak_mb'] > base['peak_mb'] * (1 + tolerance):
+            regressions.append((name, f"峰值内存 {base['peak_mb']:.1f} -> {result['peak_mb']:.1f} MB"))
+    return regressions
+
+
+def check_thresholds(thresholds, results, scale):
+    """返回 [(名称, 描述)], 低于吞吐量下限或超过峰值内存上限 (只在规模 ×1 时检查) 的项目"""
+    violations = []
+    for name, result in results.items():
+        limits = thresholds.get(name, {})
+        if 'min_mb_per_s' in limits and result['mb_per_s'] < limits['min_mb_per_s']:
+            violations.append((name, f"吞吐量 {result['mb_per_s']:.2f} MB/s 低于下限 {limits['min_mb_per_s']}"))
+        if scale == 1 and 'max_peak_mb' in limits and result['peak_mb'] > limits['max_peak_mb']:
+            violations.append((name, f"峰值内存 {result['peak_mb']:.1f} MB 超过上限 {limits['max_peak_mb']}"))
+    return violations
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Python 工具的吞吐量与峰值内存回归基准')
+    parser.add_argument('cases', nargs='*', metavar='case',
+                        help=f"要运行的项目 (默认全部: {', '.join(CASES)})")
+    parser.add_argument('--scale', type=int, default=1, help='输入规模倍数 (默认: 1)')
+    parser.add_argument('--repeat', type=int, default=3, help='每个项目的计时次数 (默认: 3)')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='允许的退化比例 (默认: 0.25)')
+    parser.add_argument('--baseline', default=BASELINE_FILE, help='基准文件 (默认: .bench_baseline.json)')
+    parser.add_argument('--save', action='store_true', help='把本次结果保存为基准')
+    parser.add_argument('--thresholds', default=THRESHOLDS_FILE,
+                        help='吞吐量下限和峰值内存上限 (默认: bench_thresholds.json)')
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.cases if name not in CASES]
+    if unknown:
+        parser.error(f"未知项目: {', '.join(unknown)}")
+
+    if PACKAGE_DIR not in sys.path:
+        sys.path.insert(0, PACKAGE_DIR)
+
+    results = OrderedDict()
+    print(f"📏 **工具基准** (规模 ×{args.scale}, 取 {args.repeat} 次最快)")
+    print("=" * 60)
+    with tempfile.TemporaryDirectory() as directory:
+        for name in args.cases or CASES:
+            size, func = CASES[name](directory, args.scale)
+            result = measure(func, size, args.repeat)
+            results[name] = dict(result, scale=args.scale)
+            print(f"   {name:<10} {size / (1024 * 1024):>7.2f}MB  {result['seconds']:>7.3f}s  "
+                  f"{result['mb_per_s']:>8.2f} MB/s  峰值 {result['peak_mb']:>7.1f}MB")
+
+    with open(args.thresholds, 'r', encoding='utf-8') as f:
+        violations = check_thresholds(json.load(f), results, args.scale)
+    if violations:
+        print(f"\n❌ **超出 {os.path.basename(args.thresholds)} 的限制**")
+        for name, description in violations:
+            print(f"   {name:<10} {description}")
+    else:
+        print(f"\n✅ 满足 {os.path.basename(args.thresholds)} 的限制")
+
+    if not compare_baseline(args, results) or violations:
+        sys.exit(1)
+
+
+def compare_baseline(args, results):
+    """与本机基准对比 (--save 时保存基准), 有超过 tolerance 的退化时返回 False"""
+    try:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        baseline = None
+
+    if args.save:
+        # 只运行了部分项目时保留其他项目的基准
+        saved = dict(baseline or {}, **results)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(saved, f, indent=2)
+        print(f"💾 基准已保存到 {args.baseline}")
+        return True
+    if baseline is None:
+        print("💡 没有本机基准文件, 用 --save 保存本次结果作为基准")
+        return True
+    baseline = {name: result for name, result in baseline.items() if result.get('scale') == args.scale}
+    if not baseline:
+        print(f"⚠️  本机基准中没有规模 ×{args.scale} 的结果, 跳过对比")
+        return True
+
+    regressions = compare_results(baseline, results, args.tolerance)
+    if regressions:
+        print(f"❌ **与本机基准相比性能退化** (超过 {args.tolerance:.0%})")
+        for name, description in regressions:
+            print(f"   {name:<10} {description}")
+        return False
+    print(f"✅ 与本机基准相比没有超过 {args.tolerance:.0%} 的退化")
+    return True
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,601 @@
+#!/usr/bin/env python3
+"""
+批量修复脚本的统一执行引擎
+
+fix_abi_encoder.py / fix_bigint_errors.py / fix_multiplex_calls.py 各自把规则
+注册为一个规则集, 这里按需加载. 每个文件只读写一次, 依次应用所有选中的规则,
+并统计每条规则的命中次数.
+
+规则有两种: 正则规则 (CodemodRule) 逐条对全文做替换; token 规则 (TokenRule)
+在 ts_tokens 切出的 token 序列上匹配, 不会改到字符串和注释里的内容. 所有 token
+规则在正则规则之后合并成一次扫描, 只在各自的触发 token 处尝试匹配.
+
+传入目录时递归查找 .ts 文件并用进程池并行处理. .codemod_cache.json 按
+(文件内容哈希, 规则集版本) 记录已经处理过的内容, 重复运行时直接跳过;
+内容没有变化的文件不会被重写, 避免让 tsc/hardhat 的增量缓存失效.
+
+规则可以声明 literals: 文件中至少出现其中一个字面量时规则才可能匹配. 所有选中的
+规则都声明了字面量时, 运行器先用 literal_index 的持久索引挑出候选文件, 其余文件
+不会被打开; 每个候选文件也只运行字面量出现过的规则. 字面量按文件原始内容检查,
+如果一条规则依赖另一条规则的输出, 需要把该输出中的字面量也声明上.
+
+写文件时先写同目录下的临时文件再 rename, 中途崩溃不会留下写了一半的文件.
+--dry-run 不写文件, 在工作进程中生成 unified diff 并按顺序输出到 stdout.
+
+每条规则在单个文件上的运行时间不能超过 RULE_TIME_BUDGET 秒 (用 SIGALRM 中断
+正则匹配), 超时的文件会被标记并跳过, 不会拖住整批处理.
+"""
+
+import argparse
+import hashlib
+import importlib
+import json
+import os
+import re
+import signal
+import stat
+import sys
+import threading
+import types
+from collections import Counter, OrderedDict, namedtuple
+
+from literal_index import DEFAULT_EXTENSIONS, INDEX_FILE, LiteralIndex, iter_source_files
+from ts_tokens import tokenize
+
+# 规则集名 -> 定义它的模块
+RULE_SET_MODULES = OrderedDict([
+    ('abi_encoder', 'fix_abi_encoder'),
+    ('bigint', 'fix_bigint_errors'),
+    ('multiplex', 'fix_multiplex_calls'),
+])
+
+CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.codemod_cache.json')
+CACHE_VERSION = 1
+
+# 单条规则处理单个文件的时间上限 (秒)
+RULE_TIME_BUDGET = 2.0
+
+_rule_sets = {}
+
+# 处理一个文件的结果, written 为写入 (dry-run 时为将要写入) 的字节数
+FileOutcome = namedtuple('FileOutcome', ['path', 'status', 'digest', 'hits', 'error', 'diff', 'written'])
+
+
+class RuleTimeout(Exception):
+    """规则在一个文件上超出了时间预算"""
+
+    def __init__(self, rule_name, budget):
+        super().__init__(f"规则 {rule_name} 超出时间预算 {budget}s")
+        self.rule_name = rule_name
+        self.budget = budget
+
+
+class CodemodRule:
+    """一条正则替换规则, 正则只在第一次使用时编译一次
+
+    literals 为空时规则对所有文件运行.
+    """
+
+    def __init__(self, name, pattern, replacement, flags=0, literals=()):
+        self.name = name
+        self.pattern = pattern
+        self.replacement = replacement
+        self.flags = flags
+        self.literals = tuple(literals)
+        self._compiled = None
+
+    @property
+    def compiled(self):
+        if self._compiled is None:
+            self._compiled = re.compile(self.pattern, self.flags)
+        return self._compiled
+
+    def apply(self, content):
+        """返回 (替换后的内容, 命中次数)"""
+        return self.compiled.subn(self.replacement, content)
+
+    def run(self, content, hits):
+        content, count = self.apply(content)
+        if count:
+            hits[self.name] += count
+        return content
+
+    def fingerprint(self):
+        return f"{self.name}\0{self.pattern}\0{self.replacement}\0{self.flags}\0{self.literals}"
+
+
+class TokenRule:
+    """一条在 token 序列上匹配的规则
+
+    triggers 为触发 token 的文本; tokens[index] 是触发 token 时调用
+    match(tokens, index), 返回 (起始下标, 结束下标, 替换文本) 表示把
+    tokens[起始:结束] 替换掉, 不匹配时返回 None. literals 默认就是 triggers.
+    """
+
+    def __init__(self, name, triggers, match, literals=None):
+        self.name = name
+        self.triggers = frozenset(triggers)
+        self.match = match
+        self.literals = tuple(sorted(self.triggers)) if literals is None else tuple(literals)
+
+    def fingerprint(self):
+        return f"{self.name}\0{sorted(self.triggers)}\0{self.literals}\0{_stable_repr(self.match)}"
+
+    def helper_modules(self):
+        """match 及其闭包中函数所在的模块"""
+        return {function.__module__ for function in _closure_functions(self.match)}
+
+
+def _closure_functions(function, seen=None):
+    """function 以及闭包中 (递归) 引用的函数"""
+    seen = set() if seen is None else seen
+    if id(function) in seen:
+        return []
+    seen.add(id(function))
+    functions = [function]
+    for cell in function.__closure__ or ():
+        try:
+            value = cell.cell_contents
+        except ValueError:
+            continue
+        if hasattr(value, '__code__'):
+            functions.extend(_closure_functions(value, seen))
+    return functions
+
+
+def _stable_repr(value, seen=None):
+    """跨进程稳定的表示: 函数取字节码, 常量和闭包变量, 集合排序后输出, 不含对象地址"""
+    seen = set() if seen is None else seen
+    if hasattr(value, '__code__'):
+        # 递归的嵌套函数会在闭包里引用自己
+        if id(value) in seen:
+            return '<recursive>'
+        seen = seen | {id(value)}
+        cells = []
+        for cell in value.__closure__ or ():
+            try:
+                cells.append(_stable_repr(cell.cell_contents, seen))
+            except ValueError:
+                cells.append('<empty>')
+        return f"{_stable_repr(value.__code__, seen)}[{', '.join(cells)}]"
+    if isinstance(value, types.CodeType):
+        consts = ', '.join(_stable_repr(const, seen) for const in value.co_consts)
+        return f"{value.co_code.hex()}({consts}){value.co_names}"
+    if isinstance(value, (set, frozenset)):
+        return f"{{{', '.join(sorted(_stable_repr(item, seen) for item in value))}}}"
+    if isinstance(value, (list, tuple)):
+        return f"[{', '.join(_stable_repr(item, seen) for item in value)}]"
+    if isinstance(value, dict):
+        items = sorted(f"{_stable_repr(key, seen)}: {_stable_repr(item, seen)}" for key, item in value.items())
+        return f"{{{', '.join(items)}}}"
+    return repr(value)
+
+
+class _TokenScan:
+    """把多条 token 规则合并成对一个文件的一次扫描"""
+
+    def __init__(self, rules):
+        self.rules = rules
+        self.name = f"token 扫描 ({', '.join(rule.name for rule in rules)})"
+        self._by_trigger = {}
+        for rule in rules:
+            for trigger in rule.triggers:
+                self._by_trigger.setdefault(trigger, []).append(rule)
+
+    def run(self, content, hits):
+        tokens = tokenize(content)
+        by_trigger = self._by_trigger
+        pieces = []
+        done = 0
+        for index in [i for i, token in enumerate(tokens) if token in by_trigger]:
+            if index < done:
+                continue
+            for rule in by_trigger[tokens[index]]:
+                edit = rule.match(tokens, index)
+                if edit is None or edit[0] < done:
+                    continue
+                start, end, replacement = edit
+                pieces.append(''.join(tokens[done:start]))
+                pieces.append(replacement)
+                done = end
+                hits[rule.name] += 1
+                break
+        if not pieces:
+            return content
+        pieces.append(''.join(tokens[done:]))
+        return ''.join(pieces)
+
+
+def register_rule_set(name, rules, flags=0):
+    """注册规则集, rules 中的元素为 CodemodRule, TokenRule 或
+    (规则名, pattern, replacement[, flags]) 元组
+
+    正则规则按列表顺序应用, CodemodRule 的 flags 为 None 或元组没有给出 flags 时
+    使用规则集的 flags. 规则名会加上规则集名作为前缀.
+    """
+    compiled = []
+    for rule in rules:
+        if isinstance(rule, TokenRule):
+            compiled.append(TokenRule(f"{name}.{rule.name}", rule.triggers, rule.match, rule.literals))
+        elif isinstance(rule, CodemodRule):
+            rule_flags = flags if rule.flags is None else rule.flags
+            compiled.append(CodemodRule(f"{name}.{rule.name}", rule.pattern, rule.replacement,
+                                        rule_flags, rule.literals))
+        else:
+            rule_name, pattern, replacement = rule[:3]
+            rule_flags = rule[3] if len(rule) > 3 else flags
+            compiled.append(CodemodRule(f"{name}.{rule_name}", pattern, replacement, rule_flags))
+    _rule_sets[name] = compiled
+    return compiled
+
+
+def get_rule_set(name):
+    """返回已注册的规则集, 未注册时先导入定义它的模块"""
+    if name not in _rule_sets:
+        if name not in RULE_SET_MODULES:
+            raise KeyError(f"未知规则集: {name}")
+        importlib.import_module(RULE_SET_MODULES[name])
+    return _rule_sets[name]
+
+
+def _can_interrupt():
+    """只有主线程能收到 SIGALRM, Windows 上没有 setitimer"""
+    return hasattr(signal, 'setitimer') and threading.current_thread() is threading.main_thread()
+
+
+def _rule_passes(rules):
+    """正则规则各是一遍, 所有 token 规则合并成最后一遍"""
+    passes = [rule for rule in rules if not isinstance(rule, TokenRule)]
+    token_rules = [rule for rule in rules if isinstance(rule, TokenRule)]
+    if token_rules:
+        passes.append(_TokenScan(token_rules))
+    return passes
+
+
+def apply_rules(content, rules, hits=None, budget=None):
+    """依次应用规则, 返回 (新内容, {规则名: 命中次数})
+
+    给出 budget 时, 任何一遍 (一条正则规则或合并的 token 扫描) 运行超过
+    budget 秒都会抛出 RuleTimeout.
+    """
+    hits = Counter() if hits is None else hits
+    passes = _rule_passes(rules)
+    if not budget or not _can_interrupt():
+        for current in passes:
+            content = current.run(content, hits)
+        return content, hits
+
+    current = None
+
+    def on_timeout(signum, frame):
+        raise RuleTimeout(current.name, budget)
+
+    previous_handler = signal.signal(signal.SIGALRM, on_timeout)
+    try:
+        for current in passes:
+            signal.setitimer(signal.ITIMER_REAL, budget)
+            try:
+                content = current.run(content, hits)
+            finally:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+    finally:
+        signal.signal(signal.SIGALRM, previous_handler)
+    return content, hits
+
+
+def select_rules(rule_set_names=None):
+    """按顺序展开选中的规则集, 默认全部"""
+    rules = []
+    for name in rule_set_names or RULE_SET_MODULES:
+        rules.extend(get_rule_set(name))
+    return rules
+
+
+def rules_for_literals(rules, present):
+    """文件中出现的字面量为 present 时可能匹配的规则下标"""
+    return tuple(index for index, rule in enumerate(rules)
+                 if not rule.literals or not present.isdisjoint(rule.literals))
+
+
+def _rule_modules(rules):
+    """定义规则及其辅助函数的模块: 规则集模块, token 规则的 match 所在模块和 ts_tokens"""
+    modules = {'ts_tokens'}
+    for rule in rules:
+        rule_set = rule.name.split('.', 1)[0]
+        if rule_set in RULE_SET_MODULES:
+            modules.add(RULE_SET_MODULES[rule_set])
+        if isinstance(rule, TokenRule):
+            modules.update(rule.helper_modules())
+    return sorted(modules)
+
+
+def _module_source(name):
+    """已导入模块的源码, 拿不到时为空 (如交互式定义的规则)"""
+    path = getattr(sys.modules.get(name), '__file__', None)
+    if not path:
+        return b''
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    except OSError:
+        return b''
+
+
+def ruleset_version(rules):
+    """规则内容的哈希, 任何一条规则变化都会得到新的版本
+
+    除规则本身 (token 规则包括闭包变量) 外还哈希定义规则及其辅助函数的模块源码,
+    match 通过全局名调用的辅助函数 (如 ts_tokens.next_significant) 改动后缓存同样失效.
+    """
+    digest = hashlib.sha1()
+    for name in _rule_modules(rules):
+        digest.update(f"{name}\0".encode('utf-8') + _module_source(name) + b'\n')
+    for rule in rules:
+        digest.update(f"{rule.fingerprint()}\n".encode('utf-8'))
+    return digest.hexdigest()[:12]
+
+
+def write_atomic(file_path, data):
+    """先写入同目录的临时文件, fsync 后 rename 覆盖目标, 保留原文件权限"""
+    import tempfile  # 只有真正写文件时才需要, 不拖慢 --help 和 --dry-run 的启动
+    directory = os.path.dirname(os.path.abspath(file_path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(file_path)}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            os.chmod(temp_path, stat.S_IMODE(os.stat(file_path).st_mode))
+        except FileNotFoundError:
+            pass
+        os.replace(temp_path, file_path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def unified_diff(file_path, before, after):
+    """git 风格的 unified diff 文本, 路径相对于当前目录, 可以直接 git apply"""
+    import difflib
+    label = os.path.relpath(file_path).replace(os.sep, '/')
+    lines = difflib.unified_diff(before.splitlines(keepends=True), after.splitlines(keepends=True),
+                                 fromfile=f"a/{label}", tofile=f"b/{label}")
+    return ''.join(line if line.endswith('\n') else line + '\n\\ No newline at end of file\n'
+                   for line in lines)
+
+
+def process_file(file_path, rules, budget=RULE_TIME_BUDGET, dry_run=False):
+    """读取 → 应用全部规则 → 有变化时原子写回, 返回 (是否修改, 命中统计, diff)
+
+    dry_run 时不写文件, diff 为 unified diff 文本, 否则为 None.
+    规则超时时抛出 RuleTimeout, 文件保持不变.
+    """
+    with open(file_path, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    fixed_content, hits = apply_rules(content, rules, budget=budget)
+
+    changed = fixed_content != content
+    if dry_run:
+        return changed, hits, unified_diff(file_path, content, fixed_content) if changed else ''
+    if changed:
+        write_atomic(file_path, fixed_content.encode('utf-8'))
+    return changed, hits, None
+
+
+def load_cache(cache_file, version):
+    """返回该规则集版本下已知无需修改的内容哈希集合"""
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return set()
+    # 结构不对的缓存 (被截断或手工修改) 视为未命中, 下次保存时覆盖
+    if not isinstance(data, dict) or data.get('version') != CACHE_VERSION:
+        return set()
+    rulesets = data.get('rulesets')
+    hashes = rulesets.get(version, []) if isinstance(rulesets, dict) else []
+    if not isinstance(hashes, list):
+        return set()
+    return {digest for digest in hashes if isinstance(digest, str)}
+
+
+def save_cache(cache_file, version, clean_hashes):
+    """只保留当前规则集版本的记录, 旧版本的哈希已经没有意义"""
+    with open(cache_file, 'w', encoding='utf-8') as f:
+        json.dump({'version': CACHE_VERSION, 'rulesets': {version: sorted(clean_hashes)}}, f)
+
+
+_worker_rules = None
+_worker_clean_hashes = frozenset()
+_worker_budget = None
+_worker_dry_run = False
+
+
+def _init_worker(rule_set_names, clean_hashes, budget, dry_run):
+    global _worker_rules, _worker_clean_hashes, _worker_budget, _worker_dry_run
+    _worker_rules = select_rules(rule_set_names)
+    _worker_clean_hashes = clean_hashes
+    _worker_budget = budget
+    _worker_dry_run = dry_run
+
+
+def _process_cached(task):
+    """在工作进程中处理一个文件, task 为 (路径, 要运行的规则下标或 None 表示全部)
+
+    返回 FileOutcome, 状态为 'cached' / 'unchanged' / 'changed' / 'timeout' / 'error'.
+    dry-run 时不写文件, diff 在这里生成, 主进程只负责按顺序输出.
+    """
+    file_path, rule_indexes = task
+    rules = _worker_rules if rule_indexes is None else [_worker_rules[i] for i in rule_indexes]
+    try:
+        with open(file_path, 'rb') as f:
+            raw = f.read()
+        digest = hashlib.sha1(raw).hexdigest()
+        if digest in _worker_clean_hashes:
+            return FileOutcome(file_path, 'cached', digest, {}, None, None, 0)
+
+        content = raw.decode('utf-8')
+        try:
+            fixed_content, hits = apply_rules(content, rules, budget=_worker_budget)
+        except RuleTimeout as e:
+            return FileOutcome(file_path, 'timeout', None, {}, str(e), None, 0)
+        if fixed_content == content:
+            return FileOutcome(file_path, 'unchanged', digest, dict(hits), None, None, 0)
+
+        fixed_raw = fixed_content.encode('utf-8')
+        if _worker_dry_run:
+            diff = unified_diff(file_path, content, fixed_content)
+            return FileOutcome(file_path, 'changed', None, dict(hits), None, diff, len(fixed_raw))
+        write_atomic(file_path, fixed_raw)
+        return FileOutcome(file_path, 'changed', hashlib.sha1(fixed_raw).hexdigest(), dict(hits),
+                           None, None, len(fixed_raw))
+    except Exception as e:
+        return FileOutcome(file_path, 'error', None, {}, str(e), None, 0)
+
+
+def select_tasks(files, rules, index_file, results):
+    """用字面量索引挑出候选文件, 返回 [(路径, 规则下标或 None)]
+
+    不包含任何所需字面量的文件记入 results['skipped'], 不会被打开.
+    有规则没有声明字面量时不做筛选.
+    """
+    if not index_file or not all(rule.literals for rule in rules):
+        return [(path, None) for path in files]
+
+    index = LiteralIndex.load(index_file)
+    index.update(files, [literal for rule in rules for literal in rule.literals])
+    index.save(index_file)
+
+    tasks = []
+    for path in files:
+        present = index.present(path)
+        if present is None:
+            tasks.append((path, None))
+            continue
+        rule_indexes = rules_for_literals(rules, present)
+        if rule_indexes:
+            tasks.append((path, rule_indexes))
+        else:
+            results['skipped'].append(path)
+    return tasks
+
+
+def run_codemod(paths, rule_set_names=None, jobs=None, cache_file=CACHE_FILE,
+                extensions=DEFAULT_EXTENSIONS, budget=RULE_TIME_BUDGET, index_file=INDEX_FILE,
+                dry_run=False, on_outcome=None):
+    """并行处理所有文件, 返回 ({状态: [路径]}, 总命中统计, 写入字节数)
+
+    规则按顺序只应用一遍, 修改后的内容不一定是不动点, 所以只把
+    "应用规则后没有变化" 的内容哈希记入缓存. on_outcome 按文件顺序
+    收到每个 FileOutcome, 用于边处理边输出 diff.
+    """
+    rule_set_names = list(rule_set_names or RULE_SET_MODULES)
+    rules = select_rules(rule_set_names)
+    version = ruleset_version(rules)
+    clean_hashes = load_cache(cache_file, version) if cache_file else set()
+    files = list(dict.fromkeys(iter_source_files(paths, extensions)))
+
+    results = {'skipped': [], 'cached': [], 'unchanged': [], 'changed': [], 'timeout': [], 'error': []}
+    tasks = select_tasks(files, rules, index_file, results)
+
+    total_hits = Counter()
+    written = 0
+    initargs = (rule_set_names, frozenset(clean_hashes), budget, dry_run)
+    if jobs == 1 or len(tasks) <= 1:
+        _init_worker(*initargs)
+        outcomes = map(_process_cached, tasks)
+        executor = None
+    else:
+        # 进程池的导入 (multiprocessing, pickle, socket...) 要几十毫秒, 只在需要并行时才导入
+        from concurrent.futures import ProcessPoolExecutor
+        executor = ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=initargs)
+        outcomes = executor.map(_process_cached, tasks, chunksize=8)
+
+    try:
+        for outcome in outcomes:
+            results[outcome.status].append((outcome.path, outcome.error) if outcome.error else outcome.path)
+            total_hits.update(outcome.hits)
+            written += outcome.written
+            if outcome.status in ('cached', 'unchanged'):
+                clean_hashes.add(outcome.digest)
+            if on_outcome is not None:
+                on_outcome(outcome)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    if cache_file:
+        save_cache(cache_file, version, clean_hashes)
+    return results, total_hits, written
+
+
+def print_hit_summary(hits, changed_files, total_files, file=sys.stdout):
+    print(f"\n📊 **规则命中统计** (修改 {changed_files}/{total_files} 个文件)", file=file)
+    print("=" * 60, file=file)
+    for rule_name, count in sorted(hits.items(), key=lambda x: x[1], reverse=True):
+        print(f"   {count:>5}  {rule_name}", file=file)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='一次性对文件或目录应用所有 fix_* 修复规则')
+    parser.add_argument('paths', nargs='+', help='要修复的文件或目录')
+    parser.add_argument('-r', '--rules', default=','.join(RULE_SET_MODULES),
+                        help=f"逗号分隔的规则集 (默认: {','.join(RULE_SET_MODULES)})")
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help='并行进程数 (默认: CPU 核数)')
+    parser.add_argument('--ext', nargs='+', default=list(DEFAULT_EXTENSIONS),
+                        help='目录中要处理的文件扩展名 (默认: .ts)')
+    parser.add_argument('--no-cache', action='store_true', help='不读取也不更新内容哈希缓存')
+    parser.add_argument('--no-index', action='store_true', help='不使用字面量索引筛选候选文件')
+    parser.add_argument('--budget', type=float, default=RULE_TIME_BUDGET,
+                        help=f'单条规则处理单个文件的时间上限, 秒, 0 表示不限制 (默认: {RULE_TIME_BUDGET})')
+    parser.add_argument('-n', '--dry-run', action='store_true',
+                        help='不修改文件, 把 unified diff 输出到 stdout, 统计输出到 stderr')
+    args = parser.parse_args(argv)
+
+    rule_set_names = [name for name in args.rules.split(',') if name]
+    try:
+        select_rules(rule_set_names)
+    except KeyError as e:
+        print(f"❌ {e.args[0]}")
+        sys.exit(1)
+
+    # dry-run 时 stdout 只输出 diff, 可以直接交给 git apply
+    report = sys.stderr if args.dry_run else sys.stdout
+
+    def on_outcome(outcome):
+        if outcome.status == 'changed':
+            if args.dry_run:
+                sys.stdout.write(outcome.diff)
+            else:
+                print(f"Fixed {outcome.path}")
+        elif outcome.status == 'timeout':
+            print(f"⏱️  已跳过 {outcome.path}: {outcome.error}", file=report)
+        elif outcome.status == 'error':
+            print(f"Error processing {outcome.path}: {outcome.error}", file=report)
+
+    results, total_hits, written = run_codemod(
+        args.paths, rule_set_names, jobs=args.jobs,
+        cache_file=None if args.no_cache else CACHE_FILE, extensions=tuple(args.ext),
+        budget=args.budget, index_file=None if args.no_index else INDEX_FILE,
+        dry_run=args.dry_run, on_outcome=on_outcome)
+
+    total = sum(len(entries) for entries in results.values())
+    print_hit_summary(total_hits, len(results['changed']), total, file=report)
+    print(f"   索引跳过 {len(results['skipped'])} 个, 缓存命中 {len(results['cached'])} 个, "
+          f"无需修改 {len(results['unchanged'])} 个", file=report)
+    action = '将写入' if args.dry_run else '写入'
+    print(f"   {action} {len(results['changed'])} 个文件, 共 {written:,} 字节", file=report)
+    if results['error'] or results['timeout']:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    # fix_* 脚本导入的是 codemod 模块, 以脚本运行时也要使用同一份规则注册表和规则类
+    from codemod import main
+    main()
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+对比两次运行的错误分析结果: 各类别数量变化, 换了类别的测试, 新出现和消失的失败
+
+输入可以是 analyze_errors.py 输出的 error_analysis.json, 也可以直接是测试日志
+(spec 文本, json-stream 或 json 报告), 两者可以混用. 测试按 full_title (suite 路径 + 标题)
+建立哈希索引后对比, 不使用随失败数量变化的 mocha 失败编号, 整体是线性时间.
+同一标识出现多次时 (如同一测试在多个分片中都运行了) 每次都计入, 按类别的多重集合对比.
+
+error_analysis.json 只记录 [编号, 标题], full_title 在旁边的 error_analysis.details.json 中;
+没有明细文件时 (旧版的分析结果) 两侧都退回按标题对比, 不同 suite 中的同名测试会被合并.
+
+用法: python3 diff_analysis.py before.json after.json [-o analysis_diff.json]
+"""
+
+import argparse
+import json
+import os
+import sys
+from collections import Counter, defaultdict
+
+from analyze_errors import (ERROR_RULES_FILE, analyze_test_errors, collect_error_categories, details_file,
+                            get_error_rules, iter_classified_failures, iter_json_report_failures)
+
+
+def first_character(path):
+    """文件中第一个非空白字符, 空文件返回 ''"""
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            stripped = line.lstrip()
+            if stripped:
+                return stripped[0]
+    return ''
+
+
+def load_error_categories(path, rules_file=ERROR_RULES_FILE):
+    """读取 {category: [[test_num, test_name, full_title, ...], ...]}
+
+    只看第一个非空白字符判断格式: 不是 '{' 的 (spec 文本, json-stream) 按日志逐行流式分析;
+    '{' 开头的是分析结果或 mocha json 报告, 整体解析一次. 分析结果有明细文件时读取明细.
+    """
+    if first_character(path) != '{':
+        return analyze_test_errors(path, get_error_rules(rules_file))
+
+    details = details_file(path)
+    try:
+        with open(details if os.path.isfile(details) else path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except ValueError:
+        data = None
+    if isinstance(data, dict) and all(isinstance(errors, list) for errors in data.values()):
+        return data
+    if isinstance(data, dict) and isinstance(data.get('failures'), list):
+        failures = iter_json_report_failures(data)
+        return collect_error_categories(iter_classified_failures(failures, get_error_rules(rules_file)))
+    # 不是合法的 JSON, 也可能是以 '{' 开头的文本日志
+    return analyze_test_errors(path, get_error_rules(rules_file))
+
+
+def has_full_titles(error_categories):
+    return all(len(error) >= 3 for errors in error_categories.values() for error in errors)
+
+
+def index_tests(error_categories, by_title=False):
+    """{测试标识: [category, ...]}, 标识为 full_title (by_title 时为标题); 同一测试出现多次时全部保留"""
+    index = defaultdict(list)
+    for category, errors in error_categories.items():
+        for error in errors:
+            index[error[1] if by_title else error[2]].append(category)
+    return index
+
+
+def diff_error_categories(before, after):
+    """对比两次分析结果
+
+    返回 {'by_title', 'categories': [(category, before, after, delta)],
+    'moved': [(test, before_category, after_category)], 'appeared': [(test, category)],
+    'disappeared': [(test, category)]}. 类别按变化量绝对值排序, 测试按类别和标识排序.
+    """
+    by_title = not (has_full_titles(before) and has_full_titles(after))
+    before_index = index_tests(before, by_title)
+    after_index = index_tests(after, by_title)
+
+    counts = defaultdict(lambda: [0, 0])
+    for category, errors in before.items():
+        counts[category][0] = len(errors)
+    for category, errors in after.items():
+        counts[category][1] = len(errors)
+
+    moved = []
+    appeared = []
+    disappeared = []
+    for test in before_index.keys() | after_index.keys():
+        # 两侧相同的类别抵消, 剩下的依次配成换类别, 多出的是新出现或消失的失败
+        old = Counter(before_index.get(test, ()))
+        new = Counter(after_index.get(test, ()))
+        gone = sorted((old - new).elements())
+        came = sorted((new - old).elements())
+        moved.extend((test, previous, category) for previous, category in zip(gone, came))
+        disappeared.extend((test, category) for category in gone[len(came):])
+        appeared.extend((test, category) for category in came[len(gone):])
+
+    categories = [(category, old, new, new - old) for category, (old, new) in counts.items() if old or new]
+    categories.sort(key=lambda item: (-abs(item[3]), item[0]))
+    return {
+        'by_title': by_title,
+        'categories': categories,
+        'moved': sorted(moved, key=lambda item: (item[1], item[2], item[0])),
+        'appeared': sorted(appeared, key=lambda item: (item[1], item[0])),
+        'disappeared': sorted(disappeared, key=lambda item: (item[1], item[0])),
+    }
+
+
+def _print_tests(title, tests, limit):
+    print(f"\n{title}: {len(tests)} 个")
+    for test, *categories in tests[:limit]:
+        print(f"   [{' -> '.join(category.replace('_', ' ') for category in categories)}] {test}")
+    if len(tests) > limit:
+        print(f"   ... 还有 {len(tests) - limit} 个")
+
+
+def print_diff(diff, limit=20):
+    total_before = sum(old for _, old, _, _ in diff['categories'])
+    total_after = sum(new for _, _, new, _ in diff['categories'])
+    print(f"📊 **错误分类变化** (总计: {total_before} -> {total_after}, {total_after - total_before:+d})")
+    print("=" * 60)
+    if diff['by_title']:
+        print("⚠️  有一侧的 error_analysis.json 没有明细文件 (没有 suite 路径), 按测试标题对比")
+    for category, old, new, delta in diff['categories']:
+        print(f"   {delta:+5d}  {old:>4} -> {new:<4} {category.replace('_', ' ')}")
+
+    _print_tests("🔀 **换了类别的测试**", diff['moved'], limit)
+    _print_tests("🔴 **新出现的失败**", diff['appeared'], limit)
+    _print_tests("🟢 **消失的失败**", diff['disappeared'], limit)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='对比两次运行的错误分析结果')
+    parser.add_argument('before', help='基准: error_analysis.json 或测试日志')
+    parser.add_argument('after', help='当前: error_analysis.json 或测试日志')
+    parser.add_argument('-o', '--output', help='同时把对比结果写入该 JSON 文件')
+    parser.add_argument('--rules', default=ERROR_RULES_FILE,
+                        help='输入是日志时使用的错误分类规则表 (默认: error_rules.json)')
+    parser.add_argument('--limit', type=int, default=20, help='每组最多列出的测试数 (默认: 20)')
+    args = parser.parse_args(argv)
+
+    try:
+        before = load_error_categories(args.before, args.rules)
+        after = load_error_categories(args.after, args.rules)
+    except FileNotFoundError as e:
+        print(f"❌ 找不到文件: {e.filename}")
+        sys.exit(1)
+
+    diff = diff_error_categories(before, after)
+    print_diff(diff, args.limit)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(diff, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 对比结果已保存到 {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+为失败测试生成指纹, 把同一根因的失败聚到一起
+
+指纹由归一化后的错误信息首行和最靠上的几个仓库内栈帧组成. 归一化会去掉
+绝对路径, 十六进制数据 (revert 数据保留 4 字节选择器), ethers 版本号和数字,
+这样同一个 bug 在不同测试中触发时得到相同的指纹.
+"""
+
+import hashlib
+import re
+
+# 参与指纹的仓库内栈帧数量
+FINGERPRINT_FRAMES = 3
+
+# "/Users/king/javascript/protocol/node_modules/" 这类前缀
+NODE_MODULES_PREFIX_PATTERN = re.compile(r'/(?:[^\s/():]+/)*node_modules/')
+ABSOLUTE_DIR_PATTERN = re.compile(r'(?<![\w.@])/(?:[^\s/():]+/)+')
+RETURN_DATA_PATTERN = re.compile(r'(return data: 0x[0-9a-fA-F]{8})[0-9a-fA-F]*')
+HEX_PATTERN = re.compile(r'0x[0-9a-fA-F]+(?![0-9a-fA-F…])')
+VERSION_PATTERN = re.compile(r'version=[^,)\s]+')
+NUMBER_PATTERN = re.compile(r'\b\d+\b')
+
+# "at async Context.<anonymous> (test/features/meta_transactions_test.ts:304:24)"
+FRAME_PATTERN = re.compile(r'^at (?:async )?(?:(.*?) \((.+)\)|(.+))$')
+LINE_COLUMN_PATTERN = re.compile(r'(?::\d+)+$')
+
+
+def normalize_message(message):
+    """去掉错误信息中随运行环境和运行次数变化的部分"""
+    message = NODE_MODULES_PREFIX_PATTERN.sub('', message)
+    message = ABSOLUTE_DIR_PATTERN.sub('', message)
+    message = RETURN_DATA_PATTERN.sub(r'\1…', message)
+    message = HEX_PATTERN.sub('0x…', message)
+    message = VERSION_PATTERN.sub('version=*', message)
+    message = NUMBER_PATTERN.sub('N', message)
+    return message
+
+
+def parse_frame(frame):
+    """把栈帧行拆成 (函数名, 去掉行列号的位置), 无法解析时返回 None"""
+    match = FRAME_PATTERN.match(frame)
+    if not match:
+        return None
+    function, location, bare_location = match.groups()
+    location = LINE_COLUMN_PATTERN.sub('', location or bare_location)
+    return function or '', location
+
+
+def is_repo_location(location):
+    """仓库内的文件: 相对路径, 且不在 node_modules 中"""
+    return not location.startswith('/') and 'node_modules' not in location
+
+
+def repo_frames(failure, limit=FINGERPRINT_FRAMES):
+    """最靠上的 limit 个仓库内栈帧, 形如 "Context.<anonymous> (test/features/x_test.ts)" """
+    frames = []
+    for frame in failure.stack:
+        parsed = parse_frame(frame)
+        if parsed is None or not is_repo_location(parsed[1]):
+            continue
+        frames.append(f"{parsed[0]} ({parsed[1]})" if parsed[0] else parsed[1])
+        if len(frames) == limit:
+            break
+    return frames
+
+
+def fingerprint_failure(failure):
+    """返回 (指纹, 归一化的错误信息, 仓库内栈帧)"""
+    message = normalize_message(failure.message[0]) if failure.message else ''
+    frames = repo_frames(failure)
+    digest = hashlib.sha1('\n'.join([message] + frames).encode('utf-8')).hexdigest()[:12]
+    return digest, message, frames
+
+
+def add_to_clusters(clusters, category, failure):
+    """把一个失败测试加入 {指纹: cluster} 索引, 返回指纹"""
+    digest, message, frames = fingerprint_failure(failure)
+    cluster = clusters.get(digest)
+    if cluster is None:
+        cluster = clusters[digest] = {
+            'category': category,
+            'message': message,
+            'frames': frames,
+            'count': 0,
+            'tests': [],
+        }
+    cluster['count'] += 1
+    cluster['tests'].append((failure.number, failure.title))
+    return digest
+
+
+def merge_clusters(shard_clusters):
+    """合并各分片的聚类结果, 测试条目追加分片来源"""
+    merged = {}
+    for shard, clusters in shard_clusters:
+        for digest, cluster in clusters.items():
+            target = merged.get(digest)
+            if target is None:
+                target = merged[digest] = dict(cluster, count=0, tests=[])
+            target['count'] += cluster['count']
+            target['tests'].extend(tuple(test) + (shard,) for test in cluster['tests'])
+    return merged
+
+
+def print_cluster_summary(clusters, limit=20):
+    """按失败数量打印根因聚类"""
+    total = sum(cluster['count'] for cluster in clusters.values())
+    print(f"\n🧬 **根因聚类** ({total} 个失败 → {len(clusters)} 个指纹)")
+    print("=" * 60)
+
+    ordered = sorted(clusters.items(), key=lambda x: x[1]['count'], reverse=True)
+    for digest, cluster in ordered[:limit]:
+        print(f"\n🔸 [{digest}] {cluster['count']} 个 - {cluster['category']}")
+        print(f"   {cluster['message'] or '(无错误信息)'}")
+        if cluster.get('error'):
+            print(f"   ⮑ {cluster['error']}")
+        for frame in cluster['frames']:
+            print(f"     at {frame}")
+        for test in cluster['tests'][:3]:
+            print(f"   {test[0]}) {test[1]}")
+        if cluster['count'] > 3:
+            print(f"   ... 还有 {cluster['count'] - 3} 个")
+
+    if len(ordered) > limit:
+        print(f"\n   ... 还有 {len(ordered) - limit} 个指纹")
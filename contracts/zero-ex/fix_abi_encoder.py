@@ -6,59 +6,66 @@
 import re
 import sys
 
-def fix_abi_encoder_usage(content):
-    """修复 AbiEncoder 的使用"""
-    
+from codemod import CodemodRule, apply_rules, process_file, register_rule_set
+
+RULES = register_rule_set('abi_encoder', [
     # 移除 AbiEncoder 导入
-    content = re.sub(r'import\s*{\s*([^}]*),?\s*AbiEncoder\s*,?\s*([^}]*)\s*}\s*from\s*[\'"]@0x/utils[\'"];', 
-                     r'import { \1\2 } from "@0x/utils";', content)
-    content = re.sub(r'import\s*{\s*AbiEncoder\s*,?\s*([^}]*)\s*}\s*from\s*[\'"]@0x/utils[\'"];', 
-                     r'import { \1 } from "@0x/utils";', content)
-    content = re.sub(r'import\s*{\s*AbiEncoder\s*}\s*from\s*[\'"]@0x/utils[\'"];', '', content)
-    
+    CodemodRule('remove_import_middle',
+                r'import\s*{\s*([^}]*),?\s*AbiEncoder\s*,?\s*([^}]*)\s*}\s*from\s*[\'"]@0x/utils[\'"];',
+                r'import { \1\2 } from "@0x/utils";', flags=0, literals=['AbiEncoder']),
+    CodemodRule('remove_import_first',
+                r'import\s*{\s*AbiEncoder\s*,?\s*([^}]*)\s*}\s*from\s*[\'"]@0x/utils[\'"];',
+                r'import { \1 } from "@0x/utils";', flags=0, literals=['AbiEncoder']),
+    CodemodRule('remove_import_only',
+                r'import\s*{\s*AbiEncoder\s*}\s*from\s*[\'"]@0x/utils[\'"];', '',
+                flags=0, literals=['AbiEncoder']),
+
     # 清理空的导入行
-    content = re.sub(r'import\s*{\s*,?\s*}\s*from\s*[\'"]@0x/utils[\'"];', '', content)
-    content = re.sub(r'import\s*{\s*}\s*from\s*[\'"]@0x/utils[\'"];', '', content)
-    
+    CodemodRule('remove_empty_import_comma', r'import\s*{\s*,?\s*}\s*from\s*[\'"]@0x/utils[\'"];', '',
+                flags=0, literals=['@0x/utils']),
+    CodemodRule('remove_empty_import', r'import\s*{\s*}\s*from\s*[\'"]@0x/utils[\'"];', '',
+                flags=0, literals=['@0x/utils']),
+
     # 修复简单的 AbiEncoder.create 使用
-    patterns = [
-        # getLiquidityProviderMultiHopSubcall
-        (r'const plpDataEncoder = AbiEncoder\.create\(\[\s*{\s*name:\s*[\'"]provider[\'"],\s*type:\s*[\'"]address[\'"],?\s*},\s*{\s*name:\s*[\'"]auxiliaryData[\'"],\s*type:\s*[\'"]bytes[\'"],?\s*},?\s*\]\);',
-         'const abiCoder = ethers.AbiCoder.defaultAbiCoder();'),
-        
-        (r'data:\s*plpDataEncoder\.encode\(\{\s*provider:\s*([^,]+),\s*auxiliaryData:\s*([^}]+),?\s*\}\)',
-         r'data: abiCoder.encode(["address", "bytes"], [\1, \2])'),
-         
-        # getNestedBatchSellSubcall
-        (r'const batchSellDataEncoder = AbiEncoder\.create\(\[\s*{\s*name:\s*[\'"]calls[\'"],\s*type:\s*[\'"]tuple\[\][\'"],\s*components:\s*\[\s*{\s*name:\s*[\'"]id[\'"],\s*type:\s*[\'"]uint8[\'"],?\s*},\s*{\s*name:\s*[\'"]sellAmount[\'"],\s*type:\s*[\'"]uint256[\'"],?\s*},\s*{\s*name:\s*[\'"]data[\'"],\s*type:\s*[\'"]bytes[\'"],?\s*},?\s*\],?\s*},?\s*\]\);',
-         'const abiCoder = ethers.AbiCoder.defaultAbiCoder();'),
-         
-        (r'data:\s*batchSellDataEncoder\.encode\(\{\s*calls\s*\}\)',
-         'data: abiCoder.encode(["tuple(uint8,uint256,bytes)[]"], [calls])'),
-    ]
-    
-    for pattern, replacement in patterns:
-        content = re.sub(pattern, replacement, content, flags=re.MULTILINE | re.DOTALL)
-    
-    return content
+    # getLiquidityProviderMultiHopSubcall
+    CodemodRule('plp_encoder',
+                r'const plpDataEncoder = AbiEncoder\.create\(\[\s*{\s*name:\s*[\'"]provider[\'"],\s*type:\s*[\'"]address[\'"],?\s*},\s*{\s*name:\s*[\'"]auxiliaryData[\'"],\s*type:\s*[\'"]bytes[\'"],?\s*},?\s*\]\);',
+                'const abiCoder = ethers.AbiCoder.defaultAbiCoder();', flags=None, literals=['plpDataEncoder']),
+    CodemodRule('plp_encode',
+                r'data:\s*plpDataEncoder\.encode\(\{\s*provider:\s*([^,]+),\s*auxiliaryData:\s*([^}]+),?\s*\}\)',
+                r'data: abiCoder.encode(["address", "bytes"], [\1, \2])', flags=None, literals=['plpDataEncoder']),
+
+    # getNestedBatchSellSubcall
+    CodemodRule('batch_sell_encoder',
+                r'const batchSellDataEncoder = AbiEncoder\.create\(\[\s*{\s*name:\s*[\'"]calls[\'"],\s*type:\s*[\'"]tuple\[\][\'"],\s*components:\s*\[\s*{\s*name:\s*[\'"]id[\'"],\s*type:\s*[\'"]uint8[\'"],?\s*},\s*{\s*name:\s*[\'"]sellAmount[\'"],\s*type:\s*[\'"]uint256[\'"],?\s*},\s*{\s*name:\s*[\'"]data[\'"],\s*type:\s*[\'"]bytes[\'"],?\s*},?\s*\],?\s*},?\s*\]\);',
+                'const abiCoder = ethers.AbiCoder.defaultAbiCoder();', flags=None, literals=['batchSellDataEncoder']),
+    CodemodRule('batch_sell_encode',
+                r'data:\s*batchSellDataEncoder\.encode\(\{\s*calls\s*\}\)',
+                'data: abiCoder.encode(["tuple(uint8,uint256,bytes)[]"], [calls])',
+                flags=None, literals=['batchSellDataEncoder']),
+], flags=re.MULTILINE | re.DOTALL)
+
+
+def fix_abi_encoder_usage(content):
+    """修复 AbiEncoder 的使用"""
+    return apply_rules(content, RULES)[0]
+
 
 def main():
-    if len(sys.argv) != 2:
-        print("Usage: python3 fix_abi_encoder.py <file_path>")
+    args = [arg for arg in sys.argv[1:] if arg != '--dry-run']
+    dry_run = len(args) != len(sys.argv) - 1
+    if len(args) != 1:
+        print("Usage: python3 fix_abi_encoder.py [--dry-run] <file_path>")
         sys.exit(1)
     
-    file_path = sys.argv[1]
+    file_path = args[0]
     
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        fixed_content = fix_abi_encoder_usage(content)
-        
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(fixed_content)
-        
-        print(f"Fixed AbiEncoder usage in {file_path}")
+        _, _, diff = process_file(file_path, RULES, dry_run=dry_run)
+        if dry_run:
+            sys.stdout.write(diff)
+        else:
+            print(f"Fixed AbiEncoder usage in {file_path}")
         
     except Exception as e:
         print(f"Error processing {file_path}: {e}")
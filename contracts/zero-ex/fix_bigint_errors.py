@@ -3,50 +3,82 @@
 批量修复 BigInt 混合错误的脚本
 """
 
-import re
 import sys
 
+from codemod import TokenRule, apply_rules, process_file, register_rule_set
+from ts_tokens import is_identifier, is_integer, next_significant
+
+AMOUNT_FIELDS = {'takerAmount', 'makerAmount', 'amount'}
+OTHER_FIELDS = {'nonce', 'salt', 'expiry', 'value', 'balance'}
+
+
+def bigint_operand(operators):
+    """obj.field <op> 整数 -> obj.field <op> 整数n, field 为触发 token"""
+
+    def match(tokens, index):
+        if index < 2 or tokens[index - 1] != '.' or not is_identifier(tokens[index - 2]):
+            return None
+        operator = next_significant(tokens, index + 1)
+        if operator >= len(tokens) or tokens[operator] not in operators:
+            return None
+        number = next_significant(tokens, operator + 1)
+        if number >= len(tokens) or not is_integer(tokens[number]):
+            return None
+        # 1.5 这类小数已经是一个 token; 后面紧跟 . 的是成员访问, 不是算术
+        if number + 1 < len(tokens) and tokens[number + 1] == '.':
+            return None
+        return number, number + 1, tokens[number] + 'n'
+
+    return match
+
+
+def reduce_initial_value(tokens, index):
+    """.reduce((a, b) => a + b, 0) 的初始值改为 0n, reduce 为触发 token"""
+    if index < 1 or tokens[index - 1] != '.':
+        return None
+    position = index
+    for expected in ('(', '(', 'a', ',', 'b', ')', '=>', 'a', '+', 'b', ',', '0', ')'):
+        position = next_significant(tokens, position + 1)
+        if position >= len(tokens) or tokens[position] != expected:
+            return None
+        if expected == '0':
+            initial = position
+    return initial, initial + 1, '0n'
+
+
+# 修复常见的 BigInt + number 模式, 字符串和注释中的内容不会被修改
+RULES = register_rule_set('bigint', [
+    # order.amount + number -> order.amount + numberN
+    TokenRule('amount_arithmetic', AMOUNT_FIELDS, bigint_operand({'+', '-', '*', '/'})),
+
+    # 其他常见的 BigInt 字段
+    TokenRule('field_arithmetic', OTHER_FIELDS, bigint_operand({'+', '-'})),
+
+    # 函数调用中的 number 参数需要转换为 BigInt
+    TokenRule('reduce_initial', {'reduce'}, reduce_initial_value),
+])
+
+
 def fix_bigint_errors(content):
     """修复 BigInt 混合错误"""
-    
-    # 修复常见的 BigInt + number 模式
-    patterns = [
-        # order.amount + number -> order.amount + numberN
-        (r'(\w+\.(?:takerAmount|makerAmount|amount))\s*\+\s*(\d+)(?!n)', r'\1 + \2n'),
-        (r'(\w+\.(?:takerAmount|makerAmount|amount))\s*-\s*(\d+)(?!n)', r'\1 - \2n'),
-        (r'(\w+\.(?:takerAmount|makerAmount|amount))\s*\*\s*(\d+)(?!n)', r'\1 * \2n'),
-        (r'(\w+\.(?:takerAmount|makerAmount|amount))\s*/\s*(\d+)(?!n)', r'\1 / \2n'),
-        
-        # 其他常见的 BigInt 字段
-        (r'(\w+\.(?:nonce|salt|expiry|value|balance))\s*\+\s*(\d+)(?!n)', r'\1 + \2n'),
-        (r'(\w+\.(?:nonce|salt|expiry|value|balance))\s*-\s*(\d+)(?!n)', r'\1 - \2n'),
-        
-        # 函数调用中的 number 参数需要转换为 BigInt
-        (r'\.reduce\(\(a,\s*b\)\s*=>\s*a\s*\+\s*b,\s*0\)', r'.reduce((a, b) => a + b, 0n)'),
-    ]
-    
-    for pattern, replacement in patterns:
-        content = re.sub(pattern, replacement, content, flags=re.MULTILINE)
-    
-    return content
+    return apply_rules(content, RULES)[0]
+
 
 def main():
-    if len(sys.argv) != 2:
-        print("Usage: python3 fix_bigint_errors.py <file_path>")
+    args = [arg for arg in sys.argv[1:] if arg != '--dry-run']
+    dry_run = len(args) != len(sys.argv) - 1
+    if len(args) != 1:
+        print("Usage: python3 fix_bigint_errors.py [--dry-run] <file_path>")
         sys.exit(1)
     
-    file_path = sys.argv[1]
+    file_path = args[0]
     
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        fixed_content = fix_bigint_errors(content)
-        
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(fixed_content)
-        
-        print(f"Fixed BigInt errors in {file_path}")
+        _, _, diff = process_file(file_path, RULES, dry_run=dry_run)
+        if dry_run:
+            sys.stdout.write(diff)
+        else:
+            print(f"Fixed BigInt errors in {file_path}")
         
     except Exception as e:
         print(f"Error processing {file_path}: {e}")
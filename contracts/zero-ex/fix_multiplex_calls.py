@@ -6,56 +6,73 @@
 import re
 import sys
 
+from codemod import CodemodRule, TokenRule, apply_rules, process_file, register_rule_set
+from ts_tokens import is_identifier, next_significant
+
+MULTIPLEX_METHODS = [
+    'multiplexBatchSellTokenForToken',
+    'multiplexMultiHopSellTokenForToken',
+    'multiplexBatchSellEthForToken',
+    'multiplexBatchSellTokenForEth',
+    'multiplexMultiHopSellEthForToken',
+    'multiplexMultiHopSellTokenForEth',
+]
+
+
+def address_getter(tokens, index):
+    """作为参数的 obj.address -> await obj.getAddress(), address 为触发 token
+
+    obj 可以是成员链 (this.token), 链的开头不能是调用结果或下标, 如 foo().address.
+    """
+    if index < 2 or tokens[index - 1] != '.' or not is_identifier(tokens[index - 2]):
+        return None
+    following = next_significant(tokens, index + 1)
+    if following >= len(tokens) or tokens[following] not in (',', ')'):
+        return None
+    start = index - 2
+    while start >= 2 and tokens[start - 1] == '.' and is_identifier(tokens[start - 2]):
+        start -= 2
+    if start >= 1 and tokens[start - 1] in ('.', '?.'):
+        return None
+    return start, index + 1, f"await {''.join(tokens[start:index - 1])}.getAddress()"
+
+
+# 修复 multiplex 调用语法错误
+#
+# (?<!\s) 让匹配只从空白的开头尝试, 参数以非空白字符开头, 避免在长空白上出现
+# 二次回溯; 匹配结果与不加这些限制时相同.
+RULES = register_rule_set('multiplex', [
+    # 修复 ({ from: taker }) 语法, 所有方法合并成一个正则只扫描一遍
+    CodemodRule('from_call',
+                rf'(?<!\s)(\s+)\.({"|".join(MULTIPLEX_METHODS)})\(\s*([^)\s][^)]*)\)\s*\(\{{\s*from:\s*(\w+)\s*\}}\);',
+                r'\1.connect(await env.provider.getSigner(\4))\n\1.\2(\3);',
+                flags=None, literals=MULTIPLEX_METHODS),
+
+    # 修复 .address 为 await getAddress(), 字符串和注释中的内容不会被修改
+    TokenRule('address_getter', {'address'}, address_getter, literals=['.address']),
+], flags=re.MULTILINE | re.DOTALL)
+
+
 def fix_multiplex_calls(content):
     """修复 multiplex 调用语法"""
-    
-    # 修复 multiplex 调用语法错误
-    patterns = [
-        # 修复 ({ from: taker }) 语法
-        (r'(\s+)\.multiplexBatchSellTokenForToken\(\s*([^)]+)\s*\)\s*\(\{\s*from:\s*(\w+)\s*\}\);',
-         r'\1.connect(await env.provider.getSigner(\3))\n\1.multiplexBatchSellTokenForToken(\2);'),
-        
-        (r'(\s+)\.multiplexMultiHopSellTokenForToken\(\s*([^)]+)\s*\)\s*\(\{\s*from:\s*(\w+)\s*\}\);',
-         r'\1.connect(await env.provider.getSigner(\3))\n\1.multiplexMultiHopSellTokenForToken(\2);'),
-         
-        (r'(\s+)\.multiplexBatchSellEthForToken\(\s*([^)]+)\s*\)\s*\(\{\s*from:\s*(\w+)\s*\}\);',
-         r'\1.connect(await env.provider.getSigner(\3))\n\1.multiplexBatchSellEthForToken(\2);'),
-         
-        (r'(\s+)\.multiplexBatchSellTokenForEth\(\s*([^)]+)\s*\)\s*\(\{\s*from:\s*(\w+)\s*\}\);',
-         r'\1.connect(await env.provider.getSigner(\3))\n\1.multiplexBatchSellTokenForEth(\2);'),
-         
-        (r'(\s+)\.multiplexMultiHopSellEthForToken\(\s*([^)]+)\s*\)\s*\(\{\s*from:\s*(\w+)\s*\}\);',
-         r'\1.connect(await env.provider.getSigner(\3))\n\1.multiplexMultiHopSellEthForToken(\2);'),
-         
-        (r'(\s+)\.multiplexMultiHopSellTokenForEth\(\s*([^)]+)\s*\)\s*\(\{\s*from:\s*(\w+)\s*\}\);',
-         r'\1.connect(await env.provider.getSigner(\3))\n\1.multiplexMultiHopSellTokenForEth(\2);'),
-         
-        # 修复 .address 为 await getAddress()
-        (r'(\w+)\.address(?=\s*[,\)])', r'await \1.getAddress()'),
-    ]
-    
-    for pattern, replacement in patterns:
-        content = re.sub(pattern, replacement, content, flags=re.MULTILINE | re.DOTALL)
-    
-    return content
+    return apply_rules(content, RULES)[0]
+
 
 def main():
-    if len(sys.argv) != 2:
-        print("Usage: python3 fix_multiplex_calls.py <file_path>")
+    args = [arg for arg in sys.argv[1:] if arg != '--dry-run']
+    dry_run = len(args) != len(sys.argv) - 1
+    if len(args) != 1:
+        print("Usage: python3 fix_multiplex_calls.py [--dry-run] <file_path>")
         sys.exit(1)
     
-    file_path = sys.argv[1]
+    file_path = args[0]
     
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        fixed_content = fix_multiplex_calls(content)
-        
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(fixed_content)
-        
-        print(f"Fixed multiplex calls in {file_path}")
+        _, _, diff = process_file(file_path, RULES, dry_run=dry_run)
+        if dry_run:
+            sys.stdout.write(diff)
+        else:
+            print(f"Fixed multiplex calls in {file_path}")
         
     except Exception as e:
         print(f"Error processing {file_path}: {e}")
@@ -30,6 +30,12 @@ const config: HardhatUserConfig = {
         target: 'ethers-v6',
         alwaysGenerateOverloads: false,
     },
+    mocha: {
+        // hardhat test 不接受 --reporter 参数, 通过环境变量选择 reporter, 供 analyze_errors.py 读取结构化结果:
+        // MOCHA_REPORTER=json-stream npx hardhat test > mocha_report.jsonl
+        reporter: process.env.MOCHA_REPORTER || 'spec',
+        reporterOptions: process.env.MOCHA_REPORTER_OUTPUT ? { output: process.env.MOCHA_REPORTER_OUTPUT } : {},
+    },
 };
 
 export default config;
@@ -0,0 +1,81 @@
+"""
+纯 Python 实现的 keccak256 (以太坊使用的原始 Keccak, 不是 hashlib 中的 NIST SHA3-256)
+"""
+
+# keccak-f[1600] 的轮常数
+ROUND_CONSTANTS = [
+    0x0000000000000001, 0x0000000000008082, 0x800000000000808A, 0x8000000080008000,
+    0x000000000000808B, 0x0000000080000001, 0x8000000080008081, 0x8000000000008009,
+    0x000000000000008A, 0x0000000000000088, 0x0000000080008009, 0x000000008000000A,
+    0x000000008000808B, 0x800000000000008B, 0x8000000000008089, 0x8000000000008003,
+    0x8000000000008002, 0x8000000000000080, 0x000000000000800A, 0x800000008000000A,
+    0x8000000080008081, 0x8000000000008080, 0x0000000080000001, 0x8000000080008008,
+]
+
+# 每个 lane (x, y) 的循环左移位数, 按 x + 5 * y 排列
+ROTATION_OFFSETS = [
+    0, 1, 62, 28, 27,
+    36, 44, 6, 55, 20,
+    3, 10, 43, 25, 39,
+    41, 45, 15, 21, 8,
+    18, 2, 61, 56, 14,
+]
+
+# rho + pi 之后 lane x + 5 * y 移动到的位置
+PI_TARGETS = [y + 5 * ((2 * x + 3 * y) % 5) for y in range(5) for x in range(5)]
+
+MASK_64 = (1 << 64) - 1
+RATE_BYTES = 136  # 1088 位, keccak256 的 rate
+
+
+def _rotate_left(value, shift):
+    return ((value << shift) | (value >> (64 - shift))) & MASK_64 if shift else value
+
+
+def _keccak_f(state):
+    for round_constant in ROUND_CONSTANTS:
+        # theta
+        columns = [state[x] ^ state[x + 5] ^ state[x + 10] ^ state[x + 15] ^ state[x + 20] for x in range(5)]
+        for x in range(5):
+            d = columns[(x - 1) % 5] ^ _rotate_left(columns[(x + 1) % 5], 1)
+            for y in range(0, 25, 5):
+                state[x + y] ^= d
+
+        # rho + pi
+        moved = [0] * 25
+        for index in range(25):
+            moved[PI_TARGETS[index]] = _rotate_left(state[index], ROTATION_OFFSETS[index])
+
+        # chi
+        for y in range(0, 25, 5):
+            row = moved[y:y + 5]
+            for x in range(5):
+                state[x + y] = row[x] ^ (~row[(x + 1) % 5] & row[(x + 2) % 5] & MASK_64)
+
+        # iota
+        state[0] ^= round_constant
+
+
+def keccak256(data):
+    """返回 data (bytes 或 str) 的 32 字节 keccak256 摘要"""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+
+    padded = bytearray(data)
+    padded.append(0x01)
+    padded.extend(b'\x00' * (-len(padded) % RATE_BYTES))
+    padded[-1] |= 0x80
+
+    state = [0] * 25
+    for offset in range(0, len(padded), RATE_BYTES):
+        block = padded[offset:offset + RATE_BYTES]
+        for lane in range(RATE_BYTES // 8):
+            state[lane] ^= int.from_bytes(block[lane * 8:lane * 8 + 8], 'little')
+        _keccak_f(state)
+
+    return b''.join(state[lane].to_bytes(8, 'little') for lane in range(4))
+
+
+def function_selector(signature):
+    """返回函数或错误签名的 4 字节选择器, 形如 "0xa9059cbb" """
+    return '0x' + keccak256(signature)[:4].hex()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+源码字面量索引: 记录每个文件包含哪些字面量, 用来在打开文件之前筛掉无关文件
+
+codemod 规则声明自己需要的字面量 (如 AbiEncoder, multiplex, .address),
+运行时只处理至少包含其中一个字面量的文件. 索引保存在 .literal_index.json,
+文件的 mtime/大小不变时直接使用记录; 变化时读取内容, 哈希不变则沿用记录,
+否则重新检查所有已索引的字面量. 查询新的字面量时每个文件会被读取一次.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+
+INDEX_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.literal_index.json')
+INDEX_VERSION = 1
+
+DEFAULT_EXTENSIONS = ('.ts',)
+# 依赖和构建产物, 不需要处理
+SKIP_DIRS = {'node_modules', '.git', 'lib', 'cache', 'artifacts', 'generated-artifacts', 'out'}
+
+
+def iter_source_files(paths, extensions=DEFAULT_EXTENSIONS):
+    """展开文件和目录参数, 目录中按扩展名递归查找, 跳过 SKIP_DIRS"""
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS)
+            for name in sorted(files):
+                if name.endswith(extensions):
+                    yield os.path.join(root, name)
+
+
+def _valid_record(record):
+    return (isinstance(record, dict)
+            and isinstance(record.get('mtime_ns'), int) and isinstance(record.get('size'), int)
+            and isinstance(record.get('sha1'), str) and isinstance(record.get('present'), list))
+
+
+class LiteralIndex:
+    """{绝对路径: {'mtime_ns', 'size', 'sha1', 'present': [字面量]}}"""
+
+    def __init__(self, literals=(), files=None):
+        self.literals = list(literals)
+        self.files = files or {}
+        self._present = {path: set(record['present']) for path, record in self.files.items()}
+        self.read_count = 0
+
+    @classmethod
+    def load(cls, index_file=INDEX_FILE):
+        try:
+            with open(index_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return cls()
+        # 版本不同或结构不对 (被截断或手工修改) 时整体重建
+        if not isinstance(data, dict) or data.get('version') != INDEX_VERSION:
+            return cls()
+        literals, files = data.get('literals'), data.get('files')
+        if not (isinstance(literals, list) and all(isinstance(literal, str) for literal in literals)
+                and isinstance(files, dict) and all(_valid_record(record) for record in files.values())):
+            return cls()
+        return cls(literals, files)
+
+    def save(self, index_file=INDEX_FILE):
+        """写回索引, 顺便去掉已经不存在的文件"""
+        files = {path: record for path, record in self.files.items() if os.path.exists(path)}
+        with open(index_file, 'w', encoding='utf-8') as f:
+            json.dump({'version': INDEX_VERSION, 'literals': self.literals, 'files': files}, f)
+
+    def _scan(self, path, content, literals):
+        self._present.setdefault(path, set()).update(
+            literal for literal in literals if literal.encode('utf-8') in content)
+
+    def update(self, paths, literals=()):
+        """确保 paths 的记录是最新的, 并且包含 literals 中每个字面量的检查结果
+
+        无法访问的文件不会出现在索引中.
+        """
+        new_literals = [literal for literal in dict.fromkeys(literals) if literal not in self.literals]
+        self.literals.extend(new_literals)
+
+        for path in paths:
+            path = os.path.abspath(path)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                self.files.pop(path, None)
+                self._present.pop(path, None)
+                continue
+
+            record = self.files.get(path)
+            unchanged = record and record['mtime_ns'] == stat.st_mtime_ns and record['size'] == stat.st_size
+            if unchanged and not new_literals:
+                continue
+
+            try:
+                with open(path, 'rb') as f:
+                    content = f.read()
+            except OSError:
+                continue
+            self.read_count += 1
+
+            digest = hashlib.sha1(content).hexdigest()
+            if record and record['sha1'] == digest:
+                self._scan(path, content, new_literals)
+            else:
+                self._present[path] = set()
+                self._scan(path, content, self.literals)
+            self.files[path] = {
+                'mtime_ns': stat.st_mtime_ns,
+                'size': stat.st_size,
+                'sha1': digest,
+                'present': sorted(self._present[path]),
+            }
+
+    def present(self, path):
+        """文件中出现的已索引字面量, 不在索引中的文件返回 None"""
+        return self._present.get(os.path.abspath(path))
+
+    def contains_any(self, path, literals):
+        """文件是否包含任一字面量, 不在索引中的文件视为包含 (交给后续处理报错)"""
+        present = self.present(path)
+        return present is None or not present.isdisjoint(literals)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='查询包含给定字面量的源码文件')
+    parser.add_argument('literals', nargs='+', help='要查找的字面量, 多个时列出包含任一字面量的文件')
+    parser.add_argument('--paths', nargs='+', default=['.'], help='要索引的文件或目录 (默认: 当前目录)')
+    parser.add_argument('--ext', nargs='+', default=list(DEFAULT_EXTENSIONS),
+                        help='目录中要索引的文件扩展名 (默认: .ts)')
+    args = parser.parse_args(argv)
+
+    files = list(iter_source_files(args.paths, tuple(args.ext)))
+    index = LiteralIndex.load()
+    index.update(files, args.literals)
+    index.save()
+
+    matches = [path for path in files if index.contains_any(path, args.literals)]
+    for path in matches:
+        print(path)
+    print(f"🔎 {len(matches)}/{len(files)} 个文件匹配, 读取了 {index.read_count} 个文件", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
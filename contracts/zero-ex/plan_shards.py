@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+按历史耗时把测试文件均衡地分配到 N 个分片
+
+每个文件的预计耗时来自历史 mocha 日志 (profile_tests 解析的耗时标注),
+多份日志取平均. 没有耗时标注的测试 (通过但很快, 或失败) 按 UNTIMED_TEST_MS 计.
+没有历史记录的新文件按 it(...) 的数量乘以历史上每个测试的平均耗时估算.
+分配使用最长处理时间优先 (LPT): 从耗时最长的文件开始, 每次放入当前总耗时最小的分片.
+"""
+
+import argparse
+import glob
+import heapq
+import json
+import os
+import re
+import sys
+from collections import defaultdict
+
+from profile_tests import find_suite_files, load_test_timings
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_LOG = os.path.join(PACKAGE_DIR, 'full_test_output.txt')
+TEST_DIR = os.path.join(PACKAGE_DIR, 'test')
+DEFAULT_TESTS = os.path.join(TEST_DIR, '**', '*.ts')
+
+# 没有耗时标注的测试的估计耗时, mocha 只标注超过 slow/2 (默认 37ms) 的测试
+UNTIMED_TEST_MS = 10
+
+TEST_CASE_PATTERN = re.compile(r'\bit(?:\.only|\.skip)?\(')
+
+
+def file_durations_from_log(log_file, suite_files):
+    """从一份日志统计每个测试文件的耗时和测试数量, 返回 {path: (ms, test_count)}"""
+    durations = defaultdict(lambda: [0, 0])
+    for timing in load_test_timings(log_file):
+        if not timing.suite or timing.status == 'pending':
+            continue
+        path = suite_files.get(timing.suite[0])
+        if path is None:
+            continue
+        entry = durations[path]
+        entry[0] += timing.duration if timing.duration is not None else UNTIMED_TEST_MS
+        entry[1] += 1
+    return {path: tuple(entry) for path, entry in durations.items()}
+
+
+def estimate_file_durations(test_files, log_files, suite_files, project_dir=PACKAGE_DIR):
+    """估算每个测试文件的耗时, 返回 ({path: ms}, 没有历史记录的文件列表)
+
+    路径与 suite_files 一样相对于 project_dir (hardhat 项目目录).
+    """
+    history = defaultdict(list)
+    total_ms = 0
+    total_tests = 0
+    for log_file in log_files:
+        for path, (ms, count) in file_durations_from_log(log_file, suite_files).items():
+            history[path].append(ms)
+            total_ms += ms
+            total_tests += count
+
+    per_test_ms = total_ms / total_tests if total_tests else UNTIMED_TEST_MS
+
+    estimates = {}
+    unknown = []
+    for path in test_files:
+        if history.get(path):
+            estimates[path] = sum(history[path]) / len(history[path])
+        else:
+            with open(os.path.join(project_dir, path), 'r', encoding='utf-8', errors='replace') as f:
+                test_count = len(TEST_CASE_PATTERN.findall(f.read()))
+            estimates[path] = max(test_count, 1) * per_test_ms
+            unknown.append(path)
+    return estimates, unknown
+
+
+def plan_shards(estimates, shard_count):
+    """LPT 分配, 返回 [(预计耗时, [path, ...]), ...]"""
+    shards = [(0, index, []) for index in range(shard_count)]
+    heapq.heapify(shards)
+    for path in sorted(estimates, key=lambda p: (-estimates[p], p)):
+        load, index, files = heapq.heappop(shards)
+        files.append(path)
+        heapq.heappush(shards, (load + estimates[path], index, files))
+    return [(load, sorted(files)) for load, _, files in sorted(shards, key=lambda s: s[1])]
+
+
+def list_test_files(patterns, suite_files, project_dir=PACKAGE_DIR):
+    """展开测试文件 glob, 只保留定义了顶层 suite 的文件, 返回相对 project_dir 的路径"""
+    with_suites = set(suite_files.values())
+    paths = set()
+    for pattern in patterns:
+        paths.update(os.path.relpath(os.path.abspath(path), project_dir)
+                     for path in glob.glob(pattern, recursive=True))
+    return sorted(path for path in paths if path in with_suites)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='按历史耗时把测试文件均衡地分配到多个分片')
+    parser.add_argument('logs', nargs='*', default=[DEFAULT_LOG],
+                        help='历史 mocha 输出日志 (默认: full_test_output.txt)')
+    parser.add_argument('-n', '--shards', type=int, default=4, help='分片数量 (默认: 4)')
+    parser.add_argument('--tests', nargs='+', default=[DEFAULT_TESTS],
+                        help='测试文件 glob (默认: test/**/*.ts)')
+    parser.add_argument('--test-dir', default=TEST_DIR, help='用于映射 suite 到文件的测试目录 (默认: test)')
+    parser.add_argument('--shard', type=int,
+                        help='只输出第 K 个分片 (从 1 开始) 的文件, 以空格分隔, 可直接传给 hardhat test')
+    parser.add_argument('--json', help='把分片计划写入该 JSON 文件')
+    args = parser.parse_args(argv)
+
+    if args.shards < 1 or (args.shard is not None and not 1 <= args.shard <= args.shards):
+        print("❌ 分片参数无效")
+        sys.exit(1)
+
+    # 输出的路径相对 hardhat 项目目录 (测试目录的上级), 与 hardhat test 的参数一致
+    project_dir = os.path.dirname(os.path.abspath(args.test_dir))
+    suite_files = find_suite_files(args.test_dir)
+    test_files = list_test_files(args.tests, suite_files, project_dir)
+    if not test_files:
+        print(f"❌ 没有找到测试文件: {' '.join(args.tests)}")
+        sys.exit(1)
+    log_files = []
+    for log_file in args.logs:
+        if os.path.isfile(log_file):
+            log_files.append(log_file)
+        else:
+            print(f"⚠️  找不到日志文件, 已忽略: {log_file}", file=sys.stderr)
+
+    estimates, unknown = estimate_file_durations(test_files, log_files, suite_files, project_dir)
+    shards = plan_shards(estimates, args.shards)
+
+    if args.shard is not None:
+        print(' '.join(shards[args.shard - 1][1]))
+        return
+
+    print(f"🧩 **分片计划** ({len(test_files)} 个测试文件, {args.shards} 个分片)")
+    print("=" * 60)
+    for index, (load, files) in enumerate(shards, 1):
+        print(f"\n🔸 分片 {index}: 预计 {load:.0f}ms, {len(files)} 个文件")
+        for path in files:
+            marker = ' (无历史, 估算)' if path in unknown else ''
+            print(f"   {estimates[path]:>8.0f}ms  {path}{marker}")
+
+    if args.json:
+        plan = [{'estimated_ms': round(load), 'files': files} for load, files in shards]
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(plan, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 分片计划已保存到 {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+根据 mocha 输出中的耗时标注分析测试耗时
+
+mocha spec reporter 只给耗时超过 slow/2 的测试打上 "(69ms)" 标注,
+没有标注的测试视为 0ms, 单独计入未计时数量.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from collections import defaultdict, namedtuple
+
+from analyze_errors import full_title
+
+# "✔ Fully fills multiple orders (69ms)"
+PASSED_PATTERN = re.compile(r'^[✔✓]\s+(.*?)(?:\s+\((\d+)ms\))?$')
+# "1) can fill a WETH order with ETH"
+FAILED_PATTERN = re.compile(r'^\d+\)\s+(.*)$')
+# "- fails if gas price too low"
+PENDING_PATTERN = re.compile(r'^-\s+(.*)$')
+# "419 passing (8s)" / "24 pending" / "145 failing"
+SUMMARY_PATTERN = re.compile(r'^\d+\s+(passing|pending|failing)\b')
+# 测试文件中的顶层 suite: describe('MetaTransactions feature', ...) / blockchainTests.resets('...', ...)
+TOP_LEVEL_SUITE_PATTERN = re.compile(r'^(?:describe|blockchainTests(?:\.\w+)*)\(\s*([\'"`])(.+?)\1')
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_LOG = os.path.join(PACKAGE_DIR, 'full_test_output.txt')
+TEST_DIR = os.path.join(PACKAGE_DIR, 'test')
+
+PERCENTILES = (50, 90, 95, 99)
+
+TestTiming = namedtuple('TestTiming', ['run', 'suite', 'title', 'status', 'duration'])
+
+
+def iter_test_timings(lines):
+    """逐行解析 mocha spec 输出, 产出每个测试的 TestTiming
+
+    suite 层级由缩进决定. 汇总行之后是失败详情, 直到再次出现顶层 suite 行
+    (同一文件里拼接了多次运行) 才重新开始解析, run 记录是第几次运行.
+    """
+    run = 0
+    in_details = False
+    stack = []  # [(indent, suite_name)]
+
+    for line in lines:
+        line = line.rstrip('\r\n')
+        text = line.strip()
+        if not text:
+            continue
+        indent = len(line) - len(line.lstrip())
+        if indent == 0:
+            # 测试中 console.log 的输出, 以及 hardhat 自身的报错
+            continue
+
+        if SUMMARY_PATTERN.match(text):
+            in_details = True
+            continue
+        if in_details:
+            if indent > 2 or FAILED_PATTERN.match(text):
+                continue
+            # 失败详情之后又出现了顶层 suite, 说明是下一次运行
+            in_details = False
+            run += 1
+            stack = []
+
+        while stack and stack[-1][0] >= indent:
+            stack.pop()
+        suite = tuple(name for _, name in stack)
+
+        passed = PASSED_PATTERN.match(text)
+        if passed:
+            duration = int(passed.group(2)) if passed.group(2) else None
+            yield TestTiming(run, suite, passed.group(1).strip(), 'passed', duration)
+            continue
+        failed = FAILED_PATTERN.match(text)
+        if failed:
+            yield TestTiming(run, suite, failed.group(1).strip(), 'failed', None)
+            continue
+        pending = PENDING_PATTERN.match(text)
+        if pending:
+            yield TestTiming(run, suite, pending.group(1).strip(), 'pending', None)
+            continue
+
+        stack.append((indent, text))
+
+
+def load_test_timings(log_file, run=None):
+    """读取日志中的测试耗时, run 为 None 时使用最后一次完整运行"""
+    with open(log_file, 'r', encoding='utf-8', errors='replace') as f:
+        return select_run(list(iter_test_timings(f)), run)
+
+
+def select_run(timings, run=None):
+    """从拼接了多次运行的 timings 中取出一次运行, run 为 None 时使用最后一次完整运行"""
+    if run is None:
+        run = max((timing.run for timing in timings), default=0)
+        # 末尾被截断的运行不如前一次完整
+        if run > 0 and sum(1 for t in timings if t.run == run) < sum(1 for t in timings if t.run == run - 1):
+            run -= 1
+    return [timing for timing in timings if timing.run == run]
+
+
+def find_suite_files(test_dir='test'):
+    """扫描测试文件, 返回 {顶层 suite 名: 测试文件路径}
+
+    路径相对于 test_dir 的上级目录 (hardhat 项目目录), 与栈帧和 hardhat test 参数中的写法一致.
+    """
+    project_dir = os.path.dirname(os.path.abspath(test_dir))
+    suite_files = {}
+    for root, _, files in os.walk(test_dir):
+        for name in sorted(files):
+            if not name.endswith('.ts'):
+                continue
+            path = os.path.join(root, name)
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                for line in f:
+                    match = TOP_LEVEL_SUITE_PATTERN.match(line)
+                    if match:
+                        suite_files.setdefault(match.group(2), os.path.relpath(path, project_dir))
+    return suite_files
+
+
+def percentile(sorted_values, pct):
+    """最近秩法百分位数"""
+    if not sorted_values:
+        return 0
+    rank = max(1, -(-pct * len(sorted_values) // 100))
+    return sorted_values[rank - 1]
+
+
+def build_profile(timings, suite_files=None):
+    """汇总测试耗时: 最慢测试, 各层 suite 总耗时, 各测试文件总耗时, 百分位分布"""
+    suite_files = suite_files or {}
+    suite_totals = defaultdict(int)
+    file_totals = defaultdict(int)
+    durations = []
+    statuses = defaultdict(int)
+    untimed = 0
+
+    for timing in timings:
+        statuses[timing.status] += 1
+        if timing.status != 'passed':
+            continue
+        if timing.duration is None:
+            untimed += 1
+            continue
+        durations.append(timing.duration)
+        for depth in range(1, len(timing.suite) + 1):
+            suite_totals[' / '.join(timing.suite[:depth])] += timing.duration
+        if timing.suite:
+            file_totals[suite_files.get(timing.suite[0], timing.suite[0])] += timing.duration
+
+    timed = [t for t in timings if t.duration is not None]
+    timed.sort(key=lambda t: t.duration, reverse=True)
+    durations.sort()
+
+    return {
+        'tests': dict(statuses),
+        'untimed': untimed,
+        'total_ms': sum(durations),
+        'percentiles': {f'p{pct}': percentile(durations, pct) for pct in PERCENTILES},
+        'max_ms': durations[-1] if durations else 0,
+        'slowest_tests': [(full_title(t), t.duration) for t in timed],
+        'suites': sorted(suite_totals.items(), key=lambda x: x[1], reverse=True),
+        'files': sorted(file_totals.items(), key=lambda x: x[1], reverse=True),
+    }
+
+
+def compare_timings(baseline, current, threshold=0.2, min_delta=10):
+    """对比两次运行, 返回耗时增长超过 threshold (比例) 且至少 min_delta 毫秒的测试
+
+    按 full_title 匹配 (与 test_history, diff_analysis 一致), 返回 [(full_title, baseline_ms, current_ms), ...],
+    按增量排序.
+    """
+    previous = {full_title(t): t.duration for t in baseline if t.duration is not None}
+    regressions = []
+    for timing in current:
+        if timing.status != 'passed':
+            continue
+        before = previous.get(full_title(timing))
+        if before is None:
+            continue
+        # 之前未计时的测试按 0ms 计
+        after = timing.duration or 0
+        if after - before >= min_delta and after > before * (1 + threshold):
+            regressions.append((full_title(timing), before, after))
+    regressions.sort(key=lambda x: x[2] - x[1], reverse=True)
+    return regressions
+
+
+def print_profile(profile, top):
+    tests = profile['tests']
+    print(f"⏱️  **测试耗时分析** (通过 {tests.get('passed', 0)}, 失败 {tests.get('failed', 0)}, "
+          f"跳过 {tests.get('pending', 0)}, 未计时 {profile['untimed']})")
+    print("=" * 60)
+    pcts = ', '.join(f"{name}={value}ms" for name, value in profile['percentiles'].items())
+    print(f"总计 {profile['total_ms']}ms, {pcts}, max={profile['max_ms']}ms")
+
+    print(f"\n🐢 **最慢的 {top} 个测试**")
+    for test, duration in profile['slowest_tests'][:top]:
+        print(f"   {duration:>6}ms  {test}")
+
+    print(f"\n📦 **耗时最多的 {top} 个 suite**")
+    for suite, duration in profile['suites'][:top]:
+        print(f"   {duration:>6}ms  {suite}")
+
+    print("\n📄 **各测试文件耗时**")
+    for path, duration in profile['files']:
+        print(f"   {duration:>6}ms  {path}")
+
+
+def print_regressions(regressions, threshold):
+    print(f"\n📈 **耗时回归** (增长超过 {threshold:.0%}): {len(regressions)} 个")
+    for test, before, after in regressions:
+        print(f"   {before:>6}ms -> {after:>6}ms  {test}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='分析 mocha 输出中的测试耗时')
+    parser.add_argument('log', nargs='?', default=DEFAULT_LOG,
+                        help='mocha 输出日志 (默认: full_test_output.txt)')
+    parser.add_argument('--baseline', help='作为对比基准的另一次运行日志')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='判定为回归的耗时增长比例 (默认: 0.2)')
+    parser.add_argument('--min-delta', type=int, default=10,
+                        help='判定为回归的最小耗时增长, 毫秒 (默认: 10)')
+    parser.add_argument('--top', type=int, default=10, help='列出最慢的前 N 项 (默认: 10)')
+    parser.add_argument('--test-dir', default=TEST_DIR, help='用于映射 suite 到文件的测试目录 (默认: test)')
+    parser.add_argument('--json', help='同时把分析结果写入该 JSON 文件')
+    args = parser.parse_args(argv)
+
+    try:
+        timings = load_test_timings(args.log)
+    except FileNotFoundError:
+        print(f"❌ 找不到日志文件: {args.log}")
+        sys.exit(1)
+
+    profile = build_profile(timings, find_suite_files(args.test_dir))
+    print_profile(profile, args.top)
+
+    regressions = None
+    if args.baseline:
+        try:
+            baseline = load_test_timings(args.baseline)
+        except FileNotFoundError:
+            print(f"❌ 找不到日志文件: {args.baseline}")
+            sys.exit(1)
+        regressions = compare_timings(baseline, timings, args.threshold, args.min_delta)
+        print_regressions(regressions, args.threshold)
+
+    if args.json:
+        result = dict(profile)
+        if regressions is not None:
+            result['regressions'] = regressions
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 详细分析结果已保存到 {args.json}")
+
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+"""zero-ex Python 工具的测试: 把工具所在目录加入 sys.path, 提供 fixtures 目录"""
+
+import os
+import sys
+
+import pytest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+PACKAGE_DIR = os.path.dirname(TESTS_DIR)
+FIXTURES_DIR = os.path.join(TESTS_DIR, 'fixtures')
+
+if PACKAGE_DIR not in sys.path:
+    sys.path.insert(0, PACKAGE_DIR)
+
+
+@pytest.fixture
+def fixture_path():
+    return lambda name: os.path.join(FIXTURES_DIR, name)
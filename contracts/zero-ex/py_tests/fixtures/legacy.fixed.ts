@@ -0,0 +1,23 @@
+import { BigNumber, hexUtils  } from "@0x/utils";
+
+    const abiCoder = ethers.AbiCoder.defaultAbiCoder();
+
+        data: abiCoder.encode(["address", "bytes"], [await liquidityProvider.getAddress(), hexUtils.random() ]),
+
+    const abiCoder = ethers.AbiCoder.defaultAbiCoder();
+
+        data: abiCoder.encode(["tuple(uint8,uint256,bytes)[]"], [calls]),
+
+            await zeroEx
+                .connect(await env.provider.getSigner(taker))
+
+                .multiplexBatchSellTokenForToken(await dai.getAddress(), await zrx.getAddress(), [rfqSubcall], sellAmount, 0);
+
+        const expectedAmount = order.takerAmount - 1n;
+
+        const nextNonce = mtx.nonce + 1n;
+
+        const total = amounts.reduce((a, b) => a + b, 0n);
+
+        await token.approve(await zeroEx.getAddress(), MAX_UINT256);
+
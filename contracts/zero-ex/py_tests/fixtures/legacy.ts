@@ -0,0 +1,35 @@
+import { AbiEncoder, BigNumber, hexUtils } from "@0x/utils";
+
+    const plpDataEncoder = AbiEncoder.create([
+        { name: "provider", type: "address" },
+        { name: "auxiliaryData", type: "bytes" },
+    ]);
+
+        data: plpDataEncoder.encode({ provider: liquidityProvider.address, auxiliaryData: hexUtils.random() }),
+
+    const batchSellDataEncoder = AbiEncoder.create([
+        {
+            name: "calls",
+            type: "tuple[]",
+            components: [
+                { name: "id", type: "uint8" },
+                { name: "sellAmount", type: "uint256" },
+                { name: "data", type: "bytes" },
+            ],
+        },
+    ]);
+
+        data: batchSellDataEncoder.encode({ calls }),
+
+            await zeroEx
+                .multiplexBatchSellTokenForToken(dai.address, zrx.address, [rfqSubcall], sellAmount, 0)
+                ({ from: taker });
+
+        const expectedAmount = order.takerAmount - 1;
+
+        const nextNonce = mtx.nonce + 1;
+
+        const total = amounts.reduce((a, b) => a + b, 0);
+
+        await token.approve(zeroEx.address, MAX_UINT256);
+
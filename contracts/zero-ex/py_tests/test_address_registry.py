@@ -0,0 +1,67 @@
+import json
+import os
+
+from address_registry import NULL_ADDRESS, AddressRegistry, cache_file_for
+
+ADDRESSES = {
+    '1': {
+        'exchangeProxy': '0xDef1C0ded9bec7F1a1670819833240f027b25EfF',
+        'devUtils': NULL_ADDRESS,
+        'transformers': {'wethTransformer': '0xb2bc06a4efb20fc6553a69dbfa49b7be938034a7'},
+    },
+    '137': {
+        'exchangeProxy': '0xdef1c0ded9bec7f1a1670819833240f027b25eff',
+        'devUtils': NULL_ADDRESS,
+        'transformers': {'wethTransformer': '0xe309d011cc6f189a3e8dcba85922715a019fed38'},
+    },
+}
+
+
+def write_addresses(path, addresses):
+    path.write_text(json.dumps(addresses))
+    return str(path)
+
+
+def test_forward_and_reverse_lookup():
+    registry = AddressRegistry.build(ADDRESSES)
+
+    assert registry.address('1', 'transformers.wethTransformer') == '0xb2bc06a4efb20fc6553a69dbfa49b7be938034a7'
+    assert registry.address(1, 'exchangeProxy', checksum=True) == '0xDef1C0ded9bec7F1a1670819833240f027b25EfF'
+    assert registry.lookup('0xDEF1C0DED9BEC7F1A1670819833240F027B25EFF') == [
+        ('1', 'exchangeProxy'), ('137', 'exchangeProxy')]
+    assert registry.group('137', 'transformers') == {
+        'wethTransformer': '0xe309d011cc6f189a3e8dcba85922715a019fed38'}
+    # 空地址只在正向索引中
+    assert registry.address('1', 'devUtils') == NULL_ADDRESS
+    assert registry.lookup(NULL_ADDRESS) == []
+
+
+def test_cache_is_reused_until_the_file_changes(tmp_path):
+    addresses_file = write_addresses(tmp_path / 'addresses.json', ADDRESSES)
+    cache_file = str(tmp_path / 'registry.pickle')
+    assert len(AddressRegistry.load(addresses_file, cache_file=cache_file)) == 6
+    cached_at = os.stat(cache_file).st_mtime_ns
+
+    # 缓存命中时既不重新构建也不写回
+    registry = AddressRegistry.load(addresses_file, cache_file=cache_file)
+    assert os.stat(cache_file).st_mtime_ns == cached_at
+    assert registry.checksum('0xdef1c0ded9bec7f1a1670819833240f027b25eff') == ADDRESSES['1']['exchangeProxy']
+
+    write_addresses(tmp_path / 'addresses.json', {'1': {'exchangeProxy': '0x' + '1' * 40}})
+    assert len(AddressRegistry.load(addresses_file, cache_file=cache_file)) == 1
+
+    with open(cache_file, 'wb') as f:
+        f.write(b'not a pickle')
+    assert len(AddressRegistry.load(addresses_file, cache_file=cache_file)) == 1
+
+
+def test_each_addresses_file_has_its_own_cache(tmp_path):
+    first = write_addresses(tmp_path / 'first.json', ADDRESSES)
+    second = write_addresses(tmp_path / 'second.json', {'1': {'exchangeProxy': '0x' + '1' * 40}})
+    assert cache_file_for(first) != cache_file_for(second)
+
+    shared_cache = str(tmp_path / 'registry.pickle')
+    assert len(AddressRegistry.load(first, cache_file=shared_cache)) == 6
+    # 缓存中记录了地址表的路径, 另一个文件不会误用它
+    assert len(AddressRegistry.load(second, cache_file=shared_cache)) == 1
+    assert len(AddressRegistry.load(first, cache_file=shared_cache)) == 6
@@ -0,0 +1,154 @@
+import json
+import os
+import shutil
+
+import analyze_errors
+from analyze_errors import (MAX_BLOCK_LINES, ErrorRuleSet, FailureParser, analyze_log, analyze_shards,
+                            analyze_test_errors, classify_failure, details_file, expand_log_paths, failure_test_file,
+                            iter_log_failures, iter_test_failures, merge_error_categories, merge_test_files,
+                            rerun_files, save_error_analysis)
+
+
+def test_failure_parser_counts_fixture_log(fixture_path):
+    failures = list(iter_log_failures(fixture_path('spec_failures.log')))
+
+    # 进度输出中的 "1) fails if not called by owner" 等行不算失败块
+    assert [failure.number for failure in failures] == ['1', '2', '3', '4']
+    assert [len(failure.stack) for failure in failures] == [2, 1, 1, 2]
+    assert failures[0].suite == ('MetaTransactions feature', 'executeMetaTransaction()')
+    assert failures[0].title == 'fails if not called by owner'
+    assert failures[1].message[0] == 'AssertionError: expected 100 to equal 101'
+    assert failures[2].suite == ('Ownable feature',)
+
+
+def test_failure_parser_feed_and_flush():
+    parser = FailureParser()
+    lines = [
+        '  1) Suite\n',
+        '       does a thing:\n',
+        '     Error: boom\n',
+        '      at Context.<anonymous> (test/a_test.ts:1:1)\n',
+    ]
+    assert [parser.feed(line) for line in lines] == [None] * 4
+    failure = parser.flush()
+    assert (failure.number, failure.suite, failure.title) == ('1', ('Suite',), 'does a thing')
+    assert failure.message == ('Error: boom',)
+    assert parser.flush() is None
+
+
+def test_failure_block_size_is_capped():
+    lines = ['  1) Suite\n', '       huge:\n', '     Error: boom\n']
+    lines += ['      at frame%d (test/a_test.ts:1:1)\n' % index for index in range(MAX_BLOCK_LINES * 2)]
+    failure, = iter_test_failures(lines)
+    assert len(failure.message) + len(failure.stack) == MAX_BLOCK_LINES
+
+
+def test_classify_fixture_log(fixture_path):
+    categories = [classify_failure(failure) for failure in iter_log_failures(fixture_path('spec_failures.log'))]
+    assert categories == [
+        'ONLY_SELF_ERRORS', 'VALUE_ASSERTION_ERRORS', 'FUNCTION_NOT_FOUND_ERRORS', 'UNCLASSIFIED_ERRORS']
+    summary = analyze_test_errors(fixture_path('spec_failures.log'))
+    assert summary['VALUE_ASSERTION_ERRORS'] == [
+        ('2', 'checks the fee amount', 'MetaTransactions feature executeMetaTransaction() checks the fee amount')]
+
+
+def test_rule_set_priority_and_shared_literals():
+    rules = ErrorRuleSet([
+        {'category': 'GENERIC', 'priority': 10, 'patterns': ['custom error']},
+        {'category': 'SPECIFIC', 'priority': 20, 'patterns': ['custom error', '0xdeadbeef']},
+        {'category': 'ASSERT', 'priority': 30, 'patterns': ['expected', 'to equal']},
+        {'category': 'ANY_ASSERT', 'priority': 5, 'patterns': ['expected']},
+    ], default_category='OTHER')
+
+    assert rules.classify('custom error 0xdeadbeef') == 'SPECIFIC'
+    assert rules.classify('custom error 0x12345678') == 'GENERIC'
+    assert rules.classify('expected 1 to equal 2') == 'ASSERT'
+    # 组内的规则都不命中时继续检查后面的规则
+    assert rules.classify('expected 1 to be above 2') == 'ANY_ASSERT'
+    assert rules.classify('nothing to see') == 'OTHER'
+    assert rules.categories == ['ASSERT', 'SPECIFIC', 'GENERIC', 'ANY_ASSERT', 'OTHER']
+
+
+def test_rule_set_same_priority_keeps_file_order_and_empty_patterns_always_match():
+    rules = ErrorRuleSet([
+        {'category': 'FIRST', 'priority': 1, 'patterns': ['x']},
+        {'category': 'SECOND', 'priority': 1, 'patterns': ['x']},
+        {'category': 'CATCH_ALL', 'priority': 0, 'patterns': []},
+        {'category': 'UNREACHABLE', 'priority': 0, 'patterns': ['y']},
+    ])
+    assert rules.classify('x') == 'FIRST'
+    assert rules.classify('y') == 'CATCH_ALL'
+
+
+def test_rule_file_matches_the_legacy_chain():
+    from bench_error_rules import classify_block_legacy, generate_log
+    rules = ErrorRuleSet.from_file()
+    blocks = [failure.block for failure in iter_test_failures(generate_log(500))]
+    assert [rules.classify(block) for block in blocks] == [classify_block_legacy(block) for block in blocks]
+
+
+def test_expand_log_paths_keeps_order_and_unmatched_patterns(tmp_path):
+    for name in ('b.txt', 'a.txt'):
+        (tmp_path / name).write_text('')
+    pattern = str(tmp_path / '*.txt')
+    missing = str(tmp_path / 'missing-*.txt')
+
+    assert expand_log_paths([str(tmp_path / 'b.txt'), pattern, missing]) == [
+        str(tmp_path / 'b.txt'), str(tmp_path / 'a.txt'), missing]
+
+
+def test_analyze_shards_and_merge(tmp_path, fixture_path):
+    first = str(tmp_path / 'shard1.log')
+    second = str(tmp_path / 'shard2.log')
+    shutil.copy(fixture_path('spec_failures.log'), first)
+    shutil.copy(fixture_path('spec_failures.log'), second)
+    missing = str(tmp_path / 'shard3.log')
+
+    results = list(analyze_shards([first, missing, second], jobs=2))
+    assert [result[0] for result in results] == [first, missing, second]
+    assert all(value is None for value in results[1][1:])
+
+    merged = merge_error_categories([result[:2] for result in results if result[1] is not None])
+    assert sum(len(errors) for errors in merged.values()) == 8
+    assert 'TYPE_ERRORS' not in merged
+    assert [error[-1] for error in merged['VALUE_ASSERTION_ERRORS']] == [first, second]
+
+
+
+def test_save_error_analysis_keeps_two_element_entries(tmp_path):
+    output = str(tmp_path / 'error_analysis.json')
+    categories = {'VALUE_ASSERTION_ERRORS': [['1', 'reverts', 'Ownable feature reverts', 'shard1.log']]}
+    details = save_error_analysis(categories, output)
+    assert details == str(tmp_path / 'error_analysis.details.json')
+    with open(output) as f:
+        assert json.load(f) == {'VALUE_ASSERTION_ERRORS': [['1', 'reverts']]}
+    with open(details) as f:
+        assert json.load(f) == categories
+    assert details_file(os.devnull) == os.devnull
+
+def test_failure_test_file_sources():
+    def failure(stack=(), title='t', file=None):
+        return analyze_errors.TestFailure('1', ('Ownable feature',), title, ('Error',), tuple(stack), file)
+
+    suite_files = {'Ownable feature': os.path.join('test', 'features', 'ownable_test.ts')}
+    helper = 'at sign (test/utils/orders.ts:3:1)'
+    owner_frame = 'at Context.<anonymous> (test/features/ownable_test.ts:52:31)'
+
+    assert failure_test_file(failure(file='test/x_test.ts')) == 'test/x_test.ts'
+    assert failure_test_file(failure([helper, owner_frame]), suite_files) == suite_files['Ownable feature']
+    assert failure_test_file(failure([helper]), suite_files) == suite_files['Ownable feature']
+    assert failure_test_file(failure([helper])) == os.path.join('test', 'utils', 'orders.ts')
+    assert failure_test_file(failure()) is None
+
+
+def test_rerun_files_dedupes_and_filters_categories(fixture_path):
+    _, _, test_files = analyze_log(fixture_path('spec_failures.log'))
+    ownable = os.path.join('test', 'features', 'ownable_test.ts')
+    meta = os.path.join('test', 'features', 'meta_transactions_test.ts')
+
+    files, covered, unmapped = rerun_files(test_files)
+    assert (files, covered, unmapped) == ([meta, ownable], 4, 0)
+    assert rerun_files(test_files, ['FUNCTION_NOT_FOUND_ERRORS'])[:2] == ([ownable], 1)
+
+    merged = merge_test_files([test_files, test_files, {'TYPE_ERRORS': {None: 2}}])
+    assert rerun_files(merged) == ([meta, ownable], 8, 2)
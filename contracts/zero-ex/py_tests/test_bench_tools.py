@@ -0,0 +1,36 @@
+import json
+
+from bench_tools import CASES, THRESHOLDS_FILE, check_thresholds, compare_results
+
+
+def test_compare_results_flags_throughput_and_memory_regressions():
+    baseline = {
+        'analyze': {'mb_per_s': 10.0, 'peak_mb': 2.0},
+        'fix': {'mb_per_s': 5.0, 'peak_mb': 1.0},
+    }
+    results = {
+        'analyze': {'mb_per_s': 8.5, 'peak_mb': 2.1},
+        'fix': {'mb_per_s': 3.0, 'peak_mb': 1.5},
+        'tokenize': {'mb_per_s': 1.0, 'peak_mb': 100.0},
+    }
+
+    regressions = compare_results(baseline, results, tolerance=0.2)
+    assert [name for name, _ in regressions] == ['fix', 'fix']
+    assert compare_results(baseline, results, tolerance=0.6) == []
+
+
+def test_every_case_has_thresholds():
+    with open(THRESHOLDS_FILE, 'r', encoding='utf-8') as f:
+        thresholds = json.load(f)
+    assert set(thresholds) == set(CASES)
+    assert all({'min_mb_per_s', 'max_peak_mb'} <= limits.keys() for limits in thresholds.values())
+
+
+def test_check_thresholds_only_caps_memory_at_scale_one():
+    thresholds = {'analyze': {'min_mb_per_s': 2.0, 'max_peak_mb': 3.0}}
+    slow = {'analyze': {'mb_per_s': 1.0, 'peak_mb': 1.0}}
+    large = {'analyze': {'mb_per_s': 5.0, 'peak_mb': 10.0}}
+
+    assert [name for name, _ in check_thresholds(thresholds, slow, 1)] == ['analyze']
+    assert [name for name, _ in check_thresholds(thresholds, large, 1)] == ['analyze']
+    assert check_thresholds(thresholds, large, 4) == []
@@ -0,0 +1,155 @@
+import importlib
+import json
+import os
+import shutil
+import stat
+import subprocess
+
+import pytest
+
+from codemod import (CACHE_VERSION, TokenRule, apply_rules, load_cache, ruleset_version, run_codemod, select_rules,
+                     write_atomic)
+from fix_bigint_errors import bigint_operand
+
+
+def read(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def test_rules_rewrite_legacy_source(fixture_path):
+    fixed, hits = apply_rules(read(fixture_path('legacy.ts')), select_rules())
+
+    assert fixed == read(fixture_path('legacy.fixed.ts'))
+    assert hits['multiplex.address_getter'] == 4
+    assert hits['bigint.reduce_initial'] == 1
+
+
+def test_second_run_is_a_no_op(fixture_path):
+    fixed = read(fixture_path('legacy.fixed.ts'))
+    again, hits = apply_rules(fixed, select_rules())
+
+    assert again == fixed
+    assert not hits
+
+
+def test_rule_set_selection(fixture_path):
+    source = read(fixture_path('legacy.ts'))
+    fixed, hits = apply_rules(source, select_rules(['bigint']))
+
+    assert set(hits) == {'bigint.amount_arithmetic', 'bigint.field_arithmetic', 'bigint.reduce_initial'}
+    assert 'AbiEncoder.create' in fixed
+    assert 'order.takerAmount - 1n' in fixed
+
+
+@pytest.fixture
+def source_tree(tmp_path, fixture_path):
+    root = tmp_path / 'src'
+    (root / 'node_modules' / 'dep').mkdir(parents=True)
+    shutil.copy(fixture_path('legacy.ts'), root / 'legacy_test.ts')
+    shutil.copy(fixture_path('legacy.fixed.ts'), root / 'fixed_test.ts')
+    shutil.copy(fixture_path('legacy.ts'), root / 'node_modules' / 'dep' / 'index.ts')
+    (root / 'notes.md').write_text('AbiEncoder.create([])\n')
+    return root
+
+
+def test_run_codemod_skips_clean_files_on_the_next_run(source_tree, tmp_path, fixture_path):
+    cache_file = str(tmp_path / 'cache.json')
+    index_file = str(tmp_path / 'index.json')
+    results, hits, _ = run_codemod([str(source_tree)], jobs=1, cache_file=cache_file, index_file=index_file)
+
+    assert results['changed'] == [str(source_tree / 'legacy_test.ts')]
+    assert results['unchanged'] == [str(source_tree / 'fixed_test.ts')]
+    assert read(str(source_tree / 'legacy_test.ts')) == read(fixture_path('legacy.fixed.ts'))
+    assert read(str(source_tree / 'node_modules' / 'dep' / 'index.ts')) == read(fixture_path('legacy.ts'))
+    assert hits['multiplex.address_getter'] == 4
+
+    # 两个文件内容相同, 缓存里只有一个哈希
+    with open(cache_file, 'r', encoding='utf-8') as f:
+        assert [len(hashes) for hashes in json.load(f)['rulesets'].values()] == [1]
+
+    results, hits, _ = run_codemod([str(source_tree)], jobs=2, cache_file=cache_file, index_file=index_file)
+    assert sorted(results['cached']) == [str(source_tree / 'fixed_test.ts'), str(source_tree / 'legacy_test.ts')]
+    assert not hits
+
+
+def test_cache_is_keyed_by_rule_set_version(source_tree, tmp_path):
+    cache_file = str(tmp_path / 'cache.json')
+    index_file = str(tmp_path / 'index.json')
+    run_codemod([str(source_tree)], jobs=1, cache_file=cache_file, index_file=index_file)
+
+    results, _, _ = run_codemod([str(source_tree)], ['bigint'], jobs=1, cache_file=cache_file, index_file=index_file)
+    assert results['cached'] == []
+    assert len(results['unchanged']) == 2
+
+    os.remove(cache_file)
+    results, _, _ = run_codemod([str(source_tree)], jobs=1, cache_file=None, index_file=index_file)
+    assert results['cached'] == []
+    assert not os.path.exists(cache_file)
+
+
+
+@pytest.mark.parametrize('content', [
+    '[]', '"x"', '{"version": %d}' % CACHE_VERSION, '{"version": %d, "rulesets": []}' % CACHE_VERSION,
+    '{"version": %d, "rulesets": {"v": 3}}' % CACHE_VERSION,
+])
+def test_wrong_shape_cache_is_a_miss(content, source_tree, tmp_path):
+    cache_file = tmp_path / 'cache.json'
+    cache_file.write_text(content)
+    assert load_cache(str(cache_file), 'v') == set()
+
+    results, _, _ = run_codemod([str(source_tree)], jobs=1, cache_file=str(cache_file),
+                                index_file=str(tmp_path / 'index.json'))
+    assert results['cached'] == []
+    # 下次保存时覆盖为正确的结构
+    assert json.loads(cache_file.read_text())['version'] == CACHE_VERSION
+
+
+def test_rule_set_version_covers_closure_values():
+    def rules(operators):
+        return [TokenRule('bigint.amount_arithmetic', {'amount'}, bigint_operand(operators))]
+
+    # 集合按排序后的内容参与哈希, 与创建顺序无关
+    assert ruleset_version(rules({'+', '-'})) == ruleset_version(rules({'-', '+'}))
+    assert ruleset_version(rules({'+'})) != ruleset_version(rules({'+', '-'}))
+
+
+def test_rule_set_version_covers_helper_module_source(tmp_path, monkeypatch):
+    helper = tmp_path / 'codemod_version_helper.py'
+    helper.write_text('def match(tokens, index):\n    return None\n')
+    monkeypatch.syspath_prepend(str(tmp_path))
+    module = importlib.import_module('codemod_version_helper')
+    rules = [TokenRule('helper.match', {'x'}, module.match)]
+
+    version = ruleset_version(rules)
+    assert ruleset_version(rules) == version
+    helper.write_text('def match(tokens, index):\n    return None\n\n\nLIMIT = 2\n')
+    assert ruleset_version(rules) != version
+
+def test_dry_run_emits_a_diff_that_git_applies(source_tree, tmp_path, fixture_path, monkeypatch):
+    monkeypatch.chdir(source_tree)
+    outcomes = []
+    results, _, written = run_codemod(['.'], jobs=1, cache_file=None, index_file=str(tmp_path / 'index.json'),
+                                      dry_run=True, on_outcome=outcomes.append)
+    diffs = [outcome.diff for outcome in outcomes if outcome.status == 'changed']
+
+    assert results['changed'] == ['./legacy_test.ts']
+    assert read('legacy_test.ts') == read(fixture_path('legacy.ts'))
+    assert written == len(read(fixture_path('legacy.fixed.ts')).encode('utf-8'))
+    assert diffs[0].startswith('--- a/legacy_test.ts\n+++ b/legacy_test.ts\n')
+
+    subprocess.run(['git', 'init', '-q'], check=True)
+    subprocess.run(['git', 'apply'], input=''.join(diffs).encode('utf-8'), check=True)
+    assert read('legacy_test.ts') == read(fixture_path('legacy.fixed.ts'))
+
+
+def test_write_atomic_keeps_mode_and_leaves_no_temp_files(tmp_path):
+    path = tmp_path / 'script.ts'
+    path.write_text('old')
+    os.chmod(path, 0o755)
+
+    write_atomic(str(path), b'new')
+
+    assert path.read_text() == 'new'
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o755
+    assert os.listdir(tmp_path) == ['script.ts']
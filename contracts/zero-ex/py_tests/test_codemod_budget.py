@@ -0,0 +1,41 @@
+import pytest
+
+import codemod
+from bench_codemod import adversarial_inputs, time_rule
+from codemod import CodemodRule, RuleTimeout, apply_rules, register_rule_set, run_codemod, select_rules
+
+# 嵌套量词在不匹配的输入上指数级回溯
+CATASTROPHIC = ('catastrophic', r'(a+)+b', '')
+
+
+def test_apply_rules_raises_when_a_rule_exceeds_its_budget():
+    rule = CodemodRule('slow.catastrophic', CATASTROPHIC[1], CATASTROPHIC[2])
+    with pytest.raises(RuleTimeout) as exc_info:
+        apply_rules('a' * 40, [rule], budget=0.05)
+    assert exc_info.value.rule_name == 'slow.catastrophic'
+
+    # 没有预算时正常执行
+    assert apply_rules('aab', [rule]) == ('', {'slow.catastrophic': 1})
+
+
+def test_run_codemod_reports_timeouts_and_keeps_going(tmp_path, monkeypatch):
+    monkeypatch.setattr(codemod, '_rule_sets', dict(codemod._rule_sets))
+    register_rule_set('slow', [CATASTROPHIC])
+    slow = tmp_path / 'slow_test.ts'
+    fast = tmp_path / 'fast_test.ts'
+    slow.write_text('a' * 40)
+    fast.write_text('aab')
+
+    results, hits, _ = run_codemod([str(tmp_path)], ['slow'], jobs=1, cache_file=None, budget=0.05,
+                                index_file=str(tmp_path / 'index.json'))
+
+    assert [path for path, _ in results['timeout']] == [str(slow)]
+    assert results['changed'] == [str(fast)]
+    assert slow.read_text() == 'a' * 40
+    assert hits == {'slow.catastrophic': 1}
+
+
+def test_registered_rules_stay_linear_on_adversarial_inputs():
+    for rule in select_rules():
+        for name, text in adversarial_inputs(5000):
+            assert time_rule(rule, text, budget=1.0) is not None, (rule.name, name)
@@ -0,0 +1,40 @@
+import json
+
+from diff_analysis import diff_error_categories, index_tests, load_error_categories
+
+
+def test_duplicate_titles_are_kept_and_compared_as_multisets():
+    before = {'X': [['1', 't', 'S t'], ['2', 't', 'S t']]}
+    after = {'X': [['1', 't', 'S t']], 'Y': [['2', 't', 'S t'], ['3', 'u', 'S u']]}
+
+    assert index_tests(before) == {'S t': ['X', 'X']}
+    diff = diff_error_categories(before, after)
+    assert diff['moved'] == [('S t', 'X', 'Y')]
+    assert diff['appeared'] == [('S u', 'Y')]
+    assert diff['disappeared'] == []
+    assert not diff['by_title']
+
+
+def test_two_element_entries_fall_back_to_titles():
+    diff = diff_error_categories({'X': [['1', 't']]}, {'Y': [['4', 't', 'S t']]})
+    assert diff['by_title']
+    assert diff['moved'] == [('t', 'X', 'Y')]
+
+
+def test_inputs_are_detected_by_content(tmp_path, fixture_path):
+    from_log = load_error_categories(fixture_path('spec_failures.log'))
+    assert sum(len(errors) for errors in from_log.values()) == 4
+
+    analysis = tmp_path / 'error_analysis.json'
+    analysis.write_text(json.dumps({'X': [['1', 't']]}))
+    assert load_error_categories(str(analysis)) == {'X': [['1', 't']]}
+    # 有明细文件时读取完整标题
+    (tmp_path / 'error_analysis.details.json').write_text(json.dumps({'X': [['1', 't', 'S t']]}))
+    assert load_error_categories(str(analysis)) == {'X': [['1', 't', 'S t']]}
+
+    report = tmp_path / 'report.json'
+    report.write_text(json.dumps({'stats': {}, 'failures': [
+        {'title': 't', 'fullTitle': 'S t', 'err': {'message': 'TypeError: f is not a function', 'stack': ''}}]}))
+    assert {category: [error[2] for error in errors]
+            for category, errors in load_error_categories(str(report)).items()} == {
+        'FUNCTION_NOT_FOUND_ERRORS': ['S t']}
@@ -0,0 +1,56 @@
+import analyze_errors
+from analyze_errors import analyze_log
+from failure_fingerprint import fingerprint_failure, merge_clusters, normalize_message, repo_frames
+
+
+def failure(message, stack, number='1', title='t'):
+    return analyze_errors.TestFailure(number, ('Suite',), title, [message], stack)
+
+
+def test_normalize_message_drops_run_specific_parts():
+    message = ('Error: reverted with return data: 0x08c379a0' + '00' * 31 + '20 '
+               'at /Users/someone/protocol/node_modules/ethers/lib/index.js '
+               '(version=abi/5.7.0, amount 1500, to 0xabcdef)')
+    assert normalize_message(message) == (
+        'Error: reverted with return data: 0x08c379a0… '
+        'at ethers/lib/index.js (version=*, amount N, to 0x…)')
+
+
+def test_repo_frames_skip_dependencies():
+    stack = [
+        'at Object.revert (/abs/node_modules/hardhat/internal/x.js:10:5)',
+        'at async Context.<anonymous> (test/features/meta_transactions_test.ts:304:24)',
+        'at helper (test/utils/orders.ts:12:3)',
+        'at test/utils/deep.ts:1:1',
+        'at test/utils/deeper.ts:2:2',
+    ]
+    assert repo_frames(failure('Error', stack)) == [
+        'Context.<anonymous> (test/features/meta_transactions_test.ts)',
+        'helper (test/utils/orders.ts)',
+        'test/utils/deep.ts',
+    ]
+
+
+def test_same_root_cause_shares_a_fingerprint():
+    first = failure('Error: fee 100 too low', ['at f (test/a_test.ts:1:2)'])
+    second = failure('Error: fee 250 too low', ['at f (test/a_test.ts:9:9)'], number='2')
+    other = failure('Error: fee 100 too low', ['at g (test/b_test.ts:1:2)'])
+
+    assert fingerprint_failure(first)[0] == fingerprint_failure(second)[0]
+    assert fingerprint_failure(first)[0] != fingerprint_failure(other)[0]
+
+
+def test_analyze_log_clusters_and_merge(fixture_path):
+    error_categories, clusters, _ = analyze_log(fixture_path('spec_failures.log'))
+
+    assert sum(cluster['count'] for cluster in clusters.values()) == 4
+    assert sum(len(errors) for errors in error_categories.values()) == 4
+    for cluster in clusters.values():
+        assert cluster['count'] == len(cluster['tests'])
+
+    merged = merge_clusters([('a.log', clusters), ('b.log', clusters)])
+    assert set(merged) == set(clusters)
+    for digest, cluster in merged.items():
+        assert cluster['count'] == 2 * clusters[digest]['count']
+        assert [test[-1] for test in cluster['tests']] == (['a.log'] * clusters[digest]['count']
+                                                           + ['b.log'] * clusters[digest]['count'])
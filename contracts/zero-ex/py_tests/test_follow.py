@@ -0,0 +1,67 @@
+import io
+import json
+import os
+from collections import defaultdict
+
+from analyze_errors import follow_lines, follow_test_errors, iter_test_failures
+
+BLOCK = [
+    '  1) Suite\n',
+    '       does a thing:\n',
+    '     TypeError: f is not a function\n',
+    '      at Context.<anonymous> (test/a_test.ts:1:1)\n',
+]
+
+
+def test_idle_marker_ends_the_current_block():
+    seen = []
+
+    def lines():
+        yield from BLOCK
+        yield None
+        # 空闲标记之后失败块应该已经产出
+        seen.append('after idle')
+        yield '\n'
+
+    failures = iter_test_failures(lines())
+    failure = next(failures)
+    assert failure.title == 'does a thing'
+    assert seen == []
+    assert list(failures) == []
+
+
+def test_follow_test_errors_writes_json_lines_with_running_counts():
+    output = io.StringIO()
+    error_categories = defaultdict(list)
+    lines = BLOCK + [line.replace('1)', '2)') for line in BLOCK]
+    follow_test_errors(lines, output, error_categories)
+
+    records = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert [record['number'] for record in records] == ['1', '2']
+    assert [record['counts']['FUNCTION_NOT_FOUND_ERRORS'] for record in records] == [1, 2]
+    assert records[0]['suite'] == ['Suite']
+    assert len(error_categories['FUNCTION_NOT_FOUND_ERRORS']) == 2
+
+
+def test_follow_lines_handles_partial_lines_idle_and_rotation(tmp_path):
+    path = tmp_path / 'run.log'
+    path.write_bytes(b'first\npart')
+    lines = follow_lines(str(path), poll_interval=0.01, idle_timeout=0.05)
+
+    assert next(lines) == 'first\n'
+    # 不完整的行不产出, 空闲后产出一次 None
+    assert next(lines) is None
+    with open(path, 'ab') as f:
+        f.write(b'ial\n')
+    assert next(lines) == 'partial\n'
+
+    # 轮转: 旧文件改名, 新建同名文件
+    os.rename(path, tmp_path / 'run.log.1')
+    path.write_bytes(b'rotated\n')
+    assert next(lines) == 'rotated\n'
+
+    # 截断 (copytruncate) 后从头读取
+    with open(path, 'wb') as f:
+        f.write(b'x\n')
+    assert next(lines) == 'x\n'
+    lines.close()
@@ -0,0 +1,61 @@
+import hashlib
+
+import pytest
+
+from address_registry import to_checksum_address
+from keccak import RATE_BYTES, _keccak_f, function_selector, keccak256
+
+
+@pytest.mark.parametrize('data, digest', [
+    (b'', 'c5d2460186f7233c927e7db2dcc703c0e500b653ca82273b7bfad8045d85a470'),
+    ('abc', '4e03657aea45a94fc7d47ba826c8d667c0d1e6e33a64a036ec44f58fa12d6c45'),
+    ('The quick brown fox jumps over the lazy dog',
+     '4d741b6f1eb29cb2a9b9911c82f56fa8d73b04959d3d9d222895df6c0b28aa15'),
+])
+def test_keccak256_vectors(data, digest):
+    assert keccak256(data).hex() == digest
+
+
+def sha3_256(data):
+    """用 keccak.py 的置换实现 SHA3-256: 与 keccak256 只差填充的域分隔字节 (0x06 而不是 0x01)"""
+    padded = bytearray(data)
+    padded.append(0x06)
+    padded.extend(b'\x00' * (-len(padded) % RATE_BYTES))
+    padded[-1] |= 0x80
+    state = [0] * 25
+    for offset in range(0, len(padded), RATE_BYTES):
+        for lane in range(RATE_BYTES // 8):
+            state[lane] ^= int.from_bytes(padded[offset + lane * 8:offset + lane * 8 + 8], 'little')
+        _keccak_f(state)
+    return b''.join(state[lane].to_bytes(8, 'little') for lane in range(4))
+
+
+@pytest.mark.parametrize('length', [0, 135, 136, 137, 300, 1000])
+def test_permutation_matches_hashlib_sha3_across_blocks(length):
+    data = bytes(range(256)) * 4
+    assert sha3_256(data[:length]) == hashlib.sha3_256(data[:length]).digest()
+
+
+@pytest.mark.parametrize('signature, selector', [
+    ('transfer(address,uint256)', '0xa9059cbb'),
+    ('Error(string)', '0x08c379a0'),
+    ('Panic(uint256)', '0x4e487b71'),
+])
+def test_function_selector_vectors(signature, selector):
+    assert function_selector(signature) == selector
+
+
+# EIP-55 规范中的测试向量
+@pytest.mark.parametrize('address', [
+    '0x52908400098527886E0F7030069857D2E4169EE7',
+    '0x8617E340B3D01FA5F11F306F4090FD50E238070D',
+    '0xde709f2102306220921060314715629080e2fb77',
+    '0x27b1fdb04752bbc536007a920d24acb045561c26',
+    '0x5aAeb6053F3E94C9b9A09f33669435E7Ef1BeAed',
+    '0xfB6916095ca1df60bB79Ce92cE3Ea74c37c5d359',
+    '0xdbF03B407c01E7cD3CBea99509d93f8DDDC8C6FB',
+    '0xD1220A0cf47c7B9Be7A2E6BA89F429762e7b9aDb',
+])
+def test_eip55_checksum_vectors(address):
+    assert to_checksum_address(address.lower()) == address
+    assert to_checksum_address(address.upper().replace('0X', '0x')) == address
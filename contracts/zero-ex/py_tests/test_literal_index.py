@@ -0,0 +1,81 @@
+import json
+import os
+
+import pytest
+
+from codemod import run_codemod
+from literal_index import INDEX_VERSION, LiteralIndex
+
+
+@pytest.fixture
+def sources(tmp_path):
+    root = tmp_path / 'src'
+    root.mkdir()
+    (root / 'a.ts').write_text('const e = AbiEncoder.create([]);\n')
+    (root / 'b.ts').write_text('f(token.address);\n')
+    (root / 'c.ts').write_text('const x = 1;\n')
+    return root
+
+
+def paths(root):
+    return sorted(str(path) for path in root.iterdir())
+
+
+def test_update_reads_only_new_or_changed_files(sources, tmp_path):
+    index_file = str(tmp_path / 'index.json')
+    index = LiteralIndex.load(index_file)
+    index.update(paths(sources), ['AbiEncoder'])
+    index.save(index_file)
+    assert index.read_count == 3
+    assert [index.contains_any(path, ['AbiEncoder']) for path in paths(sources)] == [True, False, False]
+
+    index = LiteralIndex.load(index_file)
+    index.update(paths(sources), ['AbiEncoder'])
+    assert index.read_count == 0
+
+    # 内容变化的文件重新检查所有字面量
+    (sources / 'c.ts').write_text('import { AbiEncoder } from "@0x/utils";\n')
+    index.update(paths(sources), ['AbiEncoder'])
+    assert index.read_count == 1
+    assert index.present(str(sources / 'c.ts')) == {'AbiEncoder'}
+
+    # 新的字面量需要把每个文件读一遍
+    index.update(paths(sources), ['address'])
+    assert index.read_count == 4
+    assert index.present(str(sources / 'b.ts')) == {'address'}
+    assert index.contains_any(str(sources / 'missing.ts'), ['address'])
+
+
+def test_save_drops_deleted_files(sources, tmp_path):
+    index_file = str(tmp_path / 'index.json')
+    index = LiteralIndex()
+    index.update(paths(sources), ['address'])
+    os.remove(sources / 'b.ts')
+    index.save(index_file)
+
+    assert sorted(LiteralIndex.load(index_file).files) == [str(sources / 'a.ts'), str(sources / 'c.ts')]
+
+
+@pytest.mark.parametrize('data', [
+    [], {'version': INDEX_VERSION}, {'version': INDEX_VERSION, 'literals': 'address', 'files': {}},
+    {'version': INDEX_VERSION, 'literals': [], 'files': []},
+    {'version': INDEX_VERSION, 'literals': [], 'files': {'/a.ts': {'present': []}}},
+])
+def test_wrong_shape_index_is_rebuilt(data, sources, tmp_path):
+    index_file = tmp_path / 'index.json'
+    index_file.write_text(json.dumps(data))
+    index = LiteralIndex.load(str(index_file))
+    assert (index.literals, index.files) == ([], {})
+
+    index.update(paths(sources), ['address'])
+    assert index.read_count == 3
+    assert index.present(str(sources / 'b.ts')) == {'address'}
+
+
+def test_run_codemod_does_not_open_files_without_literals(sources, tmp_path):
+    results, _, _ = run_codemod([str(sources)], jobs=1, cache_file=None, index_file=str(tmp_path / 'index.json'))
+
+    assert results['skipped'] == [str(sources / 'c.ts')]
+    assert results['unchanged'] == [str(sources / 'a.ts')]
+    assert results['changed'] == [str(sources / 'b.ts')]
+    assert (sources / 'b.ts').read_text() == 'f(await token.getAddress());\n'
@@ -0,0 +1,61 @@
+import json
+
+from analyze_errors import analyze_test_errors, iter_log_failures
+
+FEE_FAILURE = {
+    'title': 'checks the fee amount',
+    'fullTitle': 'MetaTransactions feature executeMetaTransaction() checks the fee amount',
+    'file': '/repo/contracts/zero-ex/test/features/meta_transactions_test.ts',
+    'err': 'expected 100 to equal 200',
+    'stack': 'AssertionError: expected 100 to equal 200\n'
+             '    at Context.<anonymous> (test/features/meta_transactions_test.ts:304:24)',
+}
+OWNER_FAILURE = {
+    'title': 'has an owner',
+    'fullTitle': 'Ownable feature has an owner',
+    'err': "TypeError: Cannot read properties of undefined (reading 'owner')",
+}
+
+
+def test_json_stream_events(tmp_path):
+    log = tmp_path / 'results.jsonl'
+    log.write_text('\n'.join([
+        'Compiled 12 Solidity files successfully',
+        json.dumps(['start', {'total': 3}]),
+        json.dumps(['pass', {'title': 'works', 'fullTitle': 'Ownable feature works'}]),
+        json.dumps(['fail', FEE_FAILURE]),
+        json.dumps(['fail', OWNER_FAILURE]),
+        '["fail", not json',
+        json.dumps(['end', {'failures': 2}]),
+    ]) + '\n')
+
+    failures = list(iter_log_failures(str(log)))
+    assert [(f.number, f.suite, f.title) for f in failures] == [
+        ('1', ('MetaTransactions feature executeMetaTransaction()',), 'checks the fee amount'),
+        ('2', ('Ownable feature',), 'has an owner'),
+    ]
+    # 错误信息取 stack 中带错误类型前缀的首行, 没有 stack 时使用 err
+    assert failures[0].message == ('AssertionError: expected 100 to equal 200',)
+    assert failures[0].stack == ('at Context.<anonymous> (test/features/meta_transactions_test.ts:304:24)',)
+    assert failures[0].file.endswith('meta_transactions_test.ts')
+    assert failures[1].message == ("TypeError: Cannot read properties of undefined (reading 'owner')",)
+
+
+def test_json_report_after_compiler_output(tmp_path):
+    fee = dict(FEE_FAILURE, err={'message': FEE_FAILURE['err'], 'stack': FEE_FAILURE['stack']})
+    del fee['stack']
+    owner = dict(OWNER_FAILURE, err={'message': OWNER_FAILURE['err']})
+    report = {'stats': {'failures': 2}, 'tests': [], 'failures': [fee, owner], 'passes': []}
+    log = tmp_path / 'results.json'
+    log.write_text('Compiled 12 Solidity files successfully\n' + json.dumps(report, indent=2) + '\n')
+
+    failures = list(iter_log_failures(str(log)))
+    assert [f.title for f in failures] == ['checks the fee amount', 'has an owner']
+    assert failures[0].message == ('AssertionError: expected 100 to equal 200',)
+
+    categories = analyze_test_errors(str(log))
+    assert categories['TYPE_ERRORS'] == [('2', 'has an owner', 'Ownable feature has an owner')]
+
+
+def test_spec_log_is_still_parsed_as_text(fixture_path):
+    assert len(list(iter_log_failures(fixture_path('spec_failures.log')))) == 4
@@ -0,0 +1,66 @@
+import os
+
+import pytest
+
+from plan_shards import UNTIMED_TEST_MS, estimate_file_durations, list_test_files, main, plan_shards
+from profile_tests import find_suite_files
+
+
+@pytest.fixture
+def test_dir(tmp_path):
+    root = tmp_path / 'test'
+    root.mkdir()
+    (root / 'meta_test.ts').write_text("describe('MetaTransactions feature', () => {});\n")
+    (root / 'ownable_test.ts').write_text("describe('Ownable feature', () => {});\n")
+    (root / 'new_test.ts').write_text(
+        "describe('New feature', () => {\n    it('a', () => {});\n    it.skip('b', () => {});\n});\n")
+    (root / 'utils.ts').write_text("export const x = 1;\n")
+    return root
+
+
+def test_plan_shards_balances_longest_first():
+    estimates = {'a': 70, 'b': 50, 'c': 40, 'd': 30, 'e': 10}
+    shards = plan_shards(estimates, 2)
+
+    assert shards == [(100, ['a', 'd']), (100, ['b', 'c', 'e'])]
+    assert plan_shards(estimates, 1) == [(200, ['a', 'b', 'c', 'd', 'e'])]
+    assert plan_shards({}, 3) == [(0, []), (0, []), (0, [])]
+
+
+def test_estimates_come_from_history_or_test_count(test_dir, fixture_path):
+    # 测试文件路径相对 hardhat 项目目录, 与 hardhat test 的参数一致, 与当前目录无关
+    project_dir = str(test_dir.parent)
+    suite_files = find_suite_files(str(test_dir))
+    test_files = list_test_files([str(test_dir / '*.ts')], suite_files, project_dir)
+    assert test_files == ['test/meta_test.ts', 'test/new_test.ts', 'test/ownable_test.ts']
+
+    estimates, unknown = estimate_file_durations(test_files, [fixture_path('spec_failures.log')], suite_files,
+                                                 project_dir)
+    by_name = {os.path.basename(path): ms for path, ms in estimates.items()}
+
+    # 412ms 的测试加上三个未标注耗时的测试, pending 不计
+    assert by_name['meta_test.ts'] == 412 + 3 * UNTIMED_TEST_MS
+    assert by_name['ownable_test.ts'] == 3 * UNTIMED_TEST_MS
+    # 新文件: 两个 it(...) 乘以历史平均每个测试的耗时
+    assert by_name['new_test.ts'] == pytest.approx(2 * (412 + 6 * UNTIMED_TEST_MS) / 7)
+    assert unknown == ['test/new_test.ts']
+
+
+def test_without_history_every_test_costs_the_default(test_dir):
+    project_dir = str(test_dir.parent)
+    suite_files = find_suite_files(str(test_dir))
+    test_files = list_test_files([str(test_dir / '*.ts')], suite_files, project_dir)
+
+    estimates, unknown = estimate_file_durations(test_files, [], suite_files, project_dir)
+    assert sorted(estimates.values()) == [UNTIMED_TEST_MS, UNTIMED_TEST_MS, 2 * UNTIMED_TEST_MS]
+    assert len(unknown) == 3
+
+
+def test_main_prints_one_shard_and_exits_when_nothing_matches(test_dir, tmp_path, capsys):
+    options = ['--test-dir', str(test_dir), str(tmp_path / 'missing.log'), '-n', '2']
+    main(options + ['--tests', str(test_dir / '*.ts'), '--shard', '1'])
+    assert capsys.readouterr().out.split() == ['test/new_test.ts']
+
+    with pytest.raises(SystemExit) as exc:
+        main(options + ['--tests', str(test_dir / '*.sol')])
+    assert exc.value.code == 1
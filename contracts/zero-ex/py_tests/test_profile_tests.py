@@ -0,0 +1,83 @@
+import os
+from collections import Counter
+
+import profile_tests
+from profile_tests import build_profile, compare_timings, find_suite_files, load_test_timings, percentile
+
+
+def timing(suite, title, duration, status='passed'):
+    return profile_tests.TestTiming(0, tuple(suite.split(' / ')), title, status, duration)
+
+
+def test_load_test_timings_from_fixture_log(fixture_path):
+    timings = load_test_timings(fixture_path('spec_failures.log'))
+
+    assert Counter(t.status for t in timings) == {'passed': 3, 'failed': 4, 'pending': 2}
+    assert timings[0].suite == ('MetaTransactions feature', 'executeMetaTransaction()')
+    assert (timings[0].title, timings[0].duration) == ('can call NativeOrders.fillLimitOrder()', 412)
+
+
+def test_concatenated_runs_use_the_last_complete_run(tmp_path, fixture_path):
+    with open(fixture_path('spec_failures.log'), 'r', encoding='utf-8') as f:
+        log = f.read()
+    path = tmp_path / 'runs.log'
+
+    path.write_text(log + log.replace('(412ms)', '(900ms)'), encoding='utf-8')
+    assert load_test_timings(str(path))[0].duration == 900
+    assert load_test_timings(str(path), run=0)[0].duration == 412
+
+    # 末尾被截断的运行不如前一次完整
+    truncated = log.replace('(412ms)', '(900ms)').split('  Ownable feature')[0]
+    path.write_text(log + truncated, encoding='utf-8')
+    assert load_test_timings(str(path))[0].duration == 412
+
+
+def test_percentile_uses_nearest_rank():
+    values = list(range(1, 101))
+    assert [percentile(values, pct) for pct in (50, 90, 99)] == [50, 90, 99]
+    assert percentile([7], 95) == 7
+    assert percentile([], 50) == 0
+
+
+def test_build_profile_totals():
+    timings = [
+        timing('A / x', 'one', 100),
+        timing('A / x', 'two', 50),
+        timing('A / y', 'three', 30),
+        timing('B', 'four', None),
+        timing('B', 'five', None, status='failed'),
+    ]
+    profile = build_profile(timings, {'A': 'test/a_test.ts'})
+
+    assert profile['tests'] == {'passed': 4, 'failed': 1}
+    assert profile['untimed'] == 1
+    assert profile['total_ms'] == 180
+    assert profile['max_ms'] == 100
+    assert dict(profile['suites']) == {'A': 180, 'A / x': 150, 'A / y': 30}
+    assert profile['files'] == [('test/a_test.ts', 180)]
+    assert profile['slowest_tests'] == [('A x one', 100), ('A x two', 50), ('A y three', 30)]
+
+
+def test_compare_timings_reports_only_real_regressions():
+    baseline = [timing('A', 'slow', 100), timing('A', 'noise', 10), timing('A', 'gone', 10)]
+    current = [timing('A', 'slow', 200), timing('A', 'noise', 15), timing('A', 'new', 500)]
+
+    regressions = compare_timings(baseline, current, threshold=0.2, min_delta=10)
+    # 与 test_history 和 diff_analysis 一样以 full_title (空格连接) 作为测试标识
+    assert regressions == [('A slow', 100, 200)]
+
+
+def test_find_suite_files(tmp_path):
+    test_dir = tmp_path / 'test'
+    (test_dir / 'features').mkdir(parents=True)
+    (test_dir / 'features' / 'a_test.ts').write_text(
+        "describe('Alpha', () => {\n    describe('inner', () => {});\n});\n")
+    (test_dir / 'b_test.ts').write_text("blockchainTests.resets('Beta', env => {});\n")
+    (test_dir / 'helpers.ts').write_text("export const x = 1;\n")
+
+    suite_files = find_suite_files(str(test_dir))
+    # 路径相对测试目录的上级 (hardhat 项目目录)
+    assert suite_files == {
+        'Alpha': os.path.join('test', 'features', 'a_test.ts'),
+        'Beta': os.path.join('test', 'b_test.ts'),
+    }
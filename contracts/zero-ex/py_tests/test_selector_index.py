@@ -0,0 +1,116 @@
+import json
+import os
+
+import pytest
+
+from keccak import function_selector
+from selector_index import SelectorIndex, decode_abi, find_return_data, format_decoded, parse_source
+
+SOURCE = '''
+contract Example {
+    error OnlyOwnerError(address sender, address owner);
+    error StructError(Order order);
+
+    function OrderNotFillableError(bytes32 orderHash, uint8 status) internal pure returns (bytes memory) {
+        return abi.encodeWithSelector(
+            bytes4(keccak256("OrderNotFillableError(bytes32,uint8)")),
+            orderHash,
+            status
+        );
+    }
+}
+'''
+
+
+def word(value):
+    return value.to_bytes(32, 'big')
+
+
+def padded(raw):
+    return raw.ljust(-(-len(raw) // 32) * 32, b'\x00')
+
+
+def write_source(root, content):
+    path = os.path.join(root, 'contracts', 'example', 'contracts', 'src', 'Example.sol')
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    return path
+
+
+def test_parse_source_finds_declarations_and_literals():
+    entries = {signature: (selector, names) for selector, signature, names in parse_source(SOURCE)}
+
+    assert set(entries) == {'OnlyOwnerError(address,address)', 'OrderNotFillableError(bytes32,uint8)'}
+    assert entries['OnlyOwnerError(address,address)'][1] == ['sender', 'owner']
+    # 参数名来自同名的编码函数
+    assert entries['OrderNotFillableError(bytes32,uint8)'][1] == ['orderHash', 'status']
+
+
+def test_decode_elementary_and_dynamic_types():
+    data = word(0xabc) + word(1) + word(96) + word(2) + padded(b'hi')
+    assert decode_abi(['address', 'bool', 'string'], data) == ['0x' + '0' * 37 + 'abc', True, 'hi']
+
+
+
+def test_static_fixed_array_and_tuple_are_encoded_in_place():
+    # uint256[2] 和 (uint256,bool) 在头部各占两个字, 后面参数的头部要相应后移
+    data = word(1) + word(2) + word(7) + word(1) + word(160) + word(2) + padded(b'ok')
+    assert decode_abi(['uint256[2]', '(uint256,bool)', 'string'], data) == [[1, 2], [7, True], 'ok']
+
+
+def test_dynamic_tuple_and_dynamic_fixed_array_use_offsets():
+    data = (word(5) + word(96) + word(224)
+            + word(9) + word(64) + word(2) + padded(b'hi')
+            + word(64) + word(128) + word(1) + padded(b'a') + word(1) + padded(b'b'))
+    assert decode_abi(['uint256', '(uint256,string)', 'string[2]'], data) == [5, [9, 'hi'], ['a', 'b']]
+
+
+def test_dynamic_array_length_is_checked():
+    with pytest.raises(ValueError):
+        decode_abi(['uint256[]'], word(32) + word(2 ** 200))
+
+
+def test_decode_builtin_error_reason():
+    index = SelectorIndex({})
+    data = '0x08c379a0' + (word(32) + word(4) + padded(b'oops')).hex()
+    decoded = index.decode(data)
+    assert decoded['signature'] == 'Error(string)'
+    assert decoded['args'] == [{'name': 'reason', 'type': 'string', 'value': 'oops'}]
+    assert find_return_data(f'reverted (return data: {data})') == data
+
+
+@pytest.mark.parametrize('data', ['0x08c379a0zz', '0x08c379a0' + '0' * 63, '08c379a0'])
+def test_malformed_revert_data_is_reported_as_invalid(data):
+    decoded = SelectorIndex({}).decode(data)
+    assert decoded['invalid'] and decoded['signature'] is None
+    assert format_decoded(decoded) == f'无效的 revert 数据 {data[:10]}'
+
+
+def test_load_indexes_sources_and_refreshes_changed_files(tmp_path):
+    root = str(tmp_path)
+    cache_file = str(tmp_path / 'selector_index.json')
+    path = write_source(root, SOURCE)
+
+    index = SelectorIndex.load(root=root, cache_file=cache_file)
+    data = function_selector('OnlyOwnerError(address,address)') + (word(1) + word(2)).hex()
+    assert format_decoded(index.decode(data)) == f"OnlyOwnerError(sender=0x{'0' * 39}1, owner=0x{'0' * 39}2)"
+    with open(cache_file, 'r', encoding='utf-8') as f:
+        assert list(json.load(f)['files']) == [os.path.relpath(path, root)]
+
+    # 内容变化后重新解析
+    write_source(root, 'contract Example { error Gone(); }')
+    index = SelectorIndex.load(root=root, cache_file=cache_file)
+    assert index.lookup(function_selector('OnlyOwnerError(address,address)')) == []
+    assert index.lookup(function_selector('Gone()')) == [('Gone()', [])]
+    assert format_decoded(index.decode('0x12345678')) == '未知错误 0x12345678'
+
+
+def test_corrupt_cache_is_rebuilt(tmp_path):
+    cache_file = tmp_path / 'selector_index.json'
+    for content in ('[]', '"x"', '{"version": 1, "files": []}', '{"version": 1, "files": {"a.sol": 3}}'):
+        cache_file.write_text(content)
+        index = SelectorIndex.load(root=str(tmp_path), cache_file=str(cache_file))
+        assert index.files == {}
+        # 重建后的缓存写回, 下次不再重新解析
+        assert json.loads(cache_file.read_text())['files'] == {}
@@ -0,0 +1,66 @@
+import json
+
+import pytest
+
+import test_history
+from test_history import load_run
+
+
+def write_run(path, statuses):
+    """statuses 为 {标题: 'passed' / 'failed'}, 写成 json-stream 日志"""
+    lines = []
+    for title, status in statuses.items():
+        test = {'title': title, 'fullTitle': f"Suite {title}"}
+        if status == 'failed':
+            test.update(err=f"Error: {title} broke", stack=f"Error: {title} broke\n    at t (test/a_test.ts:1:1)")
+        lines.append(json.dumps(['pass' if status == 'passed' else 'fail', test]))
+    path.write_text('\n'.join(lines) + '\n')
+    return str(path)
+
+
+@pytest.fixture
+def history(tmp_path):
+    history = test_history.TestHistory(str(tmp_path / 'history.db'))
+    yield history
+    history.close()
+
+
+def test_load_run_keys_spec_results_by_full_title(fixture_path):
+    results = load_run(fixture_path('spec_failures.log'))
+
+    assert len(results) == 9
+    fee = results['MetaTransactions feature executeMetaTransaction() checks the fee amount']
+    assert (fee.status, fee.category) == ('failed', 'VALUE_ASSERTION_ERRORS')
+    assert fee.fingerprint
+    assert results['MetaTransactions feature executeMetaTransaction() can call NativeOrders.fillLimitOrder()'
+                   ].duration == 412
+
+
+def test_newly_failing_fixed_and_flaky(history, tmp_path):
+    runs = [
+        {'a': 'passed', 'b': 'failed', 'c': 'passed'},
+        {'a': 'failed', 'b': 'passed', 'c': 'passed'},
+        {'a': 'passed', 'b': 'passed', 'c': 'failed'},
+    ]
+    ids = [history.ingest(write_run(tmp_path / f'run{i}.jsonl', statuses))[0] for i, statuses in enumerate(runs)]
+    assert [row[3:] for row in history.runs()] == [(2, 1, 0), (2, 1, 0), (2, 1, 0)]
+    assert history.resolve_runs() == (ids[1], ids[2])
+
+    assert [row[0] for row in history.newly_failing(ids[0], ids[1])] == ['Suite a']
+    assert history.newly_failing(ids[0], ids[1])[0][3] == 'passed'
+    assert [row[0] for row in history.newly_fixed(ids[0], ids[1])] == ['Suite b']
+    assert [row[0] for row in history.newly_failing(ids[1], ids[2])] == ['Suite c']
+
+    assert history.flaky(last=3, min_flips=2) == [('Suite a', 2, 1, 3)]
+    assert [row[0] for row in history.flaky(last=2, min_flips=1)] == ['Suite a', 'Suite c']
+
+
+def test_same_log_is_ingested_once(history, tmp_path):
+    log = write_run(tmp_path / 'run.jsonl', {'a': 'passed'})
+    run_id, added = history.ingest(log)
+    assert added
+    assert history.ingest(log) == (run_id, False)
+
+    empty = tmp_path / 'empty.log'
+    empty.write_text('Error HH700: Artifact not found\n')
+    assert history.ingest(str(empty)) == (None, False)
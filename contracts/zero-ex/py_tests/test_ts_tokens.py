@@ -0,0 +1,51 @@
+import pytest
+
+from codemod import apply_rules, select_rules
+from ts_tokens import next_significant, previous_significant, tokenize
+
+
+def test_tokens_concatenate_back_to_the_source(fixture_path):
+    with open(fixture_path('legacy.ts'), 'r', encoding='utf-8') as f:
+        source = f.read()
+    assert ''.join(tokenize(source)) == source
+
+
+def test_strings_comments_and_regexes_are_single_tokens():
+    source = 'a = "x + 1" + `t ${b}` // c.amount + 1\n/* d */ f(/re+1/g)'
+    assert tokenize(source) == [
+        'a', ' ', '=', ' ', '"x + 1"', ' ', '+', ' ', '`t ${b}`', ' ', '// c.amount + 1', '\n',
+        '/* d */', ' ', 'f', '(', '/re+1/g', ')',
+    ]
+
+
+def test_significant_neighbours_skip_trivia():
+    tokens = tokenize('a /* x */ + // y\n b')
+    assert tokens[next_significant(tokens, 1)] == '+'
+    assert tokens[previous_significant(tokens, len(tokens) - 2)] == '+'
+    assert next_significant(tokens, len(tokens)) == len(tokens)
+
+
+@pytest.mark.parametrize('source, expected', [
+    ('order.takerAmount - 1', 'order.takerAmount - 1n'),
+    ('mtx.nonce /* next */ + 1', 'mtx.nonce /* next */ + 1n'),
+    ('xs.reduce((a, b) => a + b, 0)', 'xs.reduce((a, b) => a + b, 0n)'),
+    ('"order.takerAmount - 1"', '"order.takerAmount - 1"'),
+    ('// order.takerAmount - 1', '// order.takerAmount - 1'),
+    ('order.takerAmount - 1.5', 'order.takerAmount - 1.5'),
+    ('order.takerAmount - 1n', 'order.takerAmount - 1n'),
+    ('takerAmount - 1', 'takerAmount - 1'),
+    ('order.salt * 2', 'order.salt * 2'),
+])
+def test_bigint_token_rules(source, expected):
+    assert apply_rules(source, select_rules(['bigint']))[0] == expected
+
+
+@pytest.mark.parametrize('source, expected', [
+    ('f(this.token.address, 1)', 'f(await this.token.getAddress(), 1)'),
+    ('f("token.address", x)', 'f("token.address", x)'),
+    ('f(/* token.address, */ x)', 'f(/* token.address, */ x)'),
+    ('f(foo().address)', 'f(foo().address)'),
+    ('const a = token.address;', 'const a = token.address;'),
+])
+def test_address_getter_rule(source, expected):
+    assert apply_rules(source, select_rules(['multiplex']))[0] == expected
@@ -0,0 +1,71 @@
+import json
+
+from validate_addresses import validate
+
+PROXY = '0xdef1c0ded9bec7f1a1670819833240f027b25eff'
+GOVERNOR = '0x' + '2' * 40
+
+
+def write_json(path, data):
+    path.write_text(json.dumps(data) if not isinstance(data, str) else data)
+    return str(path)
+
+
+def errors(violations):
+    """{位置: 错误信息}"""
+    return {violation.location: violation.message for violation in violations if violation.severity == 'error'}
+
+
+def test_repository_files_are_consistent():
+    assert [violation for violation in validate() if violation.severity == 'error'] == []
+
+
+def test_clean_files_have_no_violations(tmp_path):
+    addresses = write_json(tmp_path / 'addresses.json', {
+        '1': {'exchangeProxy': PROXY, 'zeroExGovernor': GOVERNOR, 'exchangeProxyGovernor': GOVERNOR},
+        '137': {'exchangeProxy': PROXY, 'zeroExGovernor': '0x' + '0' * 40, 'exchangeProxyGovernor': '0x' + '0' * 40},
+    })
+    deploys = write_json(tmp_path / 'DEPLOYS.json', [
+        {'name': 'ExchangeProxy', 'version': '1', 'changes': [
+            {'networks': {'1': '0x' + '9' * 40}},
+            {'networks': {'1': PROXY.upper().replace('0X', '0x')}},
+        ]},
+    ])
+    assert validate(addresses, [deploys], {}) == []
+
+
+def test_every_problem_is_reported(tmp_path):
+    addresses = write_json(tmp_path / 'addresses.json', {
+        '1': {'exchangeProxy': PROXY, 'staking': PROXY, 'zrxToken': '0x1234'},
+        '137': {'exchangeProxy': '0xDEF1c0ded9bec7f1a1670819833240f027b25eff', 'staking': '0x' + '3' * 40},
+        '56': {'exchangeProxy': '0x' + '3' * 40, 'staking': '0x' + '4' * 40, 'zrxToken': '0x' + '5' * 40},
+    })
+    deploys = write_json(tmp_path / 'DEPLOYS.json', [
+        {'name': 'ExchangeProxy', 'version': '1', 'changes': [{'networks': {'56': '0x' + '6' * 40}}]},
+        {'version': '1'},
+    ])
+
+    cache = {}
+    violations = validate(addresses, [deploys], cache)
+    # 只有大小写混合的地址需要计算校验和
+    assert list(cache) == [PROXY]
+    found = errors(violations)
+    assert sorted(found) == ['1', '1.zrxToken', '137.exchangeProxy', '137.zrxToken',
+                             'ExchangeProxy.changes[0].networks.56', '[1]']
+    assert found['1'] == f'exchangeProxy, staking 使用同一个地址 {PROXY}'
+    assert found['1.zrxToken'].startswith('地址格式无效')
+    assert found['137.exchangeProxy'].startswith('EIP-55 校验和错误')
+    assert found['137.zrxToken'] == '其他链上都有该合约, 这条链上缺少'
+    assert found['ExchangeProxy.changes[0].networks.56'].startswith(f"最新部署地址 {'0x' + '6' * 40}")
+    # 同一地址在不同链上是不同合约只是警告
+    assert sorted(violation.location for violation in violations if violation.severity == 'warning') == [
+        '0x' + '3' * 40, PROXY]
+    # 错误排在警告前面
+    assert violations[-1].severity == 'warning'
+
+
+def test_duplicate_keys_and_broken_json(tmp_path):
+    duplicated = write_json(tmp_path / 'addresses.json', '{"1": {"exchangeProxy": "%s", "exchangeProxy": "%s"}}'
+                            % (PROXY, PROXY))
+    assert errors(validate(duplicated, [], {})) == {'': 'JSON 无效: 重复的键: exchangeProxy'}
+    assert errors(validate(str(tmp_path / 'missing.json'), [], {})) == {'': '文件不存在'}
@@ -0,0 +1,38 @@
+from collections import Counter
+
+from analyze_errors import iter_test_failures
+from profile_tests import iter_test_timings
+from workloads import generate_addresses, generate_mocha_log, generate_ts_source
+
+
+def test_generated_log_matches_requested_counts():
+    lines = list(generate_mocha_log(passing=40, failing=15, pending=5, stack_depth=3, seed=1))
+
+    failures = list(iter_test_failures(lines))
+    assert [failure.number for failure in failures] == [str(n) for n in range(1, 16)]
+    assert all(len(failure.stack) == 3 for failure in failures)
+    assert all(failure.stack[-1].startswith('at async Context.<anonymous> (test/features/suite_')
+               for failure in failures)
+    assert Counter(timing.status for timing in iter_test_timings(lines)) == {
+        'passed': 40, 'failed': 15, 'pending': 5}
+
+
+def test_generators_are_deterministic_per_seed():
+    assert list(generate_mocha_log(20, 5, seed=3)) == list(generate_mocha_log(20, 5, seed=3))
+    assert list(generate_mocha_log(20, 5, seed=3)) != list(generate_mocha_log(20, 5, seed=4))
+    assert generate_ts_source(10000, seed=2) == generate_ts_source(10000, seed=2)
+    assert len(generate_ts_source(10000)) >= 10000
+
+
+def test_generated_addresses_shape():
+    addresses = generate_addresses(chains=15, contracts=8, transformers=3, shared_ratio=1.0)
+
+    assert len(addresses) == 15
+    chain_ids = list(addresses)
+    assert chain_ids[0] == '1' and chain_ids[-1] == '100002'
+    first, last = addresses[chain_ids[0]], addresses[chain_ids[-1]]
+    assert len(first['transformers']) == 3
+    # shared_ratio=1 时每个合约在所有链上地址相同, transformer 各链不同
+    assert {name: address for name, address in first.items() if name != 'transformers'} == {
+        name: address for name, address in last.items() if name != 'transformers'}
+    assert first['transformers'] != last['transformers']
@@ -0,0 +1,47 @@
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+import zx
+
+ZX = os.path.join(zx.PACKAGE_DIR, 'zx.py')
+
+
+def run_zx(*args, cwd=None):
+    return subprocess.run([sys.executable, ZX] + list(args), capture_output=True, text=True, cwd=cwd, check=False)
+
+
+def test_help_lists_every_command_without_importing_them():
+    completed = subprocess.run(
+        [sys.executable, '-c', 'import sys, zx; zx.main(["--help"]); '
+                               'print(sorted(set(sys.modules) & {"analyze_errors", "codemod", "profile_tests"}))'],
+        capture_output=True, text=True, cwd=zx.PACKAGE_DIR, check=True)
+
+    for name in zx.COMMANDS:
+        assert f"  {name} " in completed.stdout
+    assert completed.stdout.rstrip().endswith('[]')
+
+
+def test_unknown_command_exits_with_usage():
+    completed = run_zx('nope')
+    assert completed.returncode == 2
+    assert 'nope' in completed.stderr
+    assert 'analyze' in completed.stderr
+
+
+@pytest.mark.parametrize('name', list(zx.COMMANDS))
+def test_every_command_dispatches(name):
+    completed = run_zx(name, '--help')
+    assert completed.returncode == 0, completed.stderr
+    assert f"zx.py {name}" in completed.stdout
+
+
+def test_relative_arguments_resolve_from_the_caller(tmp_path, fixture_path):
+    shutil.copy(fixture_path('spec_failures.log'), tmp_path / 'run.log')
+
+    completed = run_zx('diff', 'run.log', 'run.log', cwd=str(tmp_path))
+    assert completed.returncode == 0, completed.stderr
+    assert '4 -> 4' in completed.stdout
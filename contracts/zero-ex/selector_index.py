@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+自定义错误选择器索引: 从 Solidity 源码计算 4 字节选择器, 用于解码 revert 数据
+
+扫描 contracts/*/contracts/src 下的 .sol 文件, 收集:
+  - error Name(type name, ...) 声明
+  - LibRichErrors 风格的 bytes4(keccak256("Name(type,...)")) 签名字面量
+
+索引按文件缓存在 .selector_index.json 中, 文件的 mtime/大小变化时重新计算内容哈希,
+哈希不变则沿用缓存, 只有内容真正变化的文件才重新解析和计算 keccak.
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import re
+
+from keccak import function_selector
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+SOURCE_DIR_PATTERN = os.path.join('contracts', '*', 'contracts', 'src')
+CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.selector_index.json')
+CACHE_VERSION = 1
+
+SIGNATURE_LITERAL_PATTERN = re.compile(r'keccak256\(\s*"([A-Za-z_]\w*)\(([^"]*)\)"\s*\)')
+ERROR_DECLARATION_PATTERN = re.compile(r'\berror\s+([A-Za-z_]\w*)\s*\(([^)]*)\)\s*;')
+FUNCTION_PATTERN = re.compile(r'\bfunction\s+([A-Za-z_]\w*)\s*\(([^)]*)\)')
+ELEMENTARY_TYPE_PATTERN = re.compile(
+    r'^(address|bool|string|bytes\d*|u?int\d*)((?:\[\d*\])*)$')
+RETURN_DATA_PATTERN = re.compile(r'return data: (0x[0-9a-fA-F]*)')
+REVERT_DATA_PATTERN = re.compile(r'0x(?:[0-9a-f]{2})*')
+ARRAY_TYPE_PATTERN = re.compile(r'^(.*)\[(\d*)\]$')
+
+# 标准库自带的 revert 原因
+BUILTIN_ERRORS = {
+    '0x08c379a0': ('Error(string)', ['reason']),
+    '0x4e487b71': ('Panic(uint256)', ['code']),
+}
+
+DATA_LOCATIONS = {'memory', 'calldata', 'storage', 'payable', 'indexed'}
+
+
+def canonical_type(solidity_type):
+    """uint -> uint256, int -> int256, byte -> bytes1; 不是基本类型时返回 None"""
+    match = ELEMENTARY_TYPE_PATTERN.match(solidity_type)
+    if not match:
+        return None
+    base, arrays = match.groups()
+    base = {'uint': 'uint256', 'int': 'int256', 'byte': 'bytes1'}.get(base, base)
+    return base + arrays
+
+
+def parse_parameters(parameters):
+    """解析 "address sender, uint256[] memory amounts", 返回 ([类型], [参数名])"""
+    types = []
+    names = []
+    for parameter in parameters.split(','):
+        words = [word for word in parameter.split() if word not in DATA_LOCATIONS]
+        if not words:
+            continue
+        types.append(words[0])
+        names.append(words[1] if len(words) > 1 else '')
+    return types, names
+
+
+def split_types(type_list):
+    """按顶层逗号切分签名中的参数类型, 保留元组内部的逗号"""
+    types = []
+    depth = 0
+    current = ''
+    for char in type_list:
+        if char == ',' and depth == 0:
+            types.append(current)
+            current = ''
+            continue
+        depth += (char == '(') - (char == ')')
+        current += char
+    if current:
+        types.append(current)
+    return types
+
+
+def parse_source(content):
+    """从一个 .sol 文件中提取 [(selector, signature, [参数名]), ...]"""
+    function_names = {}
+    for name, parameters in FUNCTION_PATTERN.findall(content):
+        function_names.setdefault(name, parse_parameters(parameters)[1])
+
+    entries = {}
+    for name, parameters in ERROR_DECLARATION_PATTERN.findall(content):
+        types, names = parse_parameters(parameters)
+        canonical = [canonical_type(t) for t in types]
+        if None in canonical:
+            # 结构体/枚举参数无法在这里确定规范类型
+            continue
+        signature = f"{name}({','.join(canonical)})"
+        entries[signature] = names
+
+    for name, type_list in SIGNATURE_LITERAL_PATTERN.findall(content):
+        signature = f"{name}({type_list})"
+        if signature not in entries:
+            # 同名的编码函数 (LibXxxRichErrors.Name(...)) 提供参数名
+            names = function_names.get(name, [])
+            entries[signature] = names if len(names) == len(split_types(type_list)) else []
+
+    return [(function_selector(signature), signature, names) for signature, names in entries.items()]
+
+
+def list_source_files(root=REPO_ROOT):
+    pattern = os.path.join(root, SOURCE_DIR_PATTERN, '**', '*.sol')
+    return sorted(os.path.relpath(path, root) for path in glob.glob(pattern, recursive=True))
+
+
+def _is_cache_record(record):
+    return isinstance(record, dict) and {'mtime_ns', 'size', 'sha1'} <= record.keys() \
+        and isinstance(record.get('entries'), list)
+
+
+class SelectorIndex:
+    """selector -> [(signature, 参数名)] 的哈希索引"""
+
+    def __init__(self, files):
+        self.files = files
+        self._index = {selector: [entry] for selector, entry in BUILTIN_ERRORS.items()}
+        for record in files.values():
+            for selector, signature, names in record['entries']:
+                candidates = self._index.setdefault(selector, [])
+                if all(signature != known for known, _ in candidates):
+                    candidates.append((signature, names))
+
+    def __len__(self):
+        return len(self._index)
+
+    @classmethod
+    def load(cls, root=REPO_ROOT, cache_file=CACHE_FILE, rebuild=False):
+        """加载缓存并按源码内容哈希增量更新, 有变化时写回缓存"""
+        cached = {}
+        # 缓存不存在, 版本不同或已损坏时即使源码没有变化也要写回
+        stale = True
+        if not rebuild:
+            try:
+                with open(cache_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                # 结构不对的缓存视为损坏, 整个重建
+                if isinstance(data, dict) and data.get('version') == CACHE_VERSION \
+                        and isinstance(data.get('files'), dict) \
+                        and all(_is_cache_record(record) for record in data['files'].values()):
+                    cached = data['files']
+                    stale = False
+            except (FileNotFoundError, ValueError):
+                pass
+
+        files = {}
+        changed = False
+        for path in list_source_files(root):
+            stat = os.stat(os.path.join(root, path))
+            record = cached.get(path)
+            if record and record['mtime_ns'] == stat.st_mtime_ns and record['size'] == stat.st_size:
+                files[path] = record
+                continue
+
+            with open(os.path.join(root, path), 'rb') as f:
+                content = f.read()
+            digest = hashlib.sha1(content).hexdigest()
+            if record and record['sha1'] == digest:
+                entries = record['entries']
+            else:
+                entries = parse_source(content.decode('utf-8', errors='replace'))
+            files[path] = {
+                'mtime_ns': stat.st_mtime_ns,
+                'size': stat.st_size,
+                'sha1': digest,
+                'entries': entries,
+            }
+            changed = True
+
+        if stale or changed or set(files) != set(cached):
+            with open(cache_file, 'w', encoding='utf-8') as f:
+                json.dump({'version': CACHE_VERSION, 'files': files}, f)
+
+        return cls(files)
+
+    def lookup(self, selector):
+        """返回选择器对应的 [(signature, 参数名)], 未知时为空列表"""
+        return self._index.get(selector.lower(), [])
+
+    def decode(self, data):
+        """解码 revert 数据 "0x..."
+
+        返回 {'selector', 'signature', 'args', 'invalid'}; 未知选择器时 signature 为 None,
+        参数无法解码时 args 为 None. 选择器冲突时使用第一个能解码的签名.
+        data 不是 0x 开头的偶数位十六进制时 invalid 为 True, 与未知选择器一样 signature 为 None.
+        """
+        data = data.lower()
+        selector = data[:10]
+        result = {'selector': selector, 'signature': None, 'args': None, 'invalid': False}
+        if not REVERT_DATA_PATTERN.fullmatch(data):
+            result['invalid'] = True
+            return result
+        candidates = self.lookup(selector)
+        if not candidates:
+            return result
+
+        payload = bytes.fromhex(data[10:])
+        result['signature'] = candidates[0][0]
+        for signature, names in candidates:
+            types = split_types(signature[signature.index('(') + 1:-1])
+            try:
+                values = decode_abi(types, payload)
+            except ValueError:
+                continue
+            names = names if len(names) == len(types) else [''] * len(types)
+            result['signature'] = signature
+            result['args'] = [
+                {'name': name, 'type': abi_type, 'value': value}
+                for name, abi_type, value in zip(names, types, values)
+            ]
+            break
+        return result
+
+
+def decode_abi(types, data):
+    """按 ABI 规则解码参数 (基本类型, 数组和元组), 不支持的类型或数据不合法时抛出 ValueError"""
+    return _decode_sequence(types, data, 0, 0)
+
+
+def _word(data, offset):
+    if offset + 32 > len(data):
+        raise ValueError('数据长度不足')
+    return data[offset:offset + 32]
+
+
+def _decode_sequence(types, data, head, base):
+    """解码依次编码的多个值 (参数列表, 元组或数组元素), 头部从 base + head 开始
+
+    每个值在头部占 _head_size 字节: 动态类型是一个偏移量, 静态类型原地编码;
+    偏移量相对于 base, 即当前编码块的起点.
+    """
+    values = []
+    for abi_type in types:
+        values.append(_decode_value(abi_type, data, head, base))
+        head += _head_size(abi_type)
+    return values
+
+
+def _decode_value(abi_type, data, head, base):
+    """解码位于 base + head 处的值, base 为当前编码块的起点"""
+    array = ARRAY_TYPE_PATTERN.match(abi_type)
+    if array:
+        item_type, size = array.groups()
+        if size:
+            items = [item_type] * int(size)
+            if not _is_dynamic(item_type):
+                return _decode_sequence(items, data, head, base)
+            start = base + int.from_bytes(_word(data, base + head), 'big')
+            return _decode_sequence(items, data, 0, start)
+        start = base + int.from_bytes(_word(data, base + head), 'big')
+        length = int.from_bytes(_word(data, start), 'big')
+        # 每个元素在头部至少占一个字, 先检查长度, 避免不合法的数据导致巨大的循环
+        if start + 32 + length * 32 > len(data):
+            raise ValueError('数据长度不足')
+        return _decode_sequence([item_type] * length, data, 0, start + 32)
+
+    if abi_type.startswith('('):
+        components = split_types(abi_type[1:-1])
+        if not _is_dynamic(abi_type):
+            return _decode_sequence(components, data, head, base)
+        start = base + int.from_bytes(_word(data, base + head), 'big')
+        return _decode_sequence(components, data, 0, start)
+
+    word = _word(data, base + head)
+    if abi_type in ('bytes', 'string'):
+        start = base + int.from_bytes(word, 'big')
+        length = int.from_bytes(_word(data, start), 'big')
+        raw = data[start + 32:start + 32 + length]
+        if len(raw) != length:
+            raise ValueError('数据长度不足')
+        return raw.decode('utf-8', errors='replace') if abi_type == 'string' else '0x' + raw.hex()
+    if abi_type == 'address':
+        return '0x' + word[12:].hex()
+    if abi_type == 'bool':
+        return word[-1] == 1
+    if abi_type.startswith('uint'):
+        return int.from_bytes(word, 'big')
+    if abi_type.startswith('int'):
+        return int.from_bytes(word, 'big', signed=True)
+    if abi_type.startswith('bytes'):
+        return '0x' + word[:int(abi_type[5:])].hex()
+    raise ValueError(f'不支持的类型: {abi_type}')
+
+
+def _is_dynamic(abi_type):
+    """bytes, string, T[] 以及包含它们的定长数组和元组是动态类型"""
+    array = ARRAY_TYPE_PATTERN.match(abi_type)
+    if array:
+        return not array.group(2) or _is_dynamic(array.group(1))
+    if abi_type.startswith('('):
+        return any(_is_dynamic(component) for component in split_types(abi_type[1:-1]))
+    return abi_type in ('bytes', 'string')
+
+
+def _head_size(abi_type):
+    """值在头部占的字节数: 动态类型是 32 字节的偏移量, 静态的定长数组和元组原地展开"""
+    if _is_dynamic(abi_type):
+        return 32
+    array = ARRAY_TYPE_PATTERN.match(abi_type)
+    if array:
+        return int(array.group(2)) * _head_size(array.group(1))
+    if abi_type.startswith('('):
+        return sum(_head_size(component) for component in split_types(abi_type[1:-1]))
+    return 32
+
+
+def find_return_data(text):
+    """从错误信息中提取 "return data: 0x..." 的 revert 数据"""
+    match = RETURN_DATA_PATTERN.search(text)
+    return match.group(1) if match else None
+
+
+def format_decoded(decoded):
+    """把 decode() 的结果格式化为一行, 如 "OnlyOwnerError(sender=0x..., owner=0x...)" """
+    if decoded.get('invalid'):
+        return f"无效的 revert 数据 {decoded['selector']}"
+    if decoded['signature'] is None:
+        return f"未知错误 {decoded['selector']}"
+    if decoded['args'] is None:
+        return decoded['signature']
+    name = decoded['signature'][:decoded['signature'].index('(')]
+    args = ', '.join(f"{arg['name']}={arg['value']}" if arg['name'] else str(arg['value'])
+                     for arg in decoded['args'])
+    return f"{name}({args})"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='从 Solidity 源码构建自定义错误选择器索引并解码 revert 数据')
+    parser.add_argument('data', nargs='*', help='要解码的 revert 数据或 4 字节选择器 (0x...)')
+    parser.add_argument('--rebuild', action='store_true', help='忽略缓存重新构建索引')
+    args = parser.parse_args(argv)
+
+    index = SelectorIndex.load(rebuild=args.rebuild)
+    if not args.data:
+        print(f"✅ 索引包含 {len(index)} 个选择器, 来自 {len(index.files)} 个源文件")
+        return
+
+    for data in args.data:
+        if not REVERT_DATA_PATTERN.fullmatch(data.lower()):
+            print(f"❌ {data}: 无效的 revert 数据")
+            continue
+        candidates = index.lookup(data[:10])
+        if not candidates:
+            print(f"❌ {data[:10]}: 未知选择器")
+            continue
+        if len(data) > 10:
+            print(f"🔸 {format_decoded(index.decode(data))}")
+        else:
+            for signature, _ in candidates:
+                print(f"🔸 {data[:10]}: {signature}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+测试结果历史库: 把每次运行的日志导入 SQLite, 跨运行查询新增失败, 新修复和不稳定的测试
+
+每次运行记录所有测试的状态和耗时, 失败测试附带错误类别 (error_rules.json) 和根因指纹.
+测试以 full_title (suite 路径 + 标题, 即 mocha 的 fullTitle) 标识, 不使用每次都会变的失败编号.
+同一份日志 (内容哈希相同) 只导入一次. 运行按导入顺序编号, 请按时间顺序导入.
+
+用法:
+    python3 test_history.py ingest full_test_results.txt mocha_report.json --label nightly
+    python3 test_history.py failing            # 最新一次运行相对上一次新增的失败
+    python3 test_history.py fixed --base 3     # 最新一次运行相对第 3 次运行修复的测试
+    python3 test_history.py flaky --last 20    # 最近 20 次运行中通过/失败来回变化的测试
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+from collections import namedtuple
+
+from analyze_errors import (JSON_STREAM_EVENT_PREFIX, full_title, get_error_rules, iter_classified_failures,
+                            iter_log_failures, read_json_report)
+from failure_fingerprint import fingerprint_failure
+from profile_tests import iter_test_timings, select_run
+
+HISTORY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test_history.db')
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    sha1 TEXT NOT NULL UNIQUE,
+    recorded_at REAL,
+    label TEXT,
+    passed INTEGER NOT NULL,
+    failed INTEGER NOT NULL,
+    pending INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tests (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    suite TEXT NOT NULL,
+    title TEXT NOT NULL,
+    file TEXT
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    test_id INTEGER NOT NULL REFERENCES tests(id),
+    status TEXT NOT NULL,
+    duration_ms INTEGER,
+    category TEXT,
+    fingerprint TEXT,
+    PRIMARY KEY (run_id, test_id)
+) WITHOUT ROWID;
+'''
+
+TestResult = namedtuple('TestResult', ['key', 'suite', 'title', 'file', 'status', 'duration', 'category',
+                                       'fingerprint'])
+
+
+def _result(suite, title, status, duration=None, file=None):
+    suite = suite.strip()
+    return TestResult(f"{suite} {title}" if suite else title, suite, title, file, status, duration, None, None)
+
+
+def _mocha_result(test, status):
+    """json / json-stream reporter 中的测试对象, suite 取 fullTitle 去掉标题的部分"""
+    title = test.get('title') or ''
+    key = test.get('fullTitle') or title
+    suite = key[:-len(title)] if title and key.endswith(title) else ''
+    return _result(suite, title, status, test.get('duration'), test.get('file'))
+
+
+def _text_lines(lines, events):
+    """过滤掉 json-stream 事件行 (解析后追加到 events), 其余行原样产出"""
+    for line in lines:
+        if not line.startswith(JSON_STREAM_EVENT_PREFIX):
+            yield line
+            continue
+        try:
+            events.append(json.loads(line))
+        except ValueError:
+            pass
+
+
+def load_run(log_file, rules=None):
+    """读取一次运行的全部测试结果, 返回 {full_title: TestResult}
+
+    通过和跳过的测试来自 json 报告, json-stream 的 pass 事件或 spec 输出的进度行
+    (拼接了多次运行的日志取最后一次完整运行); 失败测试来自 analyze_errors 的解析结果,
+    附带错误类别和指纹.
+    """
+    results = {}
+    with open(log_file, 'r', encoding='utf-8', errors='replace') as f:
+        report = read_json_report(f)
+        if report is not None:
+            for status, tests in (('passed', report.get('passes', [])), ('pending', report.get('pending', []))):
+                for test in tests:
+                    result = _mocha_result(test, status)
+                    results[result.key] = result
+        else:
+            f.seek(0)
+            events = []
+            for timing in select_run(list(iter_test_timings(_text_lines(f, events)))):
+                results[full_title(timing)] = _result(' '.join(timing.suite), timing.title, timing.status,
+                                                      timing.duration)
+            for event in events:
+                if isinstance(event, list) and len(event) == 2 and event[0] == 'pass':
+                    result = _mocha_result(event[1], 'passed')
+                    results[result.key] = result
+
+    for category, failure in iter_classified_failures(iter_log_failures(log_file), rules):
+        key = full_title(failure)
+        previous = results.get(key)
+        results[key] = TestResult(key, ' '.join(failure.suite), failure.title, failure.file, 'failed',
+                                  previous.duration if previous else None, category,
+                                  fingerprint_failure(failure)[0])
+    return results
+
+
+def file_sha1(path):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class TestHistory:
+    """SQLite 历史库
+
+    results 以 (run_id, test_id) 为主键, 按运行取结果和两次运行之间的对比都走主键索引,
+    tests.key 上的唯一索引用于导入时按 full_title 找到测试.
+    """
+
+    def __init__(self, path=HISTORY_FILE):
+        self.db = sqlite3.connect(path)
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def ingest(self, log_file, label=None, rules=None):
+        """导入一份日志, 返回 (run_id, 是否新导入)
+
+        内容相同的日志已导入过时返回已有的 run_id; 日志中没有任何测试结果
+        (如 hardhat 启动失败) 时不导入, run_id 为 None.
+        """
+        sha1 = file_sha1(log_file)
+        row = self.db.execute('SELECT id FROM runs WHERE sha1 = ?', (sha1,)).fetchone()
+        if row:
+            return row[0], False
+
+        results = load_run(log_file, rules or get_error_rules()).values()
+        if not results:
+            return None, False
+        counts = {status: sum(1 for r in results if r.status == status)
+                  for status in ('passed', 'failed', 'pending')}
+        with self.db:
+            run_id = self.db.execute(
+                'INSERT INTO runs (source, sha1, recorded_at, label, passed, failed, pending)'
+                ' VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (os.path.abspath(log_file), sha1, os.path.getmtime(log_file), label,
+                 counts['passed'], counts['failed'], counts['pending'])).lastrowid
+            self.db.executemany(
+                'INSERT INTO tests (key, suite, title, file) VALUES (?, ?, ?, ?)'
+                ' ON CONFLICT (key) DO UPDATE SET file = coalesce(excluded.file, tests.file)',
+                [(r.key, r.suite, r.title, r.file) for r in results])
+            self.db.executemany(
+                'INSERT INTO results (run_id, test_id, status, duration_ms, category, fingerprint)'
+                ' SELECT ?, id, ?, ?, ?, ? FROM tests WHERE key = ?',
+                [(run_id, r.status, r.duration, r.category, r.fingerprint, r.key) for r in results])
+        return run_id, True
+
+    def runs(self, last=None):
+        """最近 last 次运行 (全部时 last 为 None), 按时间顺序返回 [(id, source, label, passed, failed, pending)]"""
+        rows = self.db.execute(
+            'SELECT id, source, label, passed, failed, pending FROM runs ORDER BY id DESC LIMIT ?',
+            (-1 if last is None else last,)).fetchall()
+        return rows[::-1]
+
+    def resolve_runs(self, run=None, base=None):
+        """确定要对比的 (base, run): run 默认为最新一次, base 默认为 run 的前一次; 不存在时为 None"""
+        if run is None:
+            row = self.db.execute('SELECT max(id) FROM runs').fetchone()
+            run = row[0]
+        if base is None and run is not None:
+            row = self.db.execute('SELECT max(id) FROM runs WHERE id < ?', (run,)).fetchone()
+            base = row[0]
+        return base, run
+
+    def newly_failing(self, base, run):
+        """run 中失败而 base 中没有失败 (通过, 跳过或不存在) 的测试: [(key, category, fingerprint, base 状态)]"""
+        return self.db.execute('''
+            SELECT t.key, cur.category, cur.fingerprint, prev.status
+            FROM results cur
+            JOIN tests t ON t.id = cur.test_id
+            LEFT JOIN results prev ON prev.run_id = ? AND prev.test_id = cur.test_id
+            WHERE cur.run_id = ? AND cur.status = 'failed' AND (prev.status IS NULL OR prev.status != 'failed')
+            ORDER BY cur.category, t.key
+        ''', (base, run)).fetchall()
+
+    def newly_fixed(self, base, run):
+        """base 中失败而 run 中通过的测试: [(key, base 中的类别)]"""
+        return self.db.execute('''
+            SELECT t.key, prev.category
+            FROM results cur
+            JOIN tests t ON t.id = cur.test_id
+            JOIN results prev ON prev.run_id = ? AND prev.test_id = cur.test_id
+            WHERE cur.run_id = ? AND cur.status = 'passed' AND prev.status = 'failed'
+            ORDER BY prev.category, t.key
+        ''', (base, run)).fetchall()
+
+    def flaky(self, last=10, min_flips=2):
+        """最近 last 次运行中在通过和失败之间变化至少 min_flips 次的测试
+
+        跳过和未运行的次数不参与判断. 返回 [(key, 变化次数, 失败次数, 参与运行次数)].
+        """
+        return self.db.execute('''
+            WITH recent AS (SELECT id FROM runs ORDER BY id DESC LIMIT ?),
+            history AS (
+                SELECT test_id, status,
+                       lag(status) OVER (PARTITION BY test_id ORDER BY run_id) AS previous
+                FROM results
+                WHERE run_id IN recent AND status IN ('passed', 'failed')
+            )
+            SELECT t.key, sum(status != previous) AS flips, sum(status = 'failed') AS failures, count(*)
+            FROM history
+            JOIN tests t ON t.id = history.test_id
+            GROUP BY history.test_id
+            HAVING flips >= ?
+            ORDER BY flips DESC, failures DESC, t.key
+        ''', (last, min_flips)).fetchall()
+
+
+def print_comparison(title, base, run, rows):
+    print(f"{title} (运行 #{base} -> #{run}): {len(rows)} 个")
+    print("=" * 60)
+    for key, category, *_ in rows:
+        print(f"   [{category}] {key}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='测试结果历史库: 跨运行查询新增失败, 新修复和不稳定的测试')
+    parser.add_argument('--db', default=HISTORY_FILE, help='历史库文件 (默认: test_history.db)')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    ingest = commands.add_parser('ingest', help='导入日志 (spec 文本, json-stream 或 json 报告), 按时间顺序')
+    ingest.add_argument('logs', nargs='+', help='日志文件')
+    ingest.add_argument('--label', help='运行标签, 如分支名或提交')
+    ingest.add_argument('--rules', help='错误分类规则表 (默认: error_rules.json)')
+
+    runs = commands.add_parser('runs', help='列出已导入的运行')
+    runs.add_argument('--last', type=int, default=20, help='最近 N 次 (默认: 20)')
+
+    for name, help_text in (('failing', '新增的失败'), ('fixed', '新修复的测试')):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument('--run', type=int, help='运行编号 (默认: 最新一次)')
+        command.add_argument('--base', type=int, help='对比基准的运行编号 (默认: --run 的前一次)')
+
+    flaky = commands.add_parser('flaky', help='通过/失败来回变化的测试')
+    flaky.add_argument('--last', type=int, default=10, help='最近 N 次运行 (默认: 10)')
+    flaky.add_argument('--min-flips', type=int, default=2, help='至少变化几次 (默认: 2)')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    history = TestHistory(args.db)
+    try:
+        if args.command == 'ingest':
+            rules = get_error_rules(args.rules) if args.rules else None
+            for log_file in args.logs:
+                try:
+                    run_id, added = history.ingest(log_file, args.label, rules)
+                except FileNotFoundError:
+                    print(f"❌ 找不到日志文件: {log_file}")
+                    continue
+                if run_id is None:
+                    print(f"⚠️  {log_file} 中没有测试结果, 跳过")
+                elif added:
+                    print(f"✅ {log_file} -> 运行 #{run_id}")
+                else:
+                    print(f"⏭️  {log_file} 已导入过 (运行 #{run_id})")
+
+        elif args.command == 'runs':
+            print("   编号   通过   失败   跳过  来源")
+            for run_id, source, label, passed, failed, pending in history.runs(args.last):
+                suffix = f" [{label}]" if label else ""
+                print(f"   #{run_id:<4} {passed:>5}  {failed:>5}  {pending:>5}  {os.path.relpath(source)}{suffix}")
+
+        elif args.command in ('failing', 'fixed'):
+            base, run = history.resolve_runs(args.run, args.base)
+            if base is None or run is None:
+                print("❌ 至少需要两次运行才能对比")
+                sys.exit(1)
+            if args.command == 'failing':
+                print_comparison("🔴 **新增失败**", base, run, history.newly_failing(base, run))
+            else:
+                print_comparison("🟢 **新修复**", base, run, history.newly_fixed(base, run))
+
+        else:
+            rows = history.flaky(args.last, args.min_flips)
+            print(f"🎲 **不稳定的测试** (最近 {args.last} 次运行, 至少变化 {args.min_flips} 次): {len(rows)} 个")
+            print("=" * 60)
+            for key, flips, failures, runs in rows:
+                print(f"   变化 {flips} 次, 失败 {failures}/{runs}  {key}")
+    finally:
+        history.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+轻量的 TypeScript 词法分析器, 供 codemod 的 token 规则使用
+
+整个文件用一个不带分组的正则 findall 一次切完, token 就是原文的子串, 拼起来
+等于原文. 字符串, 模板字符串, 正则字面量和注释各是一个完整的 token, 规则只要
+比较 token 文本就不会误改其中的内容.
+
+为了保持单次 findall 的速度, 有两处近似:
+  - 模板字符串不处理 ${...} 中嵌套的反引号
+  - 正则字面量只在紧跟 ( , = : [ ! & | ? { } ; 或 return (中间最多一个空格) 时识别
+
+标识符按 Unicode 单词字符 (各种文字的字母, 数字和下划线) 加 $ 识别. 导入时只定义正则源码,
+第一次使用时才编译, 不切 token 的调用 (如 zx.py --help) 没有编译开销.
+"""
+
+import re
+
+TOKEN_SOURCE = r'''
+    \s+
+  | //[^\n]*
+  | /\*[\s\S]*?(?:\*/|\Z)
+  | "(?:[^"\\\n]|\\[\s\S])*"?
+  | '(?:[^'\\\n]|\\[\s\S])*'?
+  | `(?:[^`\\]|\\[\s\S])*`?
+  | (?:(?<=[(,=:\[!&|?{};])|(?<=[(,=:\[!&|?{};]\ )|(?<=return\ ))
+    /(?![/*])(?:[^/\\\[\n]|\\.|\[(?:[^\]\\\n]|\\.)*\])+/[A-Za-z]*
+  | \d[\w$]*(?:\.\d[\w$]*)?
+  | (?:[^\W\d]|\$)[\w$]*
+  | >>>=|\.\.\.|===|!==|\*\*=|<<=|>>=|>>>|\?\?=|&&=|\|\|=
+  | =>|\?\.(?!\d)|==|!=|<=|>=|&&|\|\||\?\?|\+\+|--|\*\*|<<|>>|[-+*/%&|^]=
+  | [\s\S]
+'''
+IDENTIFIER_SOURCE = r'(?:[^\W\d]|\$)[\w$]*\Z'
+INTEGER_SOURCE = r'\d+\Z'
+
+_compiled = {}
+
+
+def compiled(source, flags=0):
+    """返回编译后的正则, 同一源码在进程内只编译一次"""
+    pattern = _compiled.get(source)
+    if pattern is None:
+        pattern = _compiled[source] = re.compile(source, flags)
+    return pattern
+
+
+def tokenize(source):
+    """把源码切成 token 文本列表"""
+    return compiled(TOKEN_SOURCE, re.VERBOSE).findall(source)
+
+
+def is_trivia(token):
+    """空白和注释"""
+    return token[0].isspace() or token.startswith(('//', '/*'))
+
+
+def is_identifier(token):
+    return compiled(IDENTIFIER_SOURCE).match(token) is not None
+
+
+def is_integer(token):
+    """不带后缀的十进制整数字面量, 如 1, 100 (不含 1n, 1e18, 0x10, 1.5)"""
+    return compiled(INTEGER_SOURCE).match(token) is not None
+
+
+def next_significant(tokens, index):
+    """index 及之后第一个非空白/注释 token 的下标, 没有时返回 len(tokens)"""
+    while index < len(tokens) and is_trivia(tokens[index]):
+        index += 1
+    return index
+
+
+def previous_significant(tokens, index):
+    """index 及之前第一个非空白/注释 token 的下标, 没有时返回 -1"""
+    while index >= 0 and is_trivia(tokens[index]):
+        index -= 1
+    return index
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+合约地址表的一致性检查: packages/contract-addresses/addresses.json 和 contracts/*/DEPLOYS.json
+
+一次读取所有文件, 把地址收集成一批记录后统一检查, 报告所有问题而不是遇到第一个就停止:
+
+  错误
+    - JSON 格式或结构不对, 对象中有重复的键 (json 模块会静默保留最后一个)
+    - 地址不是 0x + 40 位十六进制
+    - 大小写混合但不符合 EIP-55 校验和 (全小写或全大写视为未带校验和, 仓库中的地址都是小写)
+    - 同一条链上不同合约使用同一个地址 (SHARED_ADDRESS_GROUPS 中声明的除外)
+    - 某条链缺少其他链都有的合约
+    - DEPLOYS.json 中某个合约在某条链上最后一次部署的地址与 addresses.json 中同名合约不一致
+  警告
+    - 同一个地址在不同的链上是不同的合约 (同一部署账户在各链上的 nonce 不同时可能是正常的)
+
+校验和用纯 Python 的 keccak 计算, 结果按地址缓存在 .address_checksums.json 中, 重复运行时
+不再计算. 有错误时以状态码 1 退出, 可以作为 pre-commit 检查 (见 .githooks/pre-commit).
+
+用法: python3 validate_addresses.py [文件 ...] [--strict]
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+from collections import namedtuple
+
+from address_registry import ADDRESSES_FILE, NULL_ADDRESS, REPO_ROOT, to_checksum_address
+
+CHECKSUM_CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.address_checksums.json')
+DEPLOYS_PATTERN = os.path.join('contracts', '*', 'DEPLOYS.json')
+
+ADDRESS_PATTERN = re.compile(r'0x[0-9a-fA-F]{40}\Z')
+
+# 允许在同一条链上共用地址的合约, 如较新的链上由同一个治理合约同时担任两个角色
+SHARED_ADDRESS_GROUPS = [
+    {'zeroExGovernor', 'exchangeProxyGovernor'},
+]
+
+# file 为相对仓库根目录的路径, location 为文件中的位置 (如 "1.transformers.wethTransformer")
+Record = namedtuple('Record', ['file', 'location', 'chain', 'name', 'address'])
+Violation = namedtuple('Violation', ['severity', 'file', 'location', 'message'])
+
+
+def display_path(path):
+    """仓库中的文件显示为相对仓库根目录的路径"""
+    path = os.path.abspath(path)
+    return os.path.relpath(path, REPO_ROOT) if path.startswith(REPO_ROOT + os.sep) else path
+
+
+class DuplicateKeyError(ValueError):
+    pass
+
+
+def _reject_duplicate_keys(pairs):
+    keys = [key for key, _ in pairs]
+    duplicates = sorted({key for key in keys if keys.count(key) > 1})
+    if duplicates:
+        raise DuplicateKeyError(f"重复的键: {', '.join(duplicates)}")
+    return dict(pairs)
+
+
+def read_json(path, violations):
+    """读取 JSON, 出错时记录违规并返回 None"""
+    relative = display_path(path)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f, object_pairs_hook=_reject_duplicate_keys)
+    except FileNotFoundError:
+        violations.append(Violation('error', relative, '', '文件不存在'))
+    except ValueError as e:
+        violations.append(Violation('error', relative, '', f'JSON 无效: {e}'))
+    return None
+
+
+def load_addresses_json(path, violations):
+    """addresses.json -> [Record], 嵌套分组中的合约名为 "分组.名称" """
+    data = read_json(path, violations)
+    relative = display_path(path)
+    if data is None:
+        return []
+    if not isinstance(data, dict):
+        violations.append(Violation('error', relative, '', '顶层应为 {链 id: {合约名: 地址}}'))
+        return []
+
+    records = []
+    for chain, contracts in data.items():
+        if not chain.isdigit():
+            violations.append(Violation('error', relative, chain, '链 id 应为十进制数字'))
+        if not isinstance(contracts, dict):
+            violations.append(Violation('error', relative, chain, '应为 {合约名: 地址}'))
+            continue
+        for name, value in contracts.items():
+            members = value.items() if isinstance(value, dict) else [(None, value)]
+            for member, address in members:
+                full_name = f'{name}.{member}' if member else name
+                records.append(Record(relative, f'{chain}.{full_name}', chain, full_name, address))
+    return records
+
+
+def load_deploys_json(path, violations):
+    """DEPLOYS.json -> [Record], 每个合约在每条链上只取最后一次部署"""
+    data = read_json(path, violations)
+    relative = display_path(path)
+    if data is None:
+        return []
+    if not isinstance(data, list):
+        violations.append(Violation('error', relative, '', '顶层应为 [{name, version, changes}]'))
+        return []
+
+    records = []
+    for index, contract in enumerate(data):
+        if not isinstance(contract, dict) or not isinstance(contract.get('name'), str) \
+                or not isinstance(contract.get('changes'), list):
+            violations.append(Violation('error', relative, f'[{index}]', '缺少 name 或 changes'))
+            continue
+        name = contract['name']
+        latest = {}
+        for change_index, change in enumerate(contract['changes']):
+            networks = change.get('networks', {}) if isinstance(change, dict) else None
+            if not isinstance(networks, dict):
+                violations.append(Violation('error', relative, f'{name}.changes[{change_index}]',
+                                            'networks 应为 {链 id: 地址}'))
+                continue
+            for chain, address in networks.items():
+                latest[chain] = Record(relative, f'{name}.changes[{change_index}].networks.{chain}',
+                                       chain, name, address)
+        records.extend(latest.values())
+    return records
+
+
+def check_format(records, violations):
+    """返回格式正确的记录"""
+    valid = []
+    for record in records:
+        if isinstance(record.address, str) and ADDRESS_PATTERN.match(record.address):
+            valid.append(record)
+        else:
+            violations.append(Violation('error', record.file, record.location, f'地址格式无效: {record.address!r}'))
+    return valid
+
+
+def check_checksums(records, violations, cache):
+    """检查大小写混合的地址, cache 为 {小写地址: 校验和形式}, 新计算的结果会加入其中"""
+    for record in records:
+        digits = record.address[2:]
+        if digits == digits.lower() or digits == digits.upper():
+            continue
+        lower = record.address.lower()
+        checksummed = cache.get(lower)
+        if checksummed is None:
+            checksummed = cache[lower] = to_checksum_address(lower)
+        if record.address != checksummed:
+            violations.append(Violation('error', record.file, record.location,
+                                        f'EIP-55 校验和错误: {record.address}, 应为 {checksummed}'))
+
+
+def _may_share(names):
+    return any(names <= group for group in SHARED_ADDRESS_GROUPS)
+
+
+def check_chain_coverage(records, violations):
+    """addresses.json 的每条链都应包含所有链上出现过的合约 (包括地址格式错误的)"""
+    by_chain = {}
+    all_names = {}
+    for record in records:
+        by_chain.setdefault(record.chain, set()).add(record.name)
+        all_names.setdefault(record.name, record.file)
+    for chain, names in by_chain.items():
+        for name, file in all_names.items():
+            if name not in names:
+                violations.append(Violation('error', file, f'{chain}.{name}', '其他链上都有该合约, 这条链上缺少'))
+
+
+def check_unique_addresses(records, violations):
+    """addresses.json 的链内地址唯一性, 以及跨链的同一地址是否指向同一合约"""
+    owners = {}
+    names_by_address = {}
+    for record in records:
+        address = record.address.lower()
+        if address == NULL_ADDRESS:
+            continue
+        owners.setdefault((record.chain, address), []).append(record)
+        names_by_address.setdefault(address, {}).setdefault(record.name, []).append(record)
+
+    for (chain, _), shared in owners.items():
+        names = {record.name for record in shared}
+        if len(shared) > 1 and not _may_share(names):
+            violations.append(Violation('error', shared[0].file, chain,
+                                        f"{', '.join(sorted(names))} 使用同一个地址 {shared[0].address}"))
+
+    for address, names in names_by_address.items():
+        if len(names) > 1 and not _may_share(set(names)):
+            description = '; '.join(f"{name} (链 {', '.join(record.chain for record in named)})"
+                                    for name, named in sorted(names.items()))
+            file = next(iter(names.values()))[0].file
+            violations.append(Violation('warning', file, address, f'不同链上是不同的合约: {description}'))
+
+
+def check_deploys_consistency(deploys_records, address_records, violations):
+    """DEPLOYS.json 中合约的最新部署地址应与 addresses.json 中同名 (首字母小写) 合约一致"""
+    known = {(record.chain, record.name): record for record in address_records}
+    for record in deploys_records:
+        expected = known.get((record.chain, record.name[:1].lower() + record.name[1:]))
+        if expected and expected.address.lower() != record.address.lower():
+            violations.append(Violation('error', record.file, record.location,
+                                        f'最新部署地址 {record.address} 与 {expected.file} 中 '
+                                        f'{expected.location} 的 {expected.address} 不一致'))
+
+
+def load_checksum_cache(path=CHECKSUM_CACHE_FILE):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def validate(addresses_file=ADDRESSES_FILE, deploys_files=None, checksum_cache=None):
+    """检查 addresses.json 和 DEPLOYS.json 文件, 返回 [Violation], 错误在前
+
+    deploys_files 默认为 contracts/*/DEPLOYS.json; checksum_cache 为 {小写地址: 校验和形式}.
+    """
+    if deploys_files is None:
+        deploys_files = sorted(glob.glob(os.path.join(REPO_ROOT, DEPLOYS_PATTERN)))
+    checksum_cache = {} if checksum_cache is None else checksum_cache
+
+    violations = []
+    loaded = load_addresses_json(addresses_file, violations)
+    address_records = check_format(loaded, violations)
+    deploys_records = []
+    for path in deploys_files:
+        deploys_records += check_format(load_deploys_json(path, violations), violations)
+
+    check_checksums(address_records + deploys_records, violations, checksum_cache)
+    check_chain_coverage(loaded, violations)
+    check_unique_addresses(address_records, violations)
+    check_deploys_consistency(deploys_records, address_records, violations)
+    violations.sort(key=lambda violation: violation.severity != 'error')
+    return violations
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='检查 addresses.json 和 DEPLOYS.json 中的合约地址')
+    parser.add_argument('files', nargs='*',
+                        help='要检查的文件, 文件名为 DEPLOYS.json 的按部署记录检查, 其他按 addresses.json 检查 '
+                             '(默认: packages/contract-addresses/addresses.json 和 contracts/*/DEPLOYS.json)')
+    parser.add_argument('--strict', action='store_true', help='有警告时也以状态码 1 退出')
+    parser.add_argument('--no-cache', action='store_true', help='不读写 .address_checksums.json')
+    args = parser.parse_args(argv)
+
+    addresses_file = ADDRESSES_FILE
+    deploys_files = None
+    if args.files:
+        deploys_files = [path for path in args.files if os.path.basename(path) == 'DEPLOYS.json']
+        others = [path for path in args.files if os.path.basename(path) != 'DEPLOYS.json']
+        if len(others) > 1:
+            parser.error('一次只能检查一个 addresses.json')
+        # 只给出 DEPLOYS.json 时仍和默认的 addresses.json 对比
+        addresses_file = others[0] if others else ADDRESSES_FILE
+
+    cache = {} if args.no_cache else load_checksum_cache()
+    cached = len(cache)
+    violations = validate(addresses_file, deploys_files, cache)
+    if not args.no_cache and len(cache) != cached:
+        with open(CHECKSUM_CACHE_FILE, 'w', encoding='utf-8') as f:
+            json.dump(cache, f)
+
+    errors = [violation for violation in violations if violation.severity == 'error']
+    warnings = [violation for violation in violations if violation.severity == 'warning']
+    for violation in violations:
+        mark = '❌' if violation.severity == 'error' else '⚠️ '
+        location = f' {violation.location}' if violation.location else ''
+        print(f"{mark} {violation.file}{location}: {violation.message}")
+
+    if errors or (args.strict and warnings):
+        print(f"\n❌ 地址检查失败: {len(errors)} 个错误, {len(warnings)} 个警告")
+        sys.exit(1)
+    print(f"{chr(10) if violations else ''}✅ 地址检查通过 ({len(warnings)} 个警告)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+基准测试用的合成输入
+
+  - generate_mocha_log: 仿照 full_test_output.txt 的 mocha spec 输出, 通过/失败/跳过数量,
+    栈深度和错误信息分布可调
+  - generate_ts_source: 混有 fix_*.py 规则要修复的旧写法的 TypeScript 测试代码
+  - generate_addresses: 与 packages/contract-addresses/addresses.json 结构相同的地址表
+
+同样的参数和 seed 总是生成同样的内容. 也可以在命令行中把生成结果写到文件:
+
+    python3 workloads.py log --failing 1000 -o big.log
+    python3 workloads.py ts --size-mb 4 -o big_test.ts
+    python3 workloads.py addresses --chains 200 -o addresses.json
+"""
+
+import argparse
+import json
+import random
+import sys
+
+# 栈帧, 最后一个替换为指向所属测试文件的帧
+STACK_FRAMES = [
+    '    at MetaTransactionsFeature.rrevert (@0x/contracts-utils/contracts/src/errors/LibRichErrors.sol:39)',
+    '    at ZeroEx.<fallback> (contracts/src/ZeroEx.sol:47)',
+    '    at EdrProviderWrapper.request (/Users/king/javascript/protocol/node_modules/hardhat/src/internal/hardhat-network/provider/provider.ts:359:41)',
+    '    at async HardhatEthersSigner.sendTransaction (/Users/king/javascript/protocol/node_modules/@nomicfoundation/hardhat-ethers/src/signers.ts:181:18)',
+    '    at async send (/Users/king/javascript/protocol/node_modules/ethers/src.ts/contract/contract.ts:313:20)',
+    '    at async Context.<anonymous> (test/features/meta_transactions_test.ts:304:24)',
+]
+
+ERROR_MESSAGES = [
+    'Error: missing value for component id',
+    'Error: Transaction reverted without a reason string',
+    'Error: VM Exception while processing transaction: reverted with an unrecognized custom error (return data: 0x47ab394e000000000000000000000000a4ae77554847958ac0854f06601267c9f9c75dfd)',
+    'Error: VM Exception while processing transaction: reverted with an unrecognized custom error (return data: 0xbea726ef228b67f3a5f218a67259d6b870fa4aa27e3d4dad9dc5d46afdc70eda0000000000000000000000000000000000000000000000000000000068b7fad9)',
+    'Error: VM Exception while processing transaction: reverted with an unrecognized custom error (return data: 0x734e6e1c00000000)',
+    'Error: VM Exception while processing transaction: reverted with an unrecognized custom error (return data: 0x1de45ad1000000000000000000000000f39fd6e51aad88f6f4ce6ab8827279cfffb92266)',
+    "AssertionError: Expected transaction to be reverted with reason 'OnlyTakerError', but it reverted with a custom error",
+    'AssertionError: expected 81 to equal 46.',
+    'TypeError: zeroEx.connect(...).migrate is not a function',
+    'TypeError: invalid address (argument="address", value="", code=INVALID_ARGUMENT, version=6.15.0)',
+    'RangeError: data out-of-bounds (buffer=0x, length=0, offset=32, code=BUFFER_OVERRUN, version=6.15.0)',
+    'Error: Instance of MetaTransactionData does not have all its parameter values set',
+    'Error: 错误编码不匹配。期望: 0x547a32a3, 实际: 0xbea726ef',
+    'ProviderError: sender doesn\'t have enough funds to send tx',
+]
+
+# 会被 fix_*.py 规则修复的旧写法
+LEGACY_SNIPPETS = [
+    'import { AbiEncoder, BigNumber, hexUtils } from "@0x/utils";\n',
+    '    const plpDataEncoder = AbiEncoder.create([\n'
+    '        { name: "provider", type: "address" },\n'
+    '        { name: "auxiliaryData", type: "bytes" },\n'
+    '    ]);\n',
+    '        data: plpDataEncoder.encode({ provider: liquidityProvider.address, auxiliaryData: hexUtils.random() }),\n',
+    '    const batchSellDataEncoder = AbiEncoder.create([\n'
+    '        {\n'
+    '            name: "calls",\n'
+    '            type: "tuple[]",\n'
+    '            components: [\n'
+    '                { name: "id", type: "uint8" },\n'
+    '                { name: "sellAmount", type: "uint256" },\n'
+    '                { name: "data", type: "bytes" },\n'
+    '            ],\n'
+    '        },\n'
+    '    ]);\n',
+    '        data: batchSellDataEncoder.encode({ calls }),\n',
+    '            await zeroEx\n'
+    '                .multiplexBatchSellTokenForToken(dai.address, zrx.address, [rfqSubcall], sellAmount, 0)\n'
+    '                ({ from: taker });\n',
+    '        const expectedAmount = order.takerAmount - 1;\n',
+    '        const nextNonce = mtx.nonce + 1;\n',
+    '        const total = amounts.reduce((a, b) => a + b, 0);\n',
+    '        await token.approve(zeroEx.address, MAX_UINT256);\n',
+]
+
+# 不会被修改的普通代码
+PLAIN_SNIPPETS = [
+    '    it("can fill an order", async () => {\n',
+    '        const receipt = await tx.wait();\n',
+    '        expect(await token.balanceOf(taker)).to.eq(expectedAmount);\n',
+    '    });\n',
+    '\n',
+    '    // ' + 'comment ' * 12 + '\n',
+    '        const signature = await order.getSignatureWithProviderAsync(env.provider);\n',
+]
+
+# addresses.json 中主网的合约名, 顺序与原文件一致
+CONTRACT_NAMES = [
+    'zrxToken', 'etherToken', 'zeroExGovernor', 'zrxVault', 'staking', 'stakingProxy', 'erc20BridgeProxy',
+    'erc20BridgeSampler', 'exchangeProxyGovernor', 'exchangeProxy', 'exchangeProxyTransformerDeployer',
+    'exchangeProxyFlashWallet', 'exchangeProxyLiquidityProviderSandbox', 'zrxTreasury',
+]
+TRANSFORMER_NAMES = [
+    'wethTransformer', 'payTakerTransformer', 'affiliateFeeTransformer', 'fillQuoteTransformer',
+    'positiveSlippageFeeTransformer',
+]
+CHAIN_IDS = ['1', '5', '56', '1337', '137', '80001', '43114', '250', '42220', '10', '42161', '8453']
+
+
+def generate_mocha_log(passing=400, failing=150, pending=20, stack_depth=6, error_mix=None, seed=0,
+                       tests_per_suite=20):
+    """逐行产出 mocha spec reporter 的完整输出
+
+    测试按 tests_per_suite 分到各个 "SuiteN" / "methodM()" 两层 suite 中, 状态随机打散.
+    失败块的错误信息按 error_mix ({错误信息: 权重}, 默认 ERROR_MESSAGES 等权) 抽取,
+    栈帧取 stack_depth 个, 最后一帧指向 test/features/suite_N_test.ts.
+    """
+    rng = random.Random(seed)
+    statuses = ['passed'] * passing + ['failed'] * failing + ['pending'] * pending
+    rng.shuffle(statuses)
+    messages = list(error_mix) if error_mix else ERROR_MESSAGES
+    weights = list(error_mix.values()) if error_mix else None
+
+    failures = []
+    for index, status in enumerate(statuses):
+        suite_index, position = divmod(index, tests_per_suite)
+        suite = f'Suite{suite_index}'
+        method = f'method{position // 5}()'
+        if position == 0:
+            yield '\n'
+            yield f'  {suite}\n'
+        if position % 5 == 0:
+            yield f'    {method}\n'
+        title = f'case {index} fills the order'
+        if status == 'passed':
+            duration = f' ({rng.randint(40, 120)}ms)' if rng.random() < 0.3 else ''
+            yield f'      ✔ {title}{duration}\n'
+        elif status == 'pending':
+            yield f'      - {title}\n'
+        else:
+            failures.append((suite_index, suite, method, title))
+            yield f'      {len(failures)}) {title}\n'
+
+    yield '\n\n'
+    yield f'  {passing} passing (8s)\n'
+    if pending:
+        yield f'  {pending} pending\n'
+    yield f'  {failing} failing\n'
+    yield '\n'
+
+    for number, (suite_index, suite, method, title) in enumerate(failures, 1):
+        yield f'  {number}) {suite}\n'
+        yield f'       {method}\n'
+        yield f'         {title}:\n'
+        yield '\n'
+        message = rng.choices(messages, weights)[0]
+        yield f'      {message}\n'
+        frames = [STACK_FRAMES[i % (len(STACK_FRAMES) - 1)] for i in range(max(stack_depth - 1, 0))]
+        frames.append(f'    at async Context.<anonymous> (test/features/suite_{suite_index}_test.ts:'
+                      f'{rng.randint(10, 900)}:{rng.randint(5, 40)})')
+        for frame in frames[:stack_depth]:
+            yield '  ' + frame + '\n'
+        yield '\n'
+
+
+def generate_ts_source(target_bytes, seed=0, legacy_ratio=0.1):
+    """生成约 target_bytes 大小的 TypeScript 测试代码, 约 legacy_ratio 的片段为旧写法"""
+    rng = random.Random(seed)
+    parts = []
+    size = 0
+    while size < target_bytes:
+        snippet = rng.choice(LEGACY_SNIPPETS) if rng.random() < legacy_ratio else rng.choice(PLAIN_SNIPPETS)
+        parts.append(snippet)
+        size += len(snippet)
+    return ''.join(parts)
+
+
+def generate_addresses(chains=len(CHAIN_IDS), contracts=len(CONTRACT_NAMES), transformers=len(TRANSFORMER_NAMES),
+                       shared_ratio=0.2, seed=0):
+    """生成 addresses.json 结构的 {chain_id: {合约名: 地址, 'transformers': {名称: 地址}}}
+
+    前几条链使用真实的 chain id 和合约名, 超出部分编号生成. 约 shared_ratio 的合约在所有链上
+    使用同一个地址 (如 exchangeProxy 的 0xdef1c0ded9bec7f1a1670819833240f027b25eff).
+    地址为小写十六进制, 与原文件一致.
+    """
+    rng = random.Random(seed)
+
+    def address():
+        return '0x%040x' % rng.getrandbits(160)
+
+    chain_ids = CHAIN_IDS[:chains] + [str(100000 + i) for i in range(chains - len(CHAIN_IDS))]
+    names = CONTRACT_NAMES[:contracts] + [f'contract{i}' for i in range(contracts - len(CONTRACT_NAMES))]
+    transformer_names = (TRANSFORMER_NAMES[:transformers] +
+                         [f'transformer{i}' for i in range(transformers - len(TRANSFORMER_NAMES))])
+    shared = {name: address() for name in names if rng.random() < shared_ratio}
+
+    addresses = {}
+    for chain_id in chain_ids:
+        chain = {name: shared.get(name) or address() for name in names}
+        chain['transformers'] = {name: address() for name in transformer_names}
+        addresses[chain_id] = chain
+    return addresses
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='生成基准测试用的合成输入')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    log = commands.add_parser('log', help='mocha spec 输出')
+    log.add_argument('--passing', type=int, default=400, help='通过的测试数 (默认: 400)')
+    log.add_argument('--failing', type=int, default=150, help='失败的测试数 (默认: 150)')
+    log.add_argument('--pending', type=int, default=20, help='跳过的测试数 (默认: 20)')
+    log.add_argument('--stack-depth', type=int, default=6, help='每个失败的栈帧数 (默认: 6)')
+
+    ts = commands.add_parser('ts', help='含旧写法的 TypeScript 测试代码')
+    ts.add_argument('--size-mb', type=float, default=1, help='大小, MB (默认: 1)')
+    ts.add_argument('--legacy-ratio', type=float, default=0.1, help='旧写法片段比例 (默认: 0.1)')
+
+    addresses = commands.add_parser('addresses', help='addresses.json 结构的地址表')
+    addresses.add_argument('--chains', type=int, default=len(CHAIN_IDS), help='链数 (默认: 12)')
+    addresses.add_argument('--contracts', type=int, default=len(CONTRACT_NAMES), help='每条链的合约数 (默认: 14)')
+    addresses.add_argument('--transformers', type=int, default=len(TRANSFORMER_NAMES),
+                           help='每条链的 transformer 数 (默认: 5)')
+
+    for command in (log, ts, addresses):
+        command.add_argument('--seed', type=int, default=0, help='随机种子 (默认: 0)')
+        command.add_argument('-o', '--output', help='输出文件 (默认: 标准输出)')
+    args = parser.parse_args(argv)
+
+    if args.command == 'log':
+        content = ''.join(generate_mocha_log(args.passing, args.failing, args.pending, args.stack_depth,
+                                             seed=args.seed))
+    elif args.command == 'ts':
+        content = generate_ts_source(int(args.size_mb * 1024 * 1024), args.seed, args.legacy_ratio)
+    else:
+        content = json.dumps(generate_addresses(args.chains, args.contracts, args.transformers, seed=args.seed),
+                             indent=4) + '\n'
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(content)
+    else:
+        sys.stdout.write(content)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+zero-ex Python 工具的统一入口
+
+    python3 contracts/zero-ex/zx.py analyze [日志 ...]     测试失败分类 (analyze_errors.py)
+    python3 contracts/zero-ex/zx.py fix test/              批量修复 (codemod.py, 即三个 fix_*.py 的规则)
+    python3 contracts/zero-ex/zx.py addresses              生成文档的合约地址页 (docs/scripts/generate_addresses.py)
+    python3 contracts/zero-ex/zx.py profile [日志]         测试耗时分析 (profile_tests.py)
+    python3 contracts/zero-ex/zx.py shards -n 4            按耗时规划测试分片 (plan_shards.py)
+
+子命令的模块只在被调用时才导入, 各模块中的进程池, 选择器索引, 词法分析正则等也都是
+用到时才导入或编译, 所以 --help 和小规模调用的启动时间主要就是解释器本身. 默认的输入
+文件按仓库中的位置解析, 在任何目录下运行都一样; 命令行中给出的相对路径仍相对当前目录.
+启动时间由 bench_startup.py 检查.
+"""
+
+import importlib
+import os
+import sys
+from collections import OrderedDict
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(os.path.dirname(PACKAGE_DIR))
+
+# 子命令 -> (模块名或脚本路径, 说明)
+COMMANDS = OrderedDict([
+    ('analyze', ('analyze_errors', '分析 mocha 测试日志中的失败并分类')),
+    ('fix', ('codemod', '对文件或目录一次运行所有 fix_* 修复规则')),
+    ('addresses', (os.path.join(REPO_ROOT, 'docs', 'scripts', 'generate_addresses.py'),
+                   '从 addresses.json 生成文档的合约地址页')),
+    ('profile', ('profile_tests', '分析 mocha 输出中的测试耗时')),
+    ('shards', ('plan_shards', '按历史耗时把测试文件均衡地分配到多个分片')),
+    ('history', ('test_history', '测试结果历史库: 新增失败, 新修复和不稳定的测试')),
+    ('diff', ('diff_analysis', '对比两次运行的错误分析结果')),
+    ('lookup', ('address_registry', '按地址查合约名和链, 或按链和合约名查地址')),
+    ('check-addresses', ('validate_addresses', '检查 addresses.json 和 DEPLOYS.json 中的合约地址')),
+])
+
+
+def load_command(name):
+    """导入子命令对应的模块, 脚本路径按文件导入"""
+    target = COMMANDS[name][0]
+    if not target.endswith('.py'):
+        return importlib.import_module(target)
+    from importlib.util import module_from_spec, spec_from_file_location
+    spec = spec_from_file_location(os.path.splitext(os.path.basename(target))[0], target)
+    module = module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def print_usage(file=sys.stdout):
+    prog = os.path.basename(sys.argv[0])
+    print(f"用法: {prog} <子命令> [参数 ...]\n\n子命令:", file=file)
+    width = max(len(name) for name in COMMANDS)
+    for name, (_, description) in COMMANDS.items():
+        print(f"  {name:<{width}}  {description}", file=file)
+    print(f"\n各子命令的参数见 {prog} <子命令> --help", file=file)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ('-h', '--help'):
+        print_usage()
+        return
+    name, args = argv[0], argv[1:]
+    if name not in COMMANDS:
+        print(f"❌ 未知子命令: {name}\n", file=sys.stderr)
+        print_usage(sys.stderr)
+        sys.exit(2)
+
+    if PACKAGE_DIR not in sys.path:
+        sys.path.insert(0, PACKAGE_DIR)
+    # 子命令的 argparse 用 sys.argv[0] 作为程序名, 让 usage 显示成 "zx.py analyze ..."
+    sys.argv = [f"{os.path.basename(sys.argv[0])} {name}"] + args
+    load_command(name).main(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+"""
+Opt-in Sphinx extension that records where the docs build spends its time.
+
+Enable it with ``SPHINX_BUILD_TIMING=1 make html`` or ``-D build_timing=1``. The value may
+also be a path prefix (``-D build_timing=/tmp/timing``); by default the report is written
+next to the output as ``build_timing.json``, ``build_timing.csv`` (documents) and
+``build_timing_handlers.csv`` at ``build-finished``, all sorted slowest first.
+
+Recorded per document: wall time to read (parse) it, to resolve its doctree and to write it.
+Recorded per extension and event: the number of calls and the time spent in its handlers,
+attributed to the document being read when there is one. Read-phase timings live on the
+environment so they survive ``-j`` parallel reads; writes done in parallel worker processes
+are not recorded.
+
+When disabled the extension only registers its config value and returns immediately from
+``config-inited``; nothing is wrapped.
+"""
+
+import csv
+import json
+import os
+import time
+from collections import defaultdict
+
+from sphinx.environment import BuildEnvironment
+from sphinx.util import logging
+
+ENV_VAR = 'SPHINX_BUILD_TIMING'
+DEFAULT_REPORT = 'build_timing'
+DISABLED_VALUES = ('', '0', 'false', 'no', 'off')
+
+logger = logging.getLogger(__name__)
+
+
+class BuildTiming:
+    """Timings recorded outside the read phase, kept in the main process only."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.resolve = defaultdict(float)
+        self.write = defaultdict(float)
+        # (extension, event) -> [calls, seconds]
+        self.handlers = defaultdict(lambda: [0, 0.0])
+        self.original_resolve = None
+
+
+def current_docname(env):
+    try:
+        return env.docname or None
+    except (AttributeError, KeyError):
+        # Sphinx < 8 raises KeyError outside of reading a document
+        return None
+
+
+def read_timings(env):
+    """Read-phase timings kept on the environment: {'read': {doc: s}, 'handlers': {doc: {key: [calls, s]}}}"""
+    timings = getattr(env, 'build_timing', None)
+    if timings is None:
+        timings = env.build_timing = {'read': {}, 'handlers': {}}
+    return timings
+
+
+def extension_name(app, module):
+    """The registered extension a handler belongs to: the longest extension name prefixing its module."""
+    matches = [name for name in app.extensions if module == name or module.startswith(name + '.')]
+    return max(matches, key=len) if matches else module
+
+
+def timed_handler(timing, handler, key):
+    def wrapper(app, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return handler(app, *args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            env = getattr(app, 'env', None)
+            docname = current_docname(env) if env is not None else None
+            if docname:
+                totals = read_timings(env)['handlers'].setdefault(docname, {})
+                entry = totals.setdefault(key, [0, 0.0])
+            else:
+                entry = timing.handlers[key]
+            entry[0] += 1
+            entry[1] += elapsed
+    return wrapper
+
+
+def wrap_handlers(app, timing):
+    for event, listeners in app.events.listeners.items():
+        for index, listener in enumerate(listeners):
+            module = getattr(listener.handler, '__module__', None) or '?'
+            if module == __name__:
+                continue
+            key = (extension_name(app, module), event)
+            listeners[index] = listener._replace(handler=timed_handler(timing, listener.handler, key))
+
+
+def timed_method(record, method):
+    def wrapper(docname, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return method(docname, *args, **kwargs)
+        finally:
+            record(docname, time.perf_counter() - start)
+    return wrapper
+
+
+def instrument_builder(app):
+    timing = app.build_timing
+    builder = app.builder
+
+    def record_read(docname, elapsed):
+        read_timings(app.env)['read'][docname] = elapsed
+
+    def record_write(docname, elapsed):
+        timing.write[docname] += elapsed
+
+    builder.read_doc = timed_method(record_read, builder.read_doc)
+    builder.write_doc = timed_method(record_write, builder.write_doc)
+
+    # the environment is pickled, so resolving is wrapped on the class rather than the instance
+    original = timing.original_resolve = BuildEnvironment.get_and_resolve_doctree
+
+    def get_and_resolve_doctree(env, docname, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return original(env, docname, *args, **kwargs)
+        finally:
+            timing.resolve[docname] += time.perf_counter() - start
+    BuildEnvironment.get_and_resolve_doctree = get_and_resolve_doctree
+
+
+def reset_read_timings(app, env, docnames):
+    env.build_timing = {'read': {}, 'handlers': {}}
+
+
+def merge_read_timings(app, env, docnames, other):
+    timings = read_timings(env)
+    others = read_timings(other)
+    for docname in docnames:
+        if docname in others['read']:
+            timings['read'][docname] = others['read'][docname]
+        if docname in others['handlers']:
+            timings['handlers'][docname] = others['handlers'][docname]
+
+
+def build_report(app):
+    timing = app.build_timing
+    reads = read_timings(app.env)
+
+    handlers = defaultdict(lambda: [0, 0.0])
+    for key, (calls, seconds) in timing.handlers.items():
+        handlers[key][0] += calls
+        handlers[key][1] += seconds
+    for totals in reads['handlers'].values():
+        for key, (calls, seconds) in totals.items():
+            entry = handlers[key]
+            entry[0] += calls
+            entry[1] += seconds
+
+    documents = []
+    for docname in set(reads['read']) | set(timing.resolve) | set(timing.write):
+        read = reads['read'].get(docname, 0.0)
+        resolve = timing.resolve.get(docname, 0.0)
+        write = timing.write.get(docname, 0.0)
+        documents.append({
+            'docname': docname,
+            'read': read,
+            'resolve': resolve,
+            'write': write,
+            'total': read + resolve + write,
+        })
+    documents.sort(key=lambda document: -document['total'])
+
+    handler_rows = [
+        {'extension': extension, 'event': event, 'calls': calls, 'seconds': seconds}
+        for (extension, event), (calls, seconds) in handlers.items()
+    ]
+    handler_rows.sort(key=lambda row: -row['seconds'])
+    return {
+        'builder': app.builder.name,
+        'total_seconds': time.perf_counter() - timing.start,
+        'documents': documents,
+        'handlers': handler_rows,
+    }
+
+
+def write_report(app, exception):
+    timing = app.build_timing
+    if timing.original_resolve is not None:
+        BuildEnvironment.get_and_resolve_doctree = timing.original_resolve
+    if exception is not None:
+        return
+
+    report = build_report(app)
+    setting = app.config.build_timing
+    prefix = os.path.join(app.outdir, DEFAULT_REPORT) if setting.lower() in ('1', 'true', 'yes', 'on') \
+        else os.path.splitext(setting)[0]
+    os.makedirs(os.path.dirname(os.path.abspath(prefix)), exist_ok=True)
+
+    with open(prefix + '.json', 'w') as f:
+        json.dump(report, f, indent=2)
+    with open(prefix + '.csv', 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=['docname', 'read', 'resolve', 'write', 'total'])
+        writer.writeheader()
+        writer.writerows(report['documents'])
+    with open(prefix + '_handlers.csv', 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=['extension', 'event', 'calls', 'seconds'])
+        writer.writeheader()
+        writer.writerows(report['handlers'])
+
+    logger.info('build timing: %.2fs total, report written to %s.json', report['total_seconds'], prefix)
+    for document in report['documents'][:5]:
+        logger.info('    %7.3fs  %s', document['total'], document['docname'])
+
+
+def enable(app, config):
+    if str(config.build_timing).strip().lower() in DISABLED_VALUES:
+        return
+    config.build_timing = str(config.build_timing).strip()
+    app.build_timing = BuildTiming()
+    wrap_handlers(app, app.build_timing)
+    app.connect('builder-inited', instrument_builder)
+    app.connect('env-before-read-docs', reset_read_timings)
+    app.connect('env-merge-info', merge_read_timings)
+    app.connect('build-finished', write_report)
+
+
+def setup(app):
+    app.add_config_value('build_timing', os.environ.get(ENV_VAR, ''), '')
+    app.connect('config-inited', enable)
+    return {
+        'version': '1.0',
+        'parallel_read_safe': True,
+        'parallel_write_safe': True,
+    }
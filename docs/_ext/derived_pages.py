@@ -0,0 +1,60 @@
+"""
+Sphinx extension that generates derived pages (e.g. ``basics/addresses.rst``) in-process.
+
+Pages are regenerated on ``builder-inited``, before Sphinx decides which documents are
+outdated. A generator only rewrites its page when its inputs changed (see
+``generate_addresses.generate``), so an unchanged page keeps its mtime and is not re-read.
+Each page also declares its inputs as dependencies through ``env.note_dependency`` so that
+an input change marks exactly that page outdated. Both handlers only touch per-document
+environment state, so the extension is safe for ``sphinx-build -j auto``.
+"""
+
+import os
+import sys
+
+from sphinx.util import logging
+
+DOCS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(DOCS_DIR, 'scripts'))
+
+import generate_addresses  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+# docname -> (input files, generate(output path) -> True if the page was written)
+DERIVED_PAGES = {
+    'basics/addresses': (
+        [generate_addresses.ADDRESSES_FILE, os.path.abspath(generate_addresses.__file__)],
+        lambda path: generate_addresses.generate(output=path),
+    ),
+}
+
+
+def generate_derived_pages(app):
+    for docname, (_, generate) in DERIVED_PAGES.items():
+        path = os.path.join(app.srcdir, docname + '.rst')
+        try:
+            written = generate(path)
+        except (OSError, ValueError) as e:
+            # keep whatever page is already there rather than failing the whole build
+            logger.warning('could not generate %s: %s', docname, e)
+            continue
+        if written:
+            logger.info('generated %s', docname)
+
+
+def note_dependencies(app, docname, source):
+    page = DERIVED_PAGES.get(docname)
+    if page:
+        for path in page[0]:
+            app.env.note_dependency(path)
+
+
+def setup(app):
+    app.connect('builder-inited', generate_derived_pages)
+    app.connect('source-read', note_dependencies)
+    return {
+        'version': '1.0',
+        'parallel_read_safe': True,
+        'parallel_write_safe': True,
+    }
@@ -20,6 +20,7 @@ import sphinx_rtd_theme
 # add these directories to sys.path here. If the directory is relative to the
 # documentation root, use os.path.abspath to make it absolute, like shown here.
 #sys.path.insert(0, os.path.abspath('.'))
+sys.path.insert(0, os.path.abspath('_ext'))
 
 # -- General configuration ------------------------------------------------
 
@@ -33,6 +34,10 @@ extensions = [
     'recommonmark',
     'sphinx_rtd_theme',
     'sphinx_markdown_tables',
+    # generates basics/addresses.rst from addresses.json at the start of every build
+    'derived_pages',
+    # opt-in build profiling: SPHINX_BUILD_TIMING=1 or -D build_timing=1
+    'build_timing',
 ]
 
 # Add any paths that contain templates here, relative to this directory.
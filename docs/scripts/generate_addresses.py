@@ -1,9 +1,24 @@
+import argparse
+import hashlib
 import json
+import os
+import sys
+import tempfile
 
 ####
-#### Run from `root/docs` directory. Generates `root/docs/basics/addresses.rst`
+#### Generates `root/docs/basics/addresses.rst` with a section per network in addresses.json.
+#### Paths are resolved from the repo root, so it can be run from any directory (or as
+#### `zx.py addresses`). The page starts with a hash of its inputs (addresses.json and this
+#### script); when that hash is unchanged the page is left untouched, so Sphinx's incremental
+#### build does not re-read it. Otherwise it is replaced atomically. `-o -` prints to stdout.
 ####
 
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+ADDRESSES_FILE = os.path.join(REPO_ROOT, 'packages', 'contract-addresses', 'addresses.json')
+ADDRESSES_PAGE = os.path.join(REPO_ROOT, 'docs', 'basics', 'addresses.rst')
+STAMP_PREFIX = '.. inputs-sha256: '
+NULL_ADDRESS = '0x0000000000000000000000000000000000000000'
+
 
 sections = [
     
@@ -57,6 +72,11 @@ networks = {
     '43114': 'Avalanche',
     '250': 'Fantom',
     '42220': 'Celo',
+    '42161': 'Arbitrum',
+    '8453': 'Base',
+    '5': 'Goerli',
+    '80001': 'Mumbai',
+    '1337': 'Ganache',
 }
 
 etherscanByNetwork = {
@@ -67,29 +87,54 @@ etherscanByNetwork = {
     '43114': 'https://snowtrace.io/address',
     '250': 'https://ftmscan.com/address',
     '42220': 'https://explorer.celo.org/address',
+    '42161': 'https://arbiscan.io/address',
+    '8453': 'https://basescan.org/address',
+    '5': 'https://goerli.etherscan.io/address',
+    '80001': 'https://mumbai.polygonscan.com/address',
 }
 
 
 def getLinkableAddress(address, network):
+    if network not in etherscanByNetwork:
+        # local chains (e.g. Ganache) have no explorer
+        return "``%s``"%(address)
     etherscanLink = "%s/%s"%(etherscanByNetwork[network], address)
     return "`%s <%s>`__"%(address, etherscanLink)
 
-def printRow(contract, address, network):
-    etherscanLink = "%s/%s"%(etherscanByNetwork[network], address)
-    print("    %s, %s"%(contract, getLinkableAddress(address, network)))
+def getNetworkName(network):
+    return networks.get(network, "Chain %s"%(network))
 
-def printTable(contracts, addresses, network):
-    print(".. csv-table::\n")
+def renderRow(contract, address, network):
+    return "    %s, %s"%(contract, getLinkableAddress(address, network))
+
+def renderTable(contracts, addresses, network):
+    lines = [".. csv-table::", ""]
     for contract in contracts:
+        if contract not in addresses:
+            # retired contracts (e.g. devUtils) are no longer listed in addresses.json
+            continue
         if isinstance(addresses[contract], str):
-            printRow(contract, addresses[contract], network)
+            group = {contract: addresses[contract]}
         else:
-            for contract,address in addresses[contract].items():
-                printRow(contract, address, network)
+            group = addresses[contract]
+        for contract,address in group.items():
+            # contracts that were never deployed on this network are listed as the null address
+            if address != NULL_ADDRESS:
+                lines.append(renderRow(contract, address, network))
+    return lines
+
+def renderNetwork(addresses, network):
+    name = "%s (chain %s)"%(getNetworkName(network), network)
+    lines = [name, "=" * len(name), ""]
+    for section in sections:
+        table = renderTable(section["contracts"], addresses, network)
+        if len(table) == 2:
+            continue
+        lines += [section["name"], "-" * len(section["name"])] + table + ["", ""]
+    return lines
                 
 
-print(
-'''
+HEADER = '''
 ###############################
 Addresses
 ###############################
@@ -99,19 +144,90 @@ Addresses
 
     The Exchange Proxy may have different addresses on various networks, see the `Exchange Proxy Addresses <./addresses.html#exchange-proxy-addresses>`__ table for an exhaustive list.
 '''
-)
 
-with open('../packages/contract-addresses/addresses.json') as f:
-    addresses = json.load(f)
-    for section in sections:
-        print("%s\n==================="%(section["name"]))
-        printTable(section["contracts"], addresses["1"], "1")
-        print("\n\n")
-    print("Exchange Proxy Addresses \n=========================")
-    print("Note: Some addresses have changed across various networks\n")
-    print(".. csv-table::\n")
-    for network in networks:
-        # etherscanLink = "%s/%s"%("https://etherscan.io/address/", address)
-        # print("    %s, `%s <%s>`_"%(contract, address, etherscanLink)) 
-        print("    %s, %s"%(networks[network], getLinkableAddress(addresses[network]["exchangeProxy"], network))) 
+
+def networkOrder(network):
+    # known networks in the order of `networks`, then the rest in addresses.json order
+    order = list(networks)
+    return order.index(network) if network in order else len(order)
+
+def renderPage(addresses):
+    lines = [HEADER]
+    proxies = []
+    for network in sorted(addresses, key=networkOrder):
+        lines += renderNetwork(addresses[network], network)
+        if "exchangeProxy" in addresses[network]:
+            proxies.append(renderRow(getNetworkName(network), addresses[network]["exchangeProxy"], network))
+    lines += ["Exchange Proxy Addresses", "========================",
+              "Note: Some addresses have changed across various networks", "",
+              ".. csv-table::", ""] + proxies
+    return "\n".join(lines) + "\n"
+
+
+def printPage(addresses):
+    sys.stdout.write(renderPage(addresses))
+
+
+def inputsHash(content):
+    # the page depends on addresses.json and on the tables defined in this script
+    digest = hashlib.sha256(content)
+    with open(os.path.abspath(__file__), 'rb') as f:
+        digest.update(f.read())
+    return digest.hexdigest()
+
+def readStamp(path):
+    try:
+        with open(path) as f:
+            line = f.readline()
+    except FileNotFoundError:
+        return None
+    return line[len(STAMP_PREFIX):].strip() if line.startswith(STAMP_PREFIX) else None
+
+def writeAtomic(path, text):
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix='.addresses-', suffix='.rst')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(text)
+        # mkstemp creates the file as 0600; give the page the usual permissions
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(tmp, 0o666 & ~umask)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+def generate(addressesFile=ADDRESSES_FILE, output=ADDRESSES_PAGE, force=False):
+    """Regenerate `output` if its inputs changed; returns True if the page was written."""
+    with open(addressesFile, 'rb') as f:
+        content = f.read()
+    digest = inputsHash(content)
+    if not force and readStamp(output) == digest:
+        return False
+    page = "%s%s\n%s"%(STAMP_PREFIX, digest, renderPage(json.loads(content)))
+    writeAtomic(output, page)
+    return True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate the docs addresses page from addresses.json')
+    parser.add_argument('--addresses', default=ADDRESSES_FILE,
+                        help='contract-addresses addresses.json (default: packages/contract-addresses/addresses.json)')
+    parser.add_argument('-o', '--output', default=ADDRESSES_PAGE,
+                        help='page to write, or - for stdout (default: docs/basics/addresses.rst)')
+    parser.add_argument('--force', action='store_true', help='rewrite the page even if its inputs are unchanged')
+    args = parser.parse_args(argv)
+    if args.output == '-':
+        with open(args.addresses) as f:
+            printPage(json.load(f))
+        return
+    if generate(args.addresses, args.output, args.force):
+        print("Wrote %s"%(args.output))
+    else:
+        print("%s is up to date"%(args.output))
+
+
+if __name__ == "__main__":
+    main()
 
@@ -0,0 +1,8 @@
+import os
+import sys
+
+DOCS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# the docs scripts and Sphinx extensions are plain files, not installed as a package
+sys.path.insert(0, os.path.join(DOCS_DIR, 'scripts'))
+sys.path.insert(0, os.path.join(DOCS_DIR, '_ext'))
@@ -0,0 +1,73 @@
+import csv
+import json
+import os
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip('sphinx')
+
+from sphinx.cmd.build import build_main  # noqa: E402
+
+import build_timing  # noqa: E402
+
+EXT_DIR = os.path.dirname(os.path.abspath(build_timing.__file__))
+
+
+@pytest.fixture
+def project(tmp_path):
+    src = tmp_path / 'src'
+    src.mkdir()
+    (src / 'conf.py').write_text(
+        'import sys\n'
+        f'sys.path.insert(0, {EXT_DIR!r})\n'
+        "extensions = ['sphinx.ext.todo', 'build_timing']\n")
+    (src / 'index.rst').write_text('Index\n=====\n\n.. toctree::\n\n   page\n')
+    (src / 'page.rst').write_text('Page\n====\n\n.. todo:: write this page\n')
+    return tmp_path
+
+
+def build(project, *options):
+    return build_main(['-q', '-b', 'html', *options, str(project / 'src'), str(project / 'out')])
+
+
+# read timings are kept on the environment so that they survive parallel reads; parallel writes are not recorded
+@pytest.mark.parametrize('jobs', ['1', '2'])
+def test_report_lists_documents_and_handlers(project, jobs):
+    assert build(project, '-j', jobs, '-D', 'build_timing=1') == 0
+
+    with open(project / 'out' / 'build_timing.json') as f:
+        report = json.load(f)
+    assert report['builder'] == 'html'
+    assert sorted(document['docname'] for document in report['documents']) == ['index', 'page']
+    for document in report['documents']:
+        assert document['total'] == pytest.approx(document['read'] + document['resolve'] + document['write'])
+        assert document['read'] > 0
+        assert document['write'] > 0 or jobs != '1'
+    totals = [document['total'] for document in report['documents']]
+    assert totals == sorted(totals, reverse=True)
+    # handlers are attributed to the extension that registered them
+    todo = [row for row in report['handlers'] if row['extension'] == 'sphinx.ext.todo']
+    assert ('doctree-resolved', 2) in [(row['event'], row['calls']) for row in todo]
+
+    with open(project / 'out' / 'build_timing.csv', newline='') as f:
+        assert [row['docname'] for row in csv.DictReader(f)] == [d['docname'] for d in report['documents']]
+    assert os.path.exists(project / 'out' / 'build_timing_handlers.csv')
+
+
+def test_report_prefix_and_disabled_builds(project, monkeypatch):
+    prefix = project / 'reports' / 'timing'
+    assert build(project, '-D', f'build_timing={prefix}') == 0
+    assert os.path.exists(str(prefix) + '.json')
+
+    monkeypatch.delenv(build_timing.ENV_VAR, raising=False)
+    assert build(project, '-E') == 0
+    assert not os.path.exists(project / 'out' / 'build_timing.json')
+
+
+def test_extension_name_uses_the_longest_registered_prefix():
+    app = SimpleNamespace(extensions={'sphinx': None, 'sphinx.ext.todo': None})
+    assert build_timing.extension_name(app, 'sphinx.ext.todo') == 'sphinx.ext.todo'
+    assert build_timing.extension_name(app, 'sphinx.ext.todo.helpers') == 'sphinx.ext.todo'
+    assert build_timing.extension_name(app, 'sphinx.builders.html') == 'sphinx'
+    assert build_timing.extension_name(app, 'conf') == 'conf'
@@ -0,0 +1,54 @@
+import json
+import os
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip('sphinx')
+
+import derived_pages  # noqa: E402
+import generate_addresses  # noqa: E402
+
+
+class FakeEnv:
+    def __init__(self):
+        self.dependencies = []
+
+    def note_dependency(self, path):
+        self.dependencies.append(path)
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    addresses = tmp_path / 'addresses.json'
+    addresses.write_text(json.dumps({'1': {'exchangeProxy': '0xdef1c0ded9bec7f1a1670819833240f027b25eff'}}))
+    monkeypatch.setitem(derived_pages.DERIVED_PAGES, 'basics/addresses', (
+        [str(addresses)], lambda path: generate_addresses.generate(str(addresses), path)))
+    (tmp_path / 'basics').mkdir()
+    return SimpleNamespace(srcdir=str(tmp_path), env=FakeEnv())
+
+
+def test_pages_are_written_only_when_inputs_change(app):
+    page = os.path.join(app.srcdir, 'basics', 'addresses.rst')
+
+    derived_pages.generate_derived_pages(app)
+    mtime = os.stat(page).st_mtime_ns
+    derived_pages.generate_derived_pages(app)
+    assert os.stat(page).st_mtime_ns == mtime
+
+
+def test_generator_errors_keep_the_build_going(app, monkeypatch):
+    def broken(path):
+        raise ValueError('addresses.json is not valid JSON')
+
+    monkeypatch.setitem(derived_pages.DERIVED_PAGES, 'basics/addresses', ([], broken))
+    derived_pages.generate_derived_pages(app)
+    assert not os.path.exists(os.path.join(app.srcdir, 'basics', 'addresses.rst'))
+
+
+def test_only_derived_pages_depend_on_their_inputs(app):
+    derived_pages.note_dependencies(app, 'index', [''])
+    assert app.env.dependencies == []
+
+    derived_pages.note_dependencies(app, 'basics/addresses', [''])
+    assert app.env.dependencies == [os.path.join(app.srcdir, 'addresses.json')]
@@ -0,0 +1,60 @@
+import json
+import os
+
+import pytest
+
+import generate_addresses
+
+EXCHANGE_PROXY = '0xdef1c0ded9bec7f1a1670819833240f027b25eff'
+
+
+@pytest.fixture
+def addresses_file(tmp_path):
+    addresses = {
+        '1': {
+            'exchangeProxy': EXCHANGE_PROXY,
+            'zrxToken': '0xe41d2489571d322189246dafa5ebde1f4699f498',
+            'staking': generate_addresses.NULL_ADDRESS,
+            'transformers': {'wethTransformer': '0xb2bc06a4efb20fc6553a69dbfa49b7be938034a7'},
+        },
+        '1337': {'exchangeProxy': '0x5315e44798395d4a952530d131249fe00f554565'},
+        '99999': {'exchangeProxy': EXCHANGE_PROXY},
+    }
+    path = tmp_path / 'addresses.json'
+    path.write_text(json.dumps(addresses))
+    return str(path)
+
+
+def test_page_has_a_section_per_network(addresses_file):
+    with open(addresses_file) as f:
+        page = generate_addresses.renderPage(json.load(f))
+
+    sections = ['Ethereum (chain 1)', 'Ganache (chain 1337)', 'Chain 99999 (chain 99999)']
+    assert [page.index(section) for section in sections] == sorted(page.index(section) for section in sections)
+    assert '`%s <https://etherscan.io/address/%s>`__' % (EXCHANGE_PROXY, EXCHANGE_PROXY) in page
+    assert '    wethTransformer, ' in page
+    # never deployed contracts and chains without an explorer
+    assert 'staking,' not in page
+    assert '    Ganache, ``0x5315e44798395d4a952530d131249fe00f554565``' in page
+
+
+def test_generate_skips_unchanged_inputs(addresses_file, tmp_path):
+    output = str(tmp_path / 'addresses.rst')
+
+    assert generate_addresses.generate(addresses_file, output)
+    with open(output) as f:
+        first = f.read()
+    assert first.startswith(generate_addresses.STAMP_PREFIX)
+    mtime = os.stat(output).st_mtime_ns
+
+    assert not generate_addresses.generate(addresses_file, output)
+    assert os.stat(output).st_mtime_ns == mtime
+
+    assert generate_addresses.generate(addresses_file, output, force=True)
+    with open(output) as f:
+        assert f.read() == first
+
+    with open(addresses_file, 'a') as f:
+        f.write('\n')
+    assert generate_addresses.generate(addresses_file, output)
+    assert sorted(os.listdir(tmp_path)) == ['addresses.json', 'addresses.rst']